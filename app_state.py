@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Embedded app-state extraction (__NEXT_DATA__, window.__INITIAL_STATE__ and friends)
+Client-rendered shops ship the whole product as JSON in the HTML; per-site JSON paths pick the price out of it
+"""
+
+import json
+import re
+
+from structured_data import parse_price
+
+STATE_SCRIPT_IDS = ('__NEXT_DATA__',)
+STATE_GLOBALS = ('__INITIAL_STATE__', '__PRELOADED_STATE__', '__APOLLO_STATE__', '__INITIAL_DATA__')
+ASSIGNMENT = re.compile(r'window\.(__[A-Z_]+__)\s*=\s*')
+
+# Inline scripts as [id, text] pairs, for the browser paths
+COLLECT_SCRIPTS_JS = """
+var out = [];
+for (var i = 0; i < document.scripts.length; i++) {
+    var s = document.scripts[i];
+    if (!s.src && s.type !== 'application/ld+json') { out.push([s.id || '', s.textContent || '']); }
+}
+return out;
+"""
+
+_decoder = json.JSONDecoder(strict=False)
+
+
+def _decode_at(text, position):
+    """JSON value starting at text[position] (a literal or JSON.parse("...")), or None"""
+    while position < len(text) and text[position].isspace():
+        position += 1
+    try:
+        if text.startswith('JSON.parse(', position):
+            encoded, _ = _decoder.raw_decode(text, position + len('JSON.parse('))
+            return json.loads(encoded, strict=False) if isinstance(encoded, str) else None
+        value, _ = _decoder.raw_decode(text, position)
+        return value
+    except ValueError:
+        return None
+
+
+def find_app_states(scripts):
+    """{state name: parsed JSON} from inline (script id, text) pairs; the first blob of each name wins"""
+    states = {}
+    for script_id, text in scripts:
+        if not text:
+            continue
+        if script_id in STATE_SCRIPT_IDS:
+            if script_id not in states:
+                value = _decode_at(text, 0)
+                if value is not None:
+                    states[script_id] = value
+            continue
+        if 'window.__' not in text:
+            continue
+        for match in ASSIGNMENT.finditer(text):
+            name = match.group(1)
+            if name in STATE_GLOBALS and name not in states:
+                value = _decode_at(text, match.end())
+                if value is not None:
+                    states[name] = value
+    return states
+
+
+def resolve_path(data, path):
+    """Value at a dotted path ('props.pageProps.items.0.price'); '*' tries every list item or dict value"""
+    nodes = [data]
+    for segment in path.split('.'):
+        next_nodes = []
+        for node in nodes:
+            if segment == '*':
+                if isinstance(node, dict):
+                    next_nodes.extend(node.values())
+                elif isinstance(node, list):
+                    next_nodes.extend(node)
+            elif isinstance(node, dict) and segment in node:
+                next_nodes.append(node[segment])
+            elif isinstance(node, list) and segment.isdigit() and int(segment) < len(node):
+                next_nodes.append(node[int(segment)])
+        nodes = next_nodes
+        if not nodes:
+            return None
+    for node in nodes:
+        if node is not None and node != '':
+            return node
+    return None
+
+
+def find_path(data, value, keys=None):
+    """Dotted path of the first leaf (breadth first) that parses to value, optionally under one of keys"""
+    queue = [(data, [])]
+    while queue:
+        node, path = queue.pop(0)
+        if isinstance(node, dict):
+            queue.extend((child, path + [str(key)]) for key, child in node.items())
+        elif isinstance(node, list):
+            queue.extend((child, path + [str(i)]) for i, child in enumerate(node))
+        elif path and (keys is None or path[-1] in keys) and parse_price(node) == value:
+            return '.'.join(path)
+    return None
+
+
+def product_from_state(states, site_paths):
+    """Price (plus MRP and stock when configured) from the first price path that resolves
+
+    `site_paths` is {'price': [paths], 'mrp': [paths], 'in_stock': [paths]}. Returns a dict
+    with the state name and path that produced the price, or None.
+    """
+    found = {}
+    for field in ('price', 'mrp', 'in_stock'):
+        for path in site_paths.get(field, []):
+            for name, data in states.items():
+                value = resolve_path(data, path)
+                if field == 'in_stock':
+                    if value is not None and not isinstance(value, (dict, list)):
+                        found[field] = value if isinstance(value, bool) else str(value)
+                else:
+                    value = parse_price(value) if not isinstance(value, (dict, list)) else None
+                    if value:
+                        found[field] = value
+                        if field == 'price':
+                            found['state'], found['path'] = name, path
+                if field in found:
+                    break
+            if field in found:
+                break
+        if field == 'price' and 'price' not in found:
+            return None
+    return found
+
+
+def app_state_from_driver(driver):
+    """App-state blobs of the page loaded in a Selenium driver, in one round trip"""
+    try:
+        scripts = driver.execute_script(COLLECT_SCRIPTS_JS) or []
+    except Exception as e:
+        print(f"⚠️  Could not read inline scripts: {e}")
+        return {}
+    return find_app_states((script_id, text) for script_id, text in scripts)
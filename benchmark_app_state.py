@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+App-state extraction over plain HTTP versus the Selenium path, on saved pages with a state blob
+Selenium numbers need Chrome; without it only the HTTP side is measured
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmark_parsers import SAMPLE_PAGES_DIR, load_corpus
+from price_tracker_universal import UniversalPriceTracker
+
+
+def state_pages(pages, expected):
+    """Saved pages whose recorded result comes from the app-state extractor"""
+    return {name: html for name, html in pages.items() if expected.get(name, {}).get('method') == 'app-state'}
+
+
+def time_http(tracker, html, url, repeat):
+    """Mean seconds to price a downloaded page (parse + extract), and the result"""
+    result = tracker.extract_price_from_html(html, url)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        tracker.extract_price_from_html(html, url)
+    return (time.perf_counter() - started) / repeat, result
+
+
+def time_selenium(tracker, path, url, repeat):
+    """Mean seconds to load a saved page in a pooled headless Chrome and price it, and the result"""
+    result = None
+    started = time.perf_counter()
+    with tracker.get_driver_pool().driver() as driver:
+        for _ in range(repeat):
+            driver.get('file://' + os.path.abspath(path))
+            result = tracker.extract_with_selenium(driver, url)
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app-state extraction: HTTP versus Selenium")
+    parser.add_argument('--pages', default=SAMPLE_PAGES_DIR, help='directory of saved .html pages')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per page and path')
+    parser.add_argument('--no-selenium', action='store_true', help='only time the HTTP path')
+    args = parser.parse_args()
+
+    pages, expected = load_corpus(args.pages)
+    pages = state_pages(pages, expected)
+    if not pages:
+        print(f"❌ No app-state pages recorded in {args.pages}/expected.json")
+        return 1
+
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    tracker.scraper_settings['browser_daemon'] = False
+    tracker.scraper_settings['extraction_hints'] = False  # time the full cascade on every run
+    selenium = not args.no_selenium
+    failed = False
+    print(f"📊 {len(pages)} app-state page(s), {args.repeat} run(s) each")
+    try:
+        for name, html in pages.items():
+            url = expected[name]['url']
+            http_seconds, http_result = time_http(tracker, html, url, args.repeat)
+            line = f"   {name:<28} HTTP {http_seconds * 1000:8.2f} ms  ₹{http_result.get('price')}"
+            if http_result.get('price') != expected[name]['price']:
+                failed = True
+            if selenium:
+                try:
+                    browser_seconds, browser_result = time_selenium(
+                        tracker, os.path.join(args.pages, name), url, args.repeat)
+                    line += (f"  |  Selenium {browser_seconds * 1000:8.1f} ms  ₹{browser_result.get('price')}"
+                             f"  ({browser_seconds / http_seconds:.0f}x)")
+                    if browser_result.get('price') != http_result.get('price'):
+                        failed = True
+                except Exception as e:
+                    print(f"⚠️  Selenium path unavailable, timing HTTP only: {e}")
+                    selenium = False
+            print(line)
+    finally:
+        tracker.close_driver_pool()
+
+    print("❌ Prices differ from the recorded results" if failed else "✅ Same price on every path")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
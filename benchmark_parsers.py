@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Parse time and peak memory of each HTML parser backend over the saved-page corpus
+Also checks that every backend extracts the same result from every page
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from html_parsers import PARSER_BACKENDS
+from price_tracker_universal import UniversalPriceTracker
+
+SAMPLE_PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_pages')
+
+
+def load_corpus(directory=SAMPLE_PAGES_DIR):
+    """{file name: page bytes} for every saved page, plus {file name: {'url', expected result fields}}"""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    expected = {}
+    expected_file = os.path.join(directory, 'expected.json')
+    if os.path.exists(expected_file):
+        with open(expected_file, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+    return pages, expected
+
+
+def expected_fields(want):
+    """The result fields a corpus entry checks (everything but the page's original URL)"""
+    return {key: value for key, value in want.items() if key != 'url'}
+
+
+def benchmark_backend(tracker, backend, pages, repeat=20, urls=None):
+    """Mean extraction seconds and peak traced KB per page for one backend, plus its results"""
+    tracker.scraper_settings['html_parser'] = backend
+    tracker.scraper_settings['extraction_hints'] = False  # time the full cascade on every run
+    urls = urls or {}
+    rows = {}
+    for name, html in pages.items():
+        url = urls.get(name)
+        result = tracker.extract_price_from_html(html, url)  # warm-up, so one-off imports are not traced
+        tracemalloc.start()
+        tracker.extract_price_from_html(html, url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            tracker.extract_price_from_html(html, url)
+        rows[name] = {
+            'seconds': (time.perf_counter() - started) / repeat,
+            'peak_kb': peak / 1024,
+            'result': result,
+        }
+    return rows
+
+
+def compare_backends(results):
+    """Pages where backends disagree: [(page, {backend: result})]"""
+    mismatches = []
+    backends = list(results)
+    for name in results[backends[0]]:
+        outcomes = {backend: results[backend][name]['result'] for backend in backends}
+        if any(outcome != outcomes[backends[0]] for outcome in outcomes.values()):
+            mismatches.append((name, outcomes))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved retail pages")
+    parser.add_argument('--pages', default=SAMPLE_PAGES_DIR, help='directory of saved .html pages')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per page')
+    parser.add_argument('--backend', action='append', choices=PARSER_BACKENDS,
+                        help='backend to include (default: all installed)')
+    args = parser.parse_args()
+
+    pages, expected = load_corpus(args.pages)
+    if not pages:
+        print(f"❌ No .html pages in {args.pages}")
+        return 1
+
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    backends = args.backend or PARSER_BACKENDS
+    urls = {name: want.get('url') for name, want in expected.items()}
+    results = {backend: benchmark_backend(tracker, backend, pages, args.repeat, urls) for backend in backends}
+
+    print(f"📊 {len(pages)} page(s), {args.repeat} run(s) each; peak = Python heap traced during one extraction")
+    print(f"{'page':<28}{'KB':>7}" + ''.join(f"{backend + ' ms':>16}{'peak KB':>10}" for backend in backends))
+    for name, html in pages.items():
+        line = f"{name:<28}{len(html) / 1024:>7.0f}"
+        for backend in backends:
+            row = results[backend][name]
+            line += f"{row['seconds'] * 1000:>16.2f}{row['peak_kb']:>10.0f}"
+        print(line)
+    for backend in backends:
+        total = sum(row['seconds'] for row in results[backend].values())
+        peak = max(row['peak_kb'] for row in results[backend].values())
+        print(f"   {backend}: {total * 1000:.1f} ms per corpus pass, max peak {peak:.0f} KB")
+
+    failed = False
+    for name, outcomes in compare_backends(results):
+        failed = True
+        print(f"❌ Backends disagree on {name}: {outcomes}")
+    for name, want in expected.items():
+        got = results[backends[0]].get(name, {}).get('result', {})
+        if any(got.get(key) != value for key, value in expected_fields(want).items()):
+            failed = True
+            print(f"❌ {name}: expected {expected_fields(want)}, got {got}")
+    if not failed:
+        print("✅ All backends extract identical, expected results")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
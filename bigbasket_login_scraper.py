@@ -5,28 +5,71 @@ Simulates real user login to bypass anti-bot protection
 """
 
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium_stealth import stealth
 import time
 import random
 import re
 import json
+import os
+import sys
+
+from page_readiness import wait_for_price_ready
+from browser_extraction import collect_price_candidates, pick_price
+from location_state import RESTORE_STORAGE_JS, origin_of, to_cdp_cookie
+from selector_resolver import SelectorResolver
+
+BIGBASKET_HOME = "https://www.bigbasket.com/"
+
+class ReloginRequired(Exception):
+    """The saved BigBasket session is missing or expired and needs an interactive OTP login"""
 
 class BigBasketLoginScraper:
-    def __init__(self, phone_number, pincode="560102"):
+    PRICE_SELECTORS = [
+        ".Pricing___StyledLabel-sc-pldi2d-1",
+        ".price",
+        ".current-price",
+        "[data-testid='price']",
+        "[class*='Price']",
+        "[class*='price']",
+        ".ProductPrice",
+        ".ProductPriceView",
+        ".MuiTypography-root",
+        "[class*='MuiTypography']",
+    ]
+    
+    # Only a signed-in page has these; class names like 'user' and greetings like 'Welcome' show up
+    # on the logged-out header too. The resolver matches hidden nodes, so a collapsed account menu counts.
+    LOGIN_INDICATORS = [
+        "//a[contains(@href,'logout')]",
+        "//button[contains(text(),'Logout')]",
+        "//a[contains(text(),'Logout')]",
+        "//button[contains(text(),'Log Out')]",
+        "//a[contains(text(),'Log Out')]",
+        "//a[contains(text(),'Sign Out')]",
+    ]
+    
+    def __init__(self, phone_number, pincode="560102", selector_resolver=None,
+                 session_file='.cache/bigbasket_session.json', session_max_age_days=14):
         self.phone_number = phone_number
         self.pincode = pincode
         self.driver = None
         self.logged_in = False
+        # Cookies/localStorage of the last interactive login, reused by headless runs
+        self.session_file = session_file
+        self.session_max_age_days = session_max_age_days
+        # Resolves each locator cascade in one poll loop and remembers which alternative wins.
+        # Its cascades differ from the tracker's, so the stats keep their own group names and file
+        self.selector_resolver = selector_resolver or SelectorResolver('.cache/selector_hits_login.json')
         
-    def setup_driver(self):
+    def setup_driver(self, headless=False):
         """Setup undetected Chrome driver with stealth"""
         options = uc.ChromeOptions()
         
         # Basic stealth options
-        options.add_argument('--headless=False')  # Set to False to see browser
+        if headless:
+            options.add_argument('--headless=new')  # Scheduled runs reusing a saved session
+        else:
+            options.add_argument('--headless=False')  # Set to False to see browser
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
@@ -69,11 +112,18 @@ class BigBasketLoginScraper:
         """Add random delay to mimic human behavior"""
         time.sleep(random.uniform(min_delay, max_delay))
     
+    def wait_for_price(self, max_wait=5, checks=('meta', 'json-ld', 'selector', 'network-idle')):
+        """Wait until a price shows up on the page instead of sleeping a fixed time"""
+        readiness = wait_for_price_ready(self.driver, self.PRICE_SELECTORS, max_wait=max_wait, checks=checks)
+        status = readiness['reason'] if readiness['ready'] else 'no price signal'
+        print(f"⏱️  Page ready in {readiness['elapsed']:.2f}s ({status})")
+        return readiness
+    
     def login_with_phone(self):
         """Login to BigBasket using phone number"""
         try:
             print("🌐 Opening BigBasket login page...")
-            self.driver.get("https://www.bigbasket.com/")
+            self.driver.get(BIGBASKET_HOME)
             self.human_like_delay(3, 5)
             
             # Look for login button
@@ -87,19 +137,11 @@ class BigBasketLoginScraper:
                 "//a[contains(text(),'Sign in')]",
             ]
             
-            login_clicked = False
-            for selector in login_selectors:
-                try:
-                    login_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    login_btn.click()
-                    login_clicked = True
-                    print(f"✅ Clicked login button: {selector}")
-                    self.human_like_delay(2, 3)
-                    break
-                except:
-                    continue
+            selector = self.selector_resolver.click(self.driver, 'bigbasket_login.login', login_selectors, timeout=5)
+            login_clicked = selector is not None
+            if login_clicked:
+                print(f"✅ Clicked login button: {selector}")
+                self.human_like_delay(2, 3)
             
             if not login_clicked:
                 print("❌ Could not find login button")
@@ -118,23 +160,18 @@ class BigBasketLoginScraper:
             ]
             
             phone_entered = False
-            for selector in phone_input_selectors:
-                try:
-                    phone_input = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    phone_input.clear()
-                    # Type phone number like a human
-                    for digit in self.phone_number:
-                        phone_input.send_keys(digit)
-                        time.sleep(random.uniform(0.1, 0.3))
-                    
-                    phone_entered = True
-                    print(f"✅ Entered phone number via: {selector}")
-                    self.human_like_delay(1, 2)
-                    break
-                except:
-                    continue
+            phone_input, selector = self.selector_resolver.resolve(self.driver, 'bigbasket_login.phone',
+                                                                   phone_input_selectors, timeout=5)
+            if phone_input is not None:
+                phone_input.clear()
+                # Type phone number like a human
+                for digit in self.phone_number:
+                    phone_input.send_keys(digit)
+                    time.sleep(random.uniform(0.1, 0.3))
+                
+                phone_entered = True
+                print(f"✅ Entered phone number via: {selector}")
+                self.human_like_delay(1, 2)
             
             if not phone_entered:
                 print("❌ Could not find phone input field")
@@ -151,19 +188,11 @@ class BigBasketLoginScraper:
                 "//button[contains(@class,'submit')]",
             ]
             
-            otp_clicked = False
-            for selector in otp_selectors:
-                try:
-                    otp_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    otp_btn.click()
-                    otp_clicked = True
-                    print(f"✅ Clicked OTP button: {selector}")
-                    self.human_like_delay(3, 5)
-                    break
-                except:
-                    continue
+            selector = self.selector_resolver.click(self.driver, 'bigbasket_login.send_otp', otp_selectors, timeout=5)
+            otp_clicked = selector is not None
+            if otp_clicked:
+                print(f"✅ Clicked OTP button: {selector}")
+                self.human_like_delay(3, 5)
             
             if not otp_clicked:
                 print("❌ Could not find OTP button")
@@ -181,6 +210,10 @@ class BigBasketLoginScraper:
     
     def wait_for_manual_otp(self):
         """Wait for user to manually enter OTP"""
+        if not sys.stdin or not sys.stdin.isatty():
+            # Scheduled runs have nobody to type the OTP; fail fast instead of hanging on input()
+            raise ReloginRequired("OTP entry needs an interactive terminal - run bigbasket_login_scraper.py by hand")
+        
         print("\n" + "="*50)
         print("📱 MANUAL OTP REQUIRED")
         print("="*50)
@@ -193,34 +226,89 @@ class BigBasketLoginScraper:
         input("Press Enter after you've entered the OTP and logged in...")
         
         # Check if login was successful
+        if self.check_logged_in():
+            self.save_session()
+            return True
+        
+        print("❌ Could not confirm login status")
+        return False
+    
+    def check_logged_in(self, timeout=3):
+        """Look for a logged-in indicator on the current page"""
         try:
-            # Look for logged-in indicators
-            login_indicators = [
-                "//div[contains(@class,'user')]",
-                "//span[contains(text(),'My Account')]",
-                "//div[contains(text(),'Welcome')]",
-                "//button[contains(text(),'Logout')]",
-                "//a[contains(text(),'Logout')]",
-            ]
-            
-            for selector in login_indicators:
-                try:
-                    element = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    self.logged_in = True
-                    print(f"✅ Login successful! Found: {selector}")
-                    return True
-                except:
-                    continue
-            
-            print("❌ Could not confirm login status")
+            element, selector = self.selector_resolver.resolve(self.driver, 'bigbasket_login.logged_in',
+                                                               self.LOGIN_INDICATORS, timeout=timeout)
+            if element is not None:
+                self.logged_in = True
+                print(f"✅ Login successful! Found: {selector}")
+                return True
             return False
             
         except Exception as e:
             print(f"❌ Error checking login status: {str(e)}")
             return False
     
+    def save_session(self):
+        """Persist the authenticated cookies and localStorage for headless runs"""
+        try:
+            storage = self.driver.execute_script(
+                "var out = {}; for (var i = 0; i < localStorage.length; i++) {"
+                " var k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out;"
+            ) or {}
+            session = {
+                'origin': origin_of(self.driver.current_url),
+                'cookies': self.driver.get_cookies(),
+                'local_storage': storage,
+                'pincode': self.pincode,
+                'saved_at': time.time(),
+            }
+            directory = os.path.dirname(self.session_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.session_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(session, f)
+            os.replace(tmp_path, self.session_file)
+            print(f"💾 Saved BigBasket session to {self.session_file}")
+            return True
+            
+        except Exception as e:
+            print(f"⚠️  Could not save session: {str(e)}")
+            return False
+    
+    def load_session(self):
+        """Saved session with expired cookies dropped, or None if it is missing or too old"""
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if time.time() - session.get('saved_at', 0) > self.session_max_age_days * 86400:
+            return None
+        now = time.time()
+        session['cookies'] = [c for c in session.get('cookies', []) if not c.get('expiry') or c['expiry'] > now]
+        return session if session['cookies'] else None
+    
+    def resume_session(self):
+        """Start a headless browser with the saved login, or raise ReloginRequired
+
+        Only the cookie jar is checked here; the first product page confirms the login
+        (see scrape_products), so validation costs no extra page load.
+        """
+        session = self.load_session()
+        if session is None:
+            raise ReloginRequired(f"No usable BigBasket session in {self.session_file}")
+        if not self.setup_driver(headless=True):
+            raise RuntimeError("Could not start Chrome")
+        
+        self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': [to_cdp_cookie(c) for c in session['cookies']]})
+        source = RESTORE_STORAGE_JS % (json.dumps(session['origin']), json.dumps(session['local_storage']))
+        self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+        self.logged_in = True
+        print(f"🔑 Resumed BigBasket session from {self.session_file}")
+        return True
+    
     def set_location(self):
         """Set delivery location/pincode"""
         if not self.logged_in:
@@ -240,19 +328,12 @@ class BigBasketLoginScraper:
                 "//button[contains(@class,'location')]",
             ]
             
-            location_clicked = False
-            for selector in location_selectors:
-                try:
-                    location_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    location_btn.click()
-                    location_clicked = True
-                    print(f"✅ Clicked location button: {selector}")
-                    self.human_like_delay(2, 3)
-                    break
-                except:
-                    continue
+            selector = self.selector_resolver.click(self.driver, 'bigbasket_login.location', location_selectors,
+                                                    timeout=5)
+            location_clicked = selector is not None
+            if location_clicked:
+                print(f"✅ Clicked location button: {selector}")
+                self.human_like_delay(2, 3)
             
             if not location_clicked:
                 print("⚠️  Could not find location button, trying direct pincode entry")
@@ -268,19 +349,14 @@ class BigBasketLoginScraper:
             ]
             
             pincode_entered = False
-            for selector in pincode_selectors:
-                try:
-                    pincode_input = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    pincode_input.clear()
-                    pincode_input.send_keys(self.pincode)
-                    pincode_entered = True
-                    print(f"✅ Entered pincode via: {selector}")
-                    self.human_like_delay(1, 2)
-                    break
-                except:
-                    continue
+            pincode_input, selector = self.selector_resolver.resolve(self.driver, 'bigbasket_login.pincode',
+                                                                     pincode_selectors, timeout=5)
+            if pincode_input is not None:
+                pincode_input.clear()
+                pincode_input.send_keys(self.pincode)
+                pincode_entered = True
+                print(f"✅ Entered pincode via: {selector}")
+                self.human_like_delay(1, 2)
             
             # Submit pincode
             if pincode_entered:
@@ -292,17 +368,11 @@ class BigBasketLoginScraper:
                     "//button[@type='submit']",
                 ]
                 
-                for selector in submit_selectors:
-                    try:
-                        submit_btn = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        submit_btn.click()
-                        print(f"✅ Clicked submit button: {selector}")
-                        self.human_like_delay(3, 5)
-                        break
-                    except:
-                        continue
+                selector = self.selector_resolver.click(self.driver, 'bigbasket_login.submit', submit_selectors,
+                                                        timeout=5)
+                if selector:
+                    print(f"✅ Clicked submit button: {selector}")
+                    self.human_like_delay(3, 5)
             
             print("✅ Location setup completed")
             return True
@@ -311,6 +381,16 @@ class BigBasketLoginScraper:
             print(f"❌ Location setup failed: {str(e)}")
             return False
     
+    def scrape_products(self, urls):
+        """Scrape many products in one logged-in session; raises ReloginRequired if it has lapsed"""
+        prices = {}
+        for index, url in enumerate(urls):
+            prices[url] = self.scrape_product_price(url)
+            if index == 0 and not self.check_logged_in():
+                self.logged_in = False
+                raise ReloginRequired("Saved BigBasket session is no longer logged in")
+        return prices
+    
     def scrape_product_price(self, url):
         """Scrape product price after login"""
         if not self.logged_in:
@@ -320,7 +400,7 @@ class BigBasketLoginScraper:
         try:
             print(f"🛒 Scraping product: {url}")
             self.driver.get(url)
-            self.human_like_delay(3, 5)
+            self.wait_for_price()
             
             # Find price using multiple methods
             price = self._find_price()
@@ -338,31 +418,12 @@ class BigBasketLoginScraper:
     
     def _find_price(self):
         """Find price using multiple methods"""
-        price_selectors = [
-            ".Pricing___StyledLabel-sc-pldi2d-1",
-            ".price",
-            ".current-price",
-            "[data-testid='price']",
-            "[class*='Price']",
-            "[class*='price']",
-            ".ProductPrice",
-            ".ProductPriceView",
-            ".MuiTypography-root",
-            "[class*='MuiTypography']",
-        ]
-        
-        for selector in price_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and ('₹' in text or 'Rs' in text or any(char.isdigit() for char in text)):
-                        price = self._extract_price(text)
-                        if price:
-                            print(f"✅ Found price via {selector}: ₹{price}")
-                            return price
-            except:
-                continue
+        # All meta/CSS candidates in one round trip instead of one call per element
+        candidates = collect_price_candidates(self.driver, self.PRICE_SELECTORS)
+        price, hit = pick_price(candidates, self._extract_price, sources=('meta', 'css'))
+        if price:
+            print(f"✅ Found price via {hit['selector']}: ₹{price}")
+            return price
         
         # Check page source as fallback
         page_source = self.driver.page_source
@@ -397,8 +458,10 @@ class BigBasketLoginScraper:
     
     def close(self):
         """Close the driver"""
+        self.selector_resolver.save()
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
 def test_phone_login():
     """Test the phone login approach"""
@@ -414,26 +477,35 @@ def test_phone_login():
         return False
     
     scraper = BigBasketLoginScraper(phone_number, pincode="560102")
+    test_url = "https://www.bigbasket.com/pd/40326186/the-whole-truth-cold-coffee-pro-whey-protein-powder-1-kg/"
     
     try:
-        # Setup driver
-        if not scraper.setup_driver():
-            return False
-        
-        # Login with phone
-        if not scraper.login_with_phone():
-            return False
-        
-        # Wait for manual OTP
-        if not scraper.wait_for_manual_otp():
-            return False
-        
-        # Set location
-        scraper.set_location()
-        
-        # Test product scraping
-        test_url = "https://www.bigbasket.com/pd/40326186/the-whole-truth-cold-coffee-pro-whey-protein-powder-1-kg/"
-        price = scraper.scrape_product_price(test_url)
+        # Reuse the last login when there is one
+        try:
+            scraper.resume_session()
+            price = scraper.scrape_products([test_url])[test_url]
+        except ReloginRequired as e:
+            print(f"🔑 {e} - logging in again")
+            scraper.close()
+            
+            # Setup driver
+            if not scraper.setup_driver():
+                return False
+            
+            # Login with phone
+            if not scraper.login_with_phone():
+                return False
+            
+            # Wait for manual OTP
+            if not scraper.wait_for_manual_otp():
+                return False
+            
+            # Set location, and keep it with the saved session
+            scraper.set_location()
+            scraper.save_session()
+            
+            # Test product scraping
+            price = scraper.scrape_product_price(test_url)
         
         if price:
             print(f"🎉 SUCCESS! Price: ₹{price}")
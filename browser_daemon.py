@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Long-lived headless Chrome daemon with warm profiles
+Keeps browsers listening on local DevTools ports so tracker runs attach instead of booting Chrome
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+DEFAULT_STATE_FILE = '.cache/browser_daemon.json'
+DEFAULT_PROFILE_DIR = '.cache/chrome-profiles'
+CHROME_CANDIDATES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+BROWSER_ARGS = [
+    '--headless=new',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1920,1080',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-blink-features=AutomationControlled',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--remote-debugging-address=127.0.0.1',
+]
+
+
+def find_chrome():
+    """Chrome binary from $CHROME_BIN or the usual names on PATH"""
+    if os.getenv('CHROME_BIN') and os.path.exists(os.getenv('CHROME_BIN')):
+        return os.getenv('CHROME_BIN')
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def is_healthy(address, timeout=1.0):
+    """True if a browser answers on its DevTools endpoint"""
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+def read_state(state_file=DEFAULT_STATE_FILE):
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def healthy_browsers(state_file=DEFAULT_STATE_FILE):
+    """DevTools addresses of the daemon's browsers that currently respond"""
+    state = read_state(state_file)
+    if not state:
+        return []
+    return [b['address'] for b in state.get('browsers', []) if is_healthy(b['address'])]
+
+
+def browser_pid(address, state_file=DEFAULT_STATE_FILE):
+    """Pid of the daemon browser listening on a DevTools address, or None"""
+    state = read_state(state_file) or {}
+    for browser in state.get('browsers', []):
+        if browser.get('address') == address:
+            return browser.get('pid')
+    return None
+
+
+class BrowserDaemon:
+    """Starts `size` headless browsers on fixed local ports and restarts any that die"""
+
+    def __init__(self, size=2, base_port=9300, profile_dir=DEFAULT_PROFILE_DIR, state_file=DEFAULT_STATE_FILE,
+                 chrome_binary=None, health_interval=10, startup_timeout=30):
+        self.size = max(1, int(size))
+        self.base_port = base_port
+        self.profile_dir = profile_dir
+        self.state_file = state_file
+        self.chrome_binary = chrome_binary or find_chrome()
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+        self.browsers = [None] * self.size
+        self.stats = {'starts': 0, 'restarts': 0, 'startup_seconds': 0.0}
+        self.running = False
+
+    def _launch(self, slot):
+        """Start the browser for one slot on its port and profile, and wait until it answers"""
+        port = self.base_port + slot
+        address = f"127.0.0.1:{port}"
+        # Each slot keeps its own profile: Chrome locks a user-data-dir to one process
+        profile = os.path.abspath(os.path.join(self.profile_dir, f'slot-{slot}'))
+        os.makedirs(profile, exist_ok=True)
+        args = [self.chrome_binary, *BROWSER_ARGS, f'--remote-debugging-port={port}', f'--user-data-dir={profile}',
+                'about:blank']
+        started = time.time()
+        process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   start_new_session=True)
+        while time.time() - started < self.startup_timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Chrome for slot {slot} exited with code {process.returncode}")
+            if is_healthy(address):
+                break
+            time.sleep(0.2)
+        else:
+            self._kill(process)
+            raise RuntimeError(f"Chrome for slot {slot} did not open port {port}")
+
+        elapsed = time.time() - started
+        previous = self.browsers[slot]
+        self.browsers[slot] = {
+            'slot': slot,
+            'address': address,
+            'pid': process.pid,
+            'process': process,
+            'started_at': time.time(),
+            'startup_seconds': elapsed,
+            'restarts': (previous['restarts'] + 1) if previous else 0,
+        }
+        self.stats['starts'] += 1
+        self.stats['startup_seconds'] += elapsed
+        print(f"🔧 Browser slot {slot} listening on {address} ({elapsed:.1f}s startup)")
+
+    @staticmethod
+    def _kill(process):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    def ensure(self):
+        """Health-check every slot and restart browsers that crashed or stopped answering"""
+        for slot in range(self.size):
+            browser = self.browsers[slot]
+            if browser and browser['process'].poll() is None and is_healthy(browser['address']):
+                continue
+            if browser:
+                print(f"♻️  Browser slot {slot} is unhealthy, restarting")
+                self._kill(browser['process'])
+                self.stats['restarts'] += 1
+            try:
+                self._launch(slot)
+            except Exception as e:
+                print(f"❌ Could not start browser slot {slot}: {e}")
+        self.write_state()
+
+    def write_state(self):
+        """Publish the live browsers for tracker runs to attach to"""
+        state = {
+            'pid': os.getpid(),
+            'updated_at': time.time(),
+            'stats': self.stats,
+            'browsers': [
+                {key: value for key, value in browser.items() if key != 'process'}
+                for browser in self.browsers if browser
+            ],
+        }
+        directory = os.path.dirname(self.state_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def serve_forever(self):
+        """Keep the browsers healthy until SIGTERM/SIGINT"""
+        if not self.chrome_binary:
+            raise RuntimeError("Chrome not found (set CHROME_BIN)")
+        self.running = True
+
+        def stop(signum, frame):
+            self.running = False
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        try:
+            while self.running:
+                self.ensure()
+                deadline = time.time() + self.health_interval
+                while self.running and time.time() < deadline:
+                    time.sleep(0.5)
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Kill every browser and remove the state file"""
+        for browser in self.browsers:
+            if browser:
+                self._kill(browser['process'])
+        self.browsers = [None] * self.size
+        try:
+            os.remove(self.state_file)
+        except OSError:
+            pass
+        print("🧹 Browser daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-spawned headless Chrome for the price tracker")
+    parser.add_argument('command', choices=['start', 'status', 'stop'])
+    parser.add_argument('--size', type=int, default=2, help='browsers to keep running')
+    parser.add_argument('--base-port', type=int, default=9300)
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE)
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'start':
+        BrowserDaemon(size=args.size, base_port=args.base_port, profile_dir=args.profile_dir,
+                      state_file=args.state_file).serve_forever()
+    elif args.command == 'status':
+        state = read_state(args.state_file)
+        if not state:
+            print("Browser daemon is not running")
+            return 1
+        for browser in state['browsers']:
+            status = 'healthy' if is_healthy(browser['address']) else 'DOWN'
+            print(f"slot {browser['slot']}: {browser['address']} {status}, "
+                  f"{browser['restarts']} restart(s), {browser['startup_seconds']:.1f}s startup")
+    else:
+        state = read_state(args.state_file)
+        if state:
+            try:
+                os.kill(state['pid'], signal.SIGTERM)
+                print(f"Sent SIGTERM to browser daemon (pid {state['pid']})")
+            except ProcessLookupError:
+                print("Browser daemon was not running")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
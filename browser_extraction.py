@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Single-round-trip price extraction for the Selenium paths
+One execute_script call collects every meta, JSON-LD and CSS price candidate; Python only ranks them
+"""
+
+DEFAULT_META_SELECTORS = [
+    {'attr': 'property', 'value': 'product:price:amount'},
+    {'attr': 'property', 'value': 'og:price:amount'},
+    {'attr': 'name', 'value': 'price'},
+    {'attr': 'property', 'value': 'price'},
+    {'attr': 'itemprop', 'value': 'price'},
+]
+
+# Candidates come back in priority order: meta tags, JSON-LD scripts, then CSS
+# selectors in the order given. Only texts containing a digit are returned.
+COLLECT_CANDIDATES_JS = """
+var cssSelectors = arguments[0], metaSelectors = arguments[1], limit = arguments[2];
+var out = [], hasDigit = /\\d/;
+metaSelectors.forEach(function (m) {
+    var nodes = document.querySelectorAll('meta[' + m.attr + '="' + m.value + '"]');
+    for (var i = 0; i < nodes.length; i++) {
+        var content = nodes[i].getAttribute('content') || '';
+        if (hasDigit.test(content)) {
+            out.push({source: 'meta', selector: m.attr + '=' + m.value, text: content});
+        }
+    }
+});
+var scripts = document.querySelectorAll('script[type="application/ld+json"]');
+for (var j = 0; j < scripts.length; j++) {
+    out.push({source: 'json-ld', selector: 'script[type="application/ld+json"]', text: scripts[j].textContent});
+}
+cssSelectors.forEach(function (selector) {
+    var nodes;
+    try { nodes = document.querySelectorAll(selector); } catch (e) { return; }
+    for (var k = 0, seen = 0; k < nodes.length && seen < limit; k++) {
+        var text = ((nodes[k].innerText || nodes[k].textContent) || '').trim();
+        if (hasDigit.test(text)) {
+            out.push({source: 'css', selector: selector, text: text.slice(0, 200)});
+            seen++;
+        }
+    }
+});
+return out;
+"""
+
+
+def collect_price_candidates(driver, css_selectors, meta_selectors=None, max_per_selector=10):
+    """Every price candidate on the page, with its source, in one WebDriver round trip"""
+    if meta_selectors is None:
+        meta_selectors = DEFAULT_META_SELECTORS
+    try:
+        return driver.execute_script(COLLECT_CANDIDATES_JS, list(css_selectors), list(meta_selectors),
+                                     max_per_selector) or []
+    except Exception as e:
+        print(f"⚠️  In-page extraction failed: {e}")
+        return []
+
+
+def pick_price(candidates, parse_text, parse_jsonld=None, selectors=None, sources=None):
+    """First candidate (in priority order) that parses to a price
+
+    `selectors` limits CSS candidates to that group and `sources` limits which
+    sources are considered; returns (price, candidate) or (None, None)
+    """
+    for candidate in candidates:
+        if sources is not None and candidate['source'] not in sources:
+            continue
+        if candidate['source'] == 'css' and selectors is not None and candidate['selector'] not in selectors:
+            continue
+        if candidate['source'] == 'json-ld':
+            price = parse_jsonld(candidate['text']) if parse_jsonld else None
+        else:
+            price = parse_text(candidate['text'])
+        if price:
+            return price, candidate
+    return None, None
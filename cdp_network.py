@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+DevTools-protocol network helpers for the Selenium paths
+Blocks images, fonts, media and trackers per page, reads Chrome's performance log
+and captures product-API JSON responses straight off the wire
+"""
+
+import base64
+import json
+import re
+import time
+
+RESOURCE_TYPE_EXTENSIONS = {
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'm3u8', 'mp3', 'ogg', 'mov'],
+}
+
+# URL patterns (Network.setBlockedURLs wildcards) for each blockable resource type; image CDNs
+# put resize options in the query string ("img.jpg?tr=w-400"), so each extension also gets a "?*" form.
+# setBlockedURLs only sees URLs, so extension-less images still load (Fetch-based blocking by
+# resource type needs an event loop answering Fetch.requestPaused, which plain WebDriver lacks).
+RESOURCE_TYPE_PATTERNS = {
+    resource_type: [pattern for ext in extensions for pattern in (f'*.{ext}', f'*.{ext}?*')]
+    for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()
+}
+
+DEFAULT_TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*facebook.net*',
+    '*connect.facebook.com*',
+    '*hotjar.com*',
+    '*clarity.ms*',
+    '*newrelic.com*',
+    '*nr-data.net*',
+    '*moengage.com*',
+    '*branch.io*',
+    '*segment.io*',
+    '*criteo.com*',
+]
+
+DEFAULT_BLOCKING_POLICY = {
+    'enabled': True,
+    'types': ['image', 'font', 'media'],
+    'url_patterns': DEFAULT_TRACKER_PATTERNS,
+    # domain -> resource types or URL patterns that site needs to render its price
+    'allow': {},
+}
+
+
+def blocked_patterns_for(policy, domain):
+    """The Network.setBlockedURLs list for one site, after its allowlist"""
+    policy = policy or {}
+    if not policy.get('enabled', True):
+        return []
+
+    allowed = []
+    for site, items in policy.get('allow', {}).items():
+        if domain == site or domain.endswith('.' + site):
+            allowed.extend(items)
+
+    patterns = []
+    for resource_type in policy.get('types', []):
+        if resource_type not in allowed:
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    patterns.extend(p for p in policy.get('url_patterns', []) if p not in allowed)
+    return patterns
+
+
+def drain_performance_log(driver):
+    """Parsed DevTools events buffered since the last call (empty if logging is off)"""
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return []
+    events = []
+    for entry in entries:
+        try:
+            events.append(json.loads(entry['message'])['message'])
+        except (KeyError, ValueError):
+            continue
+    return events
+
+
+def apply_blocking(driver, patterns):
+    """Block the given URL patterns for the driver's current tab (the performance log is left alone)"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+
+def network_stats(events):
+    """Requests blocked and bytes actually transferred for one page
+
+    Chrome never downloads a blocked request, so only its count is known, not its size.
+    """
+    stats = {'requests': 0, 'blocked_requests': 0, 'transferred_bytes': 0}
+    for event in events:
+        method = event.get('method')
+        params = event.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            stats['requests'] += 1
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            stats['blocked_requests'] += 1
+        elif method == 'Network.loadingFinished':
+            stats['transferred_bytes'] += int(params.get('encodedDataLength') or 0)
+    return stats
+
+
+# --- Product API capture -------------------------------------------------
+
+PRICE_KEYS = ['sp', 'sellingPrice', 'selling_price', 'salePrice', 'sale_price', 'offerPrice', 'offer_price',
+              'discountedPrice', 'finalPrice', 'price']
+MRP_KEYS = ['mrp', 'MRP', 'listPrice', 'list_price', 'originalPrice', 'maxRetailPrice']
+STOCK_KEYS = ['in_stock', 'inStock', 'is_available', 'isAvailable', 'available', 'availability', 'avail_status']
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if isinstance(value, str):
+        cleaned = value.replace(',', '').replace('₹', '').strip()
+        try:
+            number = float(cleaned)
+            return number if number > 0 else None
+        except ValueError:
+            return None
+    return None
+
+
+ID_KEYS = ['id', 'product_id', 'productId', 'prod_id', 'sku_id', 'skuId', 'sku']
+
+
+def _node_ids(node):
+    """String values of a dict's product-id fields"""
+    return {str(node[key]) for key in ID_KEYS
+            if isinstance(node.get(key), (str, int)) and not isinstance(node.get(key), bool)}
+
+
+def find_product_node(data, product_id):
+    """The first dict (breadth first) whose id field equals product_id, or None"""
+    product_id = str(product_id)
+    queue = [data]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            if product_id in _node_ids(node):
+                return node
+            queue.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            queue.extend(v for v in node if isinstance(v, (dict, list)))
+    return None
+
+
+def product_from_json(data, product_id, price_keys=PRICE_KEYS, mrp_keys=MRP_KEYS, stock_keys=STOCK_KEYS):
+    """Price, MRP and stock of one product in an API payload, all read from that product's node
+
+    Listing responses also carry recommended and similar items, so the node is picked by
+    product id; items nested inside it with another id are skipped. None if the id is absent.
+    """
+    product = find_product_node(data, product_id)
+    if product is None:
+        return None
+    found = {}
+    queue = [product]
+    while queue and not ('price' in found and 'mrp' in found and 'in_stock' in found):
+        node = queue.pop(0)
+        if isinstance(node, dict):
+            ids = _node_ids(node)
+            if ids and str(product_id) not in ids:
+                continue  # another item (bundle, similar product) nested in this one
+            if 'price' not in found:
+                for key in price_keys:
+                    number = _number(node.get(key))
+                    if number:
+                        found['price'] = number
+                        break
+            if 'mrp' not in found:
+                for key in mrp_keys:
+                    number = _number(node.get(key))
+                    if number:
+                        found['mrp'] = number
+                        break
+            if 'in_stock' not in found:
+                for key in stock_keys:
+                    if key in node and not isinstance(node[key], (dict, list)):
+                        value = node[key]
+                        found['in_stock'] = value if isinstance(value, bool) else str(value)
+                        break
+            queue.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            queue.extend(v for v in node if isinstance(v, (dict, list)))
+    return found if 'price' in found else None
+
+
+def product_id_from_url(url, pattern):
+    """Product id captured by the pattern's first group (e.g. r'/pd/(\\d+)'), or None"""
+    match = re.search(pattern, url) if pattern else None
+    return match.group(1) if match else None
+
+
+def capture_product_json(driver, url_patterns, product_id, timeout=3.0, poll_interval=0.1, events=None):
+    """Wait for an XHR/fetch JSON response matching url_patterns that carries product_id and parse it
+
+    Every drained DevTools event is appended to `events` so page stats can still be computed.
+    Returns {'price', 'mrp', 'in_stock', 'source_url'} or None on timeout.
+    """
+    compiled = [re.compile(p) for p in url_patterns]
+    candidates = {}  # requestId -> response URL
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        for event in drain_performance_log(driver):
+            if events is not None:
+                events.append(event)
+            method = event.get('method')
+            params = event.get('params', {})
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if 'json' in response.get('mimeType', '') and any(p.search(response.get('url', '')) for p in compiled):
+                    candidates[params.get('requestId')] = response.get('url')
+            elif method == 'Network.loadingFinished' and params.get('requestId') in candidates:
+                request_id = params['requestId']
+                try:
+                    body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+                    text = body.get('body', '')
+                    if body.get('base64Encoded'):
+                        text = base64.b64decode(text).decode('utf-8', 'replace')
+                    product = product_from_json(json.loads(text), product_id)
+                except Exception:
+                    product = None
+                if product:
+                    product['source_url'] = candidates[request_id]
+                    return product
+        time.sleep(poll_interval)
+    return None
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Reusable Chrome WebDriver pool
+Keeps a few browsers alive for a whole run instead of one Chrome per product
+"""
+
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from product_watchdog import kill_pids, process_tree
+
+# Make psutil optional (only needed for the memory ceiling)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+class PooledDriver:
+    """A WebDriver plus the bookkeeping the pool needs to recycle it"""
+
+    def __init__(self, driver, index):
+        self.driver = driver
+        self.index = index
+        self.pages = 0
+        self.created_at = time.time()
+        self.acquired_at = None
+        self.owner = None       # thread ident of the check currently using the driver
+        self.killed = False
+
+    def pids(self):
+        """chromedriver and every browser process under it"""
+        try:
+            return process_tree(self.driver.service.process.pid)
+        except Exception:
+            return []
+
+    def memory_mb(self):
+        """Resident memory of chromedriver and all its Chrome children (MB)"""
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except Exception:
+            return None
+
+
+class DriverPool:
+    """Hands out warm Chrome drivers and recycles them after N pages or a memory ceiling"""
+
+    def __init__(self, driver_factory, size=2, max_pages=25, max_memory_mb=1024, on_quit=None, on_kill=None):
+        self.driver_factory = driver_factory
+        # Called with each driver after it is quit (e.g. to free an attached daemon browser)
+        self.on_quit = on_quit
+        # Called with each driver the watchdog kills; returns extra processes it killed (e.g. a daemon browser)
+        self.on_kill = on_kill
+        self.size = max(1, int(size))
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._live = []
+        self._starting = 0
+        self._created = 0
+        self.closed = False
+
+        # Startup time (factory calls) is kept apart from time spent serving pages
+        self.stats = {'started': 0, 'recycled': 0, 'discarded': 0, 'pages': 0,
+                      'startup_seconds': 0.0, 'page_seconds': 0.0}
+
+        atexit.register(self.close)
+
+    def _start_driver(self):
+        """Start a new browser via the factory (caller has reserved a slot)"""
+        with self._lock:
+            self._created += 1
+            index = self._created
+        started = time.time()
+        try:
+            driver = self.driver_factory()
+        except BaseException:
+            with self._lock:
+                self._starting -= 1
+            raise
+        pooled = PooledDriver(driver, index)
+        elapsed = time.time() - started
+        with self._lock:
+            # Hand over from "starting" to "live" atomically so live_pids() never misses it
+            self._starting -= 1
+            self._live.append(pooled)
+            self.stats['started'] += 1
+            self.stats['startup_seconds'] += elapsed
+        print(f"🔧 Started pooled Chrome #{index} in {elapsed:.1f}s")
+        return pooled
+
+    def acquire(self, timeout=None):
+        """Get an idle driver, starting a new one while the pool is below its size"""
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            if self.closed:
+                raise RuntimeError('Driver pool is closed')
+
+            try:
+                return self._checkout(self._idle.get_nowait())
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_start = len(self._live) + self._starting < self.size
+                if can_start:
+                    self._starting += 1
+            if can_start:
+                return self._checkout(self._start_driver())
+
+            # Poll so a slot freed by a recycled driver is noticed too
+            try:
+                return self._checkout(self._idle.get(timeout=0.5))
+            except queue.Empty:
+                if deadline and time.time() > deadline:
+                    raise TimeoutError('No pooled Chrome driver became available')
+
+    def _checkout(self, pooled):
+        pooled.pages += 1
+        pooled.acquired_at = time.time()
+        pooled.owner = threading.get_ident()
+        with self._lock:
+            self.stats['pages'] += 1
+        return pooled
+
+    def release(self, pooled, discard=False):
+        """Return a driver to the pool, resetting or recycling it as needed"""
+        if pooled.acquired_at:
+            with self._lock:
+                self.stats['page_seconds'] += time.time() - pooled.acquired_at
+            pooled.acquired_at = None
+        pooled.owner = None
+        if self.closed:
+            self._quit(pooled)
+            return
+
+        reason = None
+        if pooled.killed:
+            reason = 'killed by watchdog'
+        elif discard:
+            reason = 'error'
+        elif self.max_pages and pooled.pages >= self.max_pages:
+            reason = f'{pooled.pages} pages'
+        elif self.max_memory_mb:
+            memory = pooled.memory_mb()
+            if memory is not None and memory > self.max_memory_mb:
+                reason = f'{memory:.0f} MB'
+
+        if reason is None and not self._reset(pooled):
+            reason = 'reset failed'
+
+        if reason:
+            print(f"♻️  Recycling pooled Chrome #{pooled.index} ({reason})")
+            with self._lock:
+                self.stats['discarded' if discard else 'recycled'] += 1
+            self._quit(pooled)
+            return
+
+        self._idle.put(pooled)
+
+    def kill_owned_by(self, owner):
+        """Kill the process trees of drivers checked out by a thread; returns processes killed"""
+        with self._lock:
+            owned = [pooled for pooled in self._live if pooled.owner == owner]
+        killed = 0
+        for pooled in owned:
+            pooled.killed = True
+            killed += kill_pids(pooled.pids())
+            if self.on_kill:
+                killed += self.on_kill(pooled.driver) or 0
+        return killed
+
+    def live_pids(self):
+        """Processes belonging to live drivers, or None while a driver is still starting"""
+        with self._lock:
+            if self._starting:
+                return None
+            live = list(self._live)
+        pids = set()
+        for pooled in live:
+            pids.update(pooled.pids())
+        return pids
+
+    def _reset(self, pooled):
+        """Clear cookies, storage and extra tabs so the next page starts clean"""
+        driver = pooled.driver
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, pooled):
+        with self._lock:
+            if pooled in self._live:
+                self._live.remove(pooled)
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        if self.on_quit:
+            self.on_quit(pooled.driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Context manager that yields a driver and always hands it back"""
+        pooled = self.acquire(timeout=timeout)
+        try:
+            yield pooled.driver
+        except BaseException:
+            self.release(pooled, discard=True)
+            raise
+        else:
+            self.release(pooled)
+
+    def close(self):
+        """Quit every browser the pool started"""
+        if self.closed:
+            return
+        self.closed = True
+        with self._lock:
+            live = list(self._live)
+        for pooled in live:
+            self._quit(pooled)
+        if live:
+            print(f"🧹 Closed {len(live)} pooled Chrome driver(s)")
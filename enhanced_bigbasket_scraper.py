@@ -5,18 +5,37 @@ Based on 2024 research for bypassing modern bot detection
 """
 
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium_stealth import stealth
 import time
 import random
 import re
 
+from page_readiness import page_fingerprint, wait_for_price_ready
+from browser_extraction import collect_price_candidates, pick_price
+from location_state import LocationStateStore
+from selector_resolver import SelectorResolver
+
 class EnhancedBigBasketScraper:
-    def __init__(self, pincode="560102"):
+    PRICE_SELECTORS = [
+        ".Pricing___StyledLabel-sc-pldi2d-1",
+        ".price",
+        ".current-price",
+        "[data-testid='price']",
+        "[class*='Price']",
+        "[class*='price']",
+        ".ProductPrice",
+        ".ProductPriceView",
+        ".MuiTypography-root",
+        "[class*='MuiTypography']",
+    ]
+    
+    def __init__(self, pincode="560102", location_state=None, selector_resolver=None):
         self.pincode = pincode
         self.driver = None
+        # Location cookies/localStorage from an earlier run, so _set_location runs once per pincode
+        self.location_state = location_state or LocationStateStore()
+        # Its cascades differ from the tracker's, so the stats keep their own group names and file
+        self.selector_resolver = selector_resolver or SelectorResolver('.cache/selector_hits_enhanced.json')
         
     def setup_driver(self):
         """Setup undetected Chrome driver with stealth"""
@@ -69,6 +88,14 @@ class EnhancedBigBasketScraper:
         """Add random delay to mimic human behavior"""
         time.sleep(random.uniform(min_delay, max_delay))
     
+    def wait_for_price(self, max_wait=5, checks=('meta', 'json-ld', 'selector', 'network-idle'), baseline=None):
+        """Wait until a price shows up on the page instead of sleeping a fixed time"""
+        readiness = wait_for_price_ready(self.driver, self.PRICE_SELECTORS, max_wait=max_wait, checks=checks,
+                                         baseline=baseline)
+        status = readiness['reason'] if readiness['ready'] else 'no price signal'
+        print(f"⏱️  Page ready in {readiness['elapsed']:.2f}s ({status})")
+        return readiness
+    
     def scrape_bigbasket_product(self, url):
         """Scrape BigBasket product with enhanced techniques"""
         if not self.setup_driver():
@@ -76,18 +103,38 @@ class EnhancedBigBasketScraper:
         
         try:
             print(f"🌐 Loading BigBasket product: {url}")
+            saved_location = self.location_state.get('bigbasket.com', self.pincode)
+            injected = None
+            if saved_location:
+                try:
+                    injected = self.location_state.inject(self.driver, saved_location)
+                except Exception as e:
+                    print(f"⚠️  Could not restore saved location: {e}")
+                    saved_location = None
             self.driver.get(url)
-            self.human_like_delay(3, 5)
+            self.location_state.remove_injection(self.driver, injected)
+            self.wait_for_price()
             
             # First try to find price without location
             price = self._find_price()
+            if not price and saved_location:
+                self.location_state.invalidate('bigbasket.com', self.pincode)
             
             # If no price, try to set location
             if not price:
                 print("🏪 Setting location for pincode:", self.pincode)
+                before_location = page_fingerprint(self.driver, self.PRICE_SELECTORS)
                 if self._set_location():
-                    self.human_like_delay(3, 5)
+                    # The pre-submit page already has a price; wait for it or the location label to change
+                    if before_location is not None:
+                        self.wait_for_price(checks=('changed',), baseline=before_location)
+                    else:
+                        self.wait_for_price(checks=('selector', 'network-idle'))
                     price = self._find_price()
+                    if price:
+                        self.location_state.capture(self.driver, 'bigbasket.com', self.pincode)
+                self.location_state.save()
+                self.selector_resolver.save()
             
             self.driver.quit()
             return price
@@ -102,31 +149,12 @@ class EnhancedBigBasketScraper:
     
     def _find_price(self):
         """Find price using multiple methods"""
-        price_selectors = [
-            ".Pricing___StyledLabel-sc-pldi2d-1",
-            ".price",
-            ".current-price",
-            "[data-testid='price']",
-            "[class*='Price']",
-            "[class*='price']",
-            ".ProductPrice",
-            ".ProductPriceView",
-            ".MuiTypography-root",
-            "[class*='MuiTypography']",
-        ]
-        
-        for selector in price_selectors:
-            try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and ('₹' in text or 'Rs' in text or any(char.isdigit() for char in text)):
-                        price = self._extract_price(text)
-                        if price:
-                            print(f"✅ Found price via {selector}: ₹{price}")
-                            return price
-            except:
-                continue
+        # All meta/CSS candidates in one round trip instead of one call per element
+        candidates = collect_price_candidates(self.driver, self.PRICE_SELECTORS)
+        price, hit = pick_price(candidates, self._extract_price, sources=('meta', 'css'))
+        if price:
+            print(f"✅ Found price via {hit['selector']}: ₹{price}")
+            return price
         
         # Check page source as fallback
         page_source = self.driver.page_source
@@ -167,37 +195,43 @@ class EnhancedBigBasketScraper:
             "//button[contains(@class,'location')]",
             "//div[contains(@class,'location')]",
         ]
+        pincode_selectors = [
+            "//input[@type='number']",
+            "//input[contains(@placeholder,'pincode')]",
+        ]
+        submit_selectors = [
+            "//button[contains(text(),'Check')]",
+            "//button[contains(text(),'Submit')]",
+            "//button[contains(text(),'Apply')]",
+        ]
         
-        for selector in location_selectors:
-            try:
-                location_btn = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, selector))
-                )
-                location_btn.click()
-                self.human_like_delay(1, 2)
-                
-                # Enter pincode
-                pincode_input = WebDriverWait(self.driver, 3).until(
-                    EC.presence_of_element_located((By.XPATH, "//input[@type='number'] | //input[contains(@placeholder,'pincode')]"))
-                )
-                pincode_input.clear()
-                pincode_input.send_keys(self.pincode)
-                self.human_like_delay(0.5, 1)
-                
-                # Submit
-                submit_btn = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((By.XPATH, "//button[contains(text(),'Check') or contains(text(),'Submit') or contains(text(),'Apply')]"))
-                )
-                submit_btn.click()
-                self.human_like_delay(2, 3)
-                
-                print("✅ Location set successfully")
-                return True
-                
-            except:
-                continue
-        
-        return False
+        try:
+            # Each cascade is one poll loop against one deadline
+            if not self.selector_resolver.click(self.driver, 'bigbasket_enhanced.location', location_selectors,
+                                                timeout=5):
+                return False
+            self.human_like_delay(1, 2)
+            
+            # Enter pincode
+            pincode_input, _ = self.selector_resolver.resolve(self.driver, 'bigbasket_enhanced.pincode',
+                                                              pincode_selectors, timeout=3)
+            if pincode_input is None:
+                return False
+            pincode_input.clear()
+            pincode_input.send_keys(self.pincode)
+            self.human_like_delay(0.5, 1)
+            
+            # Submit
+            if not self.selector_resolver.click(self.driver, 'bigbasket_enhanced.submit', submit_selectors,
+                                                timeout=3):
+                return False
+            # No pause here: the caller waits until the price or location label changes
+            
+            print("✅ Location set successfully")
+            return True
+            
+        except:
+            return False
 
 def test_enhanced_scraper():
     """Test the enhanced scraper"""
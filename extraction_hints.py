@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Per-domain extraction hints learned from accepted prices
+The extractor (and selector or JSON path) that priced a site last time is tried first on its next page
+"""
+
+import threading
+import time
+
+# Methods worth remembering; a bare price in the page text is too weak to short-circuit anything
+LEARNABLE_METHODS = ('meta', 'json-ld', 'app-state', 'css')
+
+# Targeted lookups a product's "extraction" entry can name, next to its 'tier'
+PRODUCT_HINT_KEYS = ('regex', 'selector', 'jsonld_path', 'state_path')
+
+
+def hint_from_result(result):
+    """The hint that would reproduce a successful extraction result, or None"""
+    method = result.get('method')
+    if method not in LEARNABLE_METHODS or 'error' in result:
+        return None
+    hint = {'method': method}
+    if method in ('meta', 'css'):
+        if not result.get('selector'):
+            return None
+        hint['selector'] = result['selector']
+    elif method == 'app-state':
+        if not result.get('path'):
+            return None
+        hint['path'] = result['path']
+    return hint
+
+
+def describe(hint):
+    """Short label for a hint, e.g. 'css .a-price-whole'"""
+    detail = hint.get('selector') or hint.get('path') or ''
+    return f"{hint['method']} {detail}".strip()
+
+
+def product_hints_from_result(result, tier):
+    """Per-product hints for a priced page: the tier it needed plus the lookup that found the price
+
+    Meta prices become a selector read from the tag's content attribute; a result with
+    nothing targeted to remember (e.g. a page-source regex) keeps only the tier.
+    """
+    hints = {'tier': tier}
+    method = result.get('method')
+    if method == 'css' and result.get('selector'):
+        hints['selector'] = result['selector']
+    elif method == 'meta' and result.get('selector'):
+        attr, _, value = result['selector'].partition('=')
+        hints.update(selector=f'meta[{attr}="{value}"]', attribute='content')
+    elif method == 'json-ld' and result.get('path'):
+        hints['jsonld_path'] = result['path']
+    elif method == 'app-state' and result.get('path'):
+        hints['state_path'] = result['path']
+    return hints
+
+
+def describe_product_hints(hints):
+    """Short label for a product's hints, e.g. 'http selector .a-price-whole'"""
+    tier = hints.get('tier', 'http')
+    for key in PRODUCT_HINT_KEYS:
+        if hints.get(key):
+            return f"{tier} {key} {hints[key]}"
+    return f"{tier} tier only"
+
+
+class ExtractionHints:
+    """domain -> winning extractor plus hit/miss counts; persisted in the config like domain_tiers"""
+
+    def __init__(self, state=None):
+        # domain -> {'method', 'selector'/'path', 'hits', 'misses', 'relearned', 'learned_at'}
+        self.state = {domain: dict(entry) for domain, entry in (state or {}).items()}
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        with self._lock:
+            entry = self.state.get(domain)
+            return dict(entry) if entry else None
+
+    def record_hit(self, domain):
+        with self._lock:
+            if domain in self.state:
+                self.state[domain]['hits'] += 1
+
+    def record_miss(self, domain):
+        with self._lock:
+            if domain in self.state:
+                self.state[domain]['misses'] += 1
+
+    def learn(self, domain, result):
+        """Remember what priced this page; a different winner than before counts as a relearn"""
+        hint = hint_from_result(result)
+        if not domain or not hint:
+            return None
+        with self._lock:
+            entry = self.state.get(domain)
+            if entry and all(entry.get(key) == value for key, value in hint.items()):
+                return entry
+            if entry:
+                print(f"🧠 {domain}: extraction hint changed from {describe(entry)} to {describe(hint)}")
+                hint.update(hits=entry['hits'], misses=entry['misses'], relearned=entry.get('relearned', 0) + 1)
+            else:
+                hint.update(hits=0, misses=0, relearned=0)
+            hint['learned_at'] = time.time()
+            self.state[domain] = hint
+            return hint
+
+    def observe(self, domain, result):
+        """Count a page priced some other way (e.g. streamed head): a hit if it matches the hint"""
+        hint = hint_from_result(result)
+        entry = self.get(domain)
+        if hint and entry and all(entry.get(key) == value for key, value in hint.items()):
+            self.record_hit(domain)
+        else:
+            self.learn(domain, result)
+
+    def merge(self, domain, entry):
+        """Adopt a domain's hint reported by a worker process"""
+        if entry:
+            with self._lock:
+                self.state[domain] = dict(entry)
+
+    def report(self):
+        """{domain: {'hint', 'hits', 'misses', 'hit_rate', 'relearned'}} for domains with a hint"""
+        with self._lock:
+            report = {}
+            for domain, entry in self.state.items():
+                tries = entry['hits'] + entry['misses']
+                report[domain] = {
+                    'hint': describe(entry),
+                    'hits': entry['hits'],
+                    'misses': entry['misses'],
+                    'hit_rate': entry['hits'] / tries if tries else 0.0,
+                    'relearned': entry.get('relearned', 0),
+                }
+            return report
+
+    def to_dict(self):
+        """Hint state for the config file"""
+        with self._lock:
+            return {domain: dict(entry) for domain, entry in self.state.items()}
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+One-pass extraction index for downloaded product pages
+Meta tags, JSON-LD and the price selectors are answered from lookups built in a single tree walk
+"""
+
+import re
+
+# tag? then any mix of .class, #id, [attr], [attr="v"], [attr*="v"] - the shapes our price selectors use
+SIMPLE_SELECTOR = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*)?(?P<parts>(?:\.[\w-]+|#[\w-]+|\[[\w-]+(?:[*^$]?=["\'][^"\']*["\'])?\])*)$')
+SELECTOR_PART = re.compile(r'\.([\w-]+)|#([\w-]+)|\[([\w-]+)(?:([*^$]?=)["\']([^"\']*)["\'])?\]')
+
+
+def _attr_text(element, attr):
+    value = element.get(attr)
+    if isinstance(value, list):
+        return ' '.join(value)
+    return value
+
+
+def _matches(element, op, attr, value):
+    actual = _attr_text(element, attr)
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == '=':
+        return actual == value
+    if op == '*=':
+        return bool(value) and value in actual
+    if op == '^=':
+        return bool(value) and actual.startswith(value)
+    return bool(value) and actual.endswith(value)
+
+
+class ExtractionIndex:
+    """Lookups over one parsed page: meta content by attribute, elements by tag, class, id and attribute"""
+
+    def __init__(self, soup):
+        self.soup = soup
+        self.order = {}
+        self.meta = {}
+        self.jsonld = []
+        self.scripts = []  # (id, text) of other inline scripts, where app-state blobs live
+        self.by_tag = {}
+        self.by_class = {}
+        self.by_id = {}
+        self.by_attr = {}
+        self.fallbacks = 0
+        self._compiled = {}
+
+        for position, element in enumerate(soup.find_all(True)):
+            self.order[id(element)] = position
+            self.by_tag.setdefault(element.name, []).append(element)
+            for attr in element.attrs:
+                self.by_attr.setdefault(attr, []).append(element)
+            for token in element.get('class') or []:
+                self.by_class.setdefault(token, []).append(element)
+            if element.get('id'):
+                self.by_id.setdefault(element['id'], []).append(element)
+            if element.name == 'meta':
+                for attr, value in element.attrs.items():
+                    if isinstance(value, str):
+                        self.meta.setdefault((attr, value), []).append(element.get('content', ''))
+            elif element.name == 'script' and element.get('type') == 'application/ld+json':
+                self.jsonld.append(element.string)
+            elif element.name == 'script' and not element.get('src'):
+                self.scripts.append((element.get('id', ''), element.string))
+
+    def meta_content(self, attr, value):
+        """content= of every <meta attr="value"> in document order"""
+        return self.meta.get((attr, value), [])
+
+    def _compile(self, selector):
+        match = SIMPLE_SELECTOR.match(selector.strip())
+        if not match:
+            return None
+        parts = []
+        for cls, ident, attr, op, value in SELECTOR_PART.findall(match.group('parts')):
+            if cls:
+                parts.append(('class', cls))
+            elif ident:
+                parts.append(('id', ident))
+            elif op and (not value or any(ch.isspace() for ch in value)):
+                return None  # leave odd attribute values to the full selector engine
+            else:
+                parts.append(('attr', (attr, op or None, value)))
+        return match.group('tag'), parts
+
+    def _candidates(self, tag, parts):
+        """Smallest index bucket the selector can be answered from"""
+        buckets = []
+        for kind, value in parts:
+            if kind == 'class':
+                buckets.append(self.by_class.get(value, []))
+            elif kind == 'id':
+                buckets.append(self.by_id.get(value, []))
+            else:
+                attr, op, text = value
+                if attr == 'class' and op == '*=':
+                    # Substring of the class attribute: scan distinct tokens, not the tree
+                    hits = {id(el): el for token, els in self.by_class.items() if text in token for el in els}
+                    buckets.append(sorted(hits.values(), key=lambda el: self.order[id(el)]))
+                elif attr == 'id' and op == '*=':
+                    hits = [el for ident, els in self.by_id.items() if text in ident for el in els]
+                    buckets.append(sorted(hits, key=lambda el: self.order[id(el)]))
+                else:
+                    buckets.append(self.by_attr.get(attr, []))
+        if tag:
+            buckets.append(self.by_tag.get(tag, []))
+        if not buckets:
+            return None
+        return min(buckets, key=len)
+
+    def select(self, selector):
+        """Elements matching a CSS selector in document order, same as soup.select for our selector shapes"""
+        if selector not in self._compiled:
+            self._compiled[selector] = self._compile(selector)
+        compiled = self._compiled[selector]
+        candidates = self._candidates(*compiled) if compiled else None
+        if candidates is None:
+            self.fallbacks += 1
+            return self.soup.select(selector)
+
+        tag, parts = compiled
+        results = []
+        for element in candidates:
+            if tag and element.name != tag:
+                continue
+            if all(self._part_matches(element, kind, value) for kind, value in parts):
+                results.append(element)
+        return results
+
+    @staticmethod
+    def _part_matches(element, kind, value):
+        if kind == 'class':
+            return value in (element.get('class') or [])
+        if kind == 'id':
+            return element.get('id') == value
+        attr, op, text = value
+        return _matches(element, op, attr, text)
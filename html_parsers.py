@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+HTML parser backends for the HTTP extractor
+lxml (C) is used when installed; html.parser (pure Python) is the always-available fallback
+"""
+
+from bs4 import BeautifulSoup
+
+# Make lxml optional (BeautifulSoup falls back to the stdlib parser)
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+PARSER_BACKENDS = ['lxml', 'html.parser'] if LXML_AVAILABLE else ['html.parser']
+DEFAULT_PARSER = PARSER_BACKENDS[0]
+
+_warned = set()
+
+
+def resolve_parser(name='auto'):
+    """Backend name for a config value: 'auto', 'lxml' or 'html.parser'"""
+    if not name or name == 'auto':
+        return DEFAULT_PARSER
+    if name in PARSER_BACKENDS:
+        return name
+    if name not in _warned:
+        _warned.add(name)
+        print(f"⚠️  HTML parser '{name}' not available, using {DEFAULT_PARSER}")
+    return DEFAULT_PARSER
+
+
+def parse_html(html, parser='auto'):
+    """BeautifulSoup tree of a page using the chosen backend"""
+    return BeautifulSoup(html, resolve_parser(parser))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pooled keep-alive HTTP sessions for the price tracker
+One requests.Session per host so product pages and Pushbullet pushes reuse TCP+TLS connections
+"""
+
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+
+# Advertise brotli only when urllib3 can actually decode it
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that counts how many new connections its pools open"""
+
+    def __init__(self, counters, **kwargs):
+        self.counters = counters
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        counters = self.counters
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                counters['connections'] += 1
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                counters['connections'] += 1
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """Per-host pooled sessions with keep-alive, compression and sane timeouts"""
+
+    def __init__(self, pool_maxsize=10, connect_timeout=5, read_timeout=15, user_agent=DEFAULT_USER_AGENT):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = (connect_timeout, read_timeout)
+        self.user_agent = user_agent
+        self._sessions = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the keep-alive session for the URL's host, creating it on first use"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                counters = {'requests': 0, 'connections': 0}
+                adapter = CountingAdapter(counters, pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({
+                    'User-Agent': self.user_agent,
+                    'Accept-Encoding': ACCEPT_ENCODING,
+                    'Connection': 'keep-alive',
+                })
+                self._sessions[host] = session
+                self._counters[host] = counters
+            return session
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the host's pooled session"""
+        session = self.session_for(url)
+        kwargs.setdefault('timeout', self.timeout)
+        with self._lock:
+            self._counters[urlparse(url).netloc.lower()]['requests'] += 1
+        return session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """Requests, new connections and reused connections per host"""
+        with self._lock:
+            return {
+                host: {
+                    'requests': c['requests'],
+                    'connections': c['connections'],
+                    'reused': max(0, c['requests'] - c['connections']),
+                }
+                for host, c in self._counters.items()
+            }
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
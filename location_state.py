@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Persisted delivery-location state for location-priced sites
+Cookies and localStorage captured after one pincode flow, replayed into later drivers until they expire
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# Replays a site's localStorage before any of its own scripts run
+RESTORE_STORAGE_JS = """
+(function (origin, items) {
+    if (location.origin !== origin) { return; }
+    try {
+        Object.keys(items).forEach(function (key) { localStorage.setItem(key, items[key]); });
+    } catch (e) {}
+})(%s, %s);
+"""
+
+
+def origin_of(url):
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def to_cdp_cookie(cookie):
+    """Selenium get_cookies() entry -> Network.setCookies CookieParam"""
+    param = {
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'domain': cookie.get('domain'),
+        'path': cookie.get('path', '/'),
+        'secure': cookie.get('secure', False),
+        'httpOnly': cookie.get('httpOnly', False),
+    }
+    if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+        param['sameSite'] = cookie['sameSite']
+    if cookie.get('expiry'):
+        param['expires'] = float(cookie['expiry'])
+    return param
+
+
+class LocationStateStore:
+    """Per (domain, pincode) cookies and localStorage with an expiry, persisted as one JSON file"""
+
+    def __init__(self, path='.cache/location_state.json', ttl_seconds=72 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}
+        self.stats = {'reused': 0, 'saved': 0, 'expired': 0}
+        self._lock = threading.Lock()
+        self._touched = set()  # keys saved or dropped since the last take_updates()
+        self._reported = dict(self.stats)
+        self.load()
+
+    @staticmethod
+    def key_for(domain, pincode):
+        return f"{domain}|{pincode}"
+
+    def load(self):
+        """Load saved location state from disk"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f).get('entries', {})
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable location state: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the store to disk atomically"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                data = {'entries': dict(self.entries)}
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️  Could not save location state: {e}")
+
+    def get(self, domain, pincode):
+        """Saved state for this pincode, or None if there is none or it has expired"""
+        key = self.key_for(domain, pincode)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry.get('expires_at', 0) <= time.time():
+                del self.entries[key]
+                self.stats['expired'] += 1
+                self._touched.add(key)
+                entry = None
+            return entry
+
+    def capture(self, driver, domain, pincode):
+        """Remember the driver's cookies and localStorage once the location is set"""
+        try:
+            cookies = driver.get_cookies()
+            storage = driver.execute_script(
+                "var out = {}; for (var i = 0; i < localStorage.length; i++) {"
+                " var k = localStorage.key(i); out[k] = localStorage.getItem(k); } return out;"
+            ) or {}
+            entry = {
+                'origin': origin_of(driver.current_url),
+                'cookies': cookies,
+                'local_storage': storage,
+                'saved_at': time.time(),
+                'expires_at': time.time() + self.ttl_seconds,
+            }
+        except Exception as e:
+            print(f"⚠️  Could not capture location state: {e}")
+            return None
+        with self._lock:
+            self.entries[self.key_for(domain, pincode)] = entry
+            self.stats['saved'] += 1
+            self._touched.add(self.key_for(domain, pincode))
+        print(f"💾 Saved location state for {domain} pincode {pincode} ({len(cookies)} cookies)")
+        return entry
+
+    def invalidate(self, domain, pincode):
+        """Forget state the site no longer honours"""
+        with self._lock:
+            if self.entries.pop(self.key_for(domain, pincode), None) is not None:
+                self.stats['expired'] += 1
+                self._touched.add(self.key_for(domain, pincode))
+
+    def take_updates(self):
+        """Entries saved (or None for dropped) and stat counts since the last call, for a worker to send home"""
+        with self._lock:
+            entries = {key: self.entries.get(key) for key in self._touched}
+            stats = {key: value - self._reported[key] for key, value in self.stats.items()}
+            self._touched = set()
+            self._reported = dict(self.stats)
+        return {'entries': entries, 'stats': stats}
+
+    def merge_updates(self, updates):
+        """Adopt entries and stat counts reported by a worker process"""
+        if not updates:
+            return
+        with self._lock:
+            for key, entry in updates['entries'].items():
+                if entry is None:
+                    self.entries.pop(key, None)
+                else:
+                    self.entries[key] = entry
+            for key, value in updates['stats'].items():
+                self.stats[key] += value
+
+    def inject(self, driver, entry):
+        """Install saved cookies and localStorage before navigating
+
+        Returns the new-document script id so it can be removed after the page loads.
+        """
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': [to_cdp_cookie(c) for c in entry['cookies']]})
+        source = RESTORE_STORAGE_JS % (json.dumps(entry['origin']), json.dumps(entry['local_storage']))
+        script = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+        with self._lock:
+            self.stats['reused'] += 1
+        return script.get('identifier')
+
+    @staticmethod
+    def remove_injection(driver, identifier):
+        if identifier:
+            try:
+                driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': identifier})
+            except Exception:
+                pass
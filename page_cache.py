@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Conditional-GET page cache for product pages
+Keeps ETag/Last-Modified validators plus the last extraction result, so a 304 skips download and parsing
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = ('utm_', 'nc', 't_pos_sec', 't_pos_item', 't_s', 'ref', 'ref_', 'gclid', 'fbclid')
+
+
+def canonical_url(url):
+    """Normalise a product URL so tracking variants share one cache entry"""
+    parts = urlparse(url)
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not any(key == p or (p.endswith('_') and key.startswith(p)) for p in TRACKING_PARAMS)
+    ]
+    path = parts.path or '/'
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), path, '', urlencode(sorted(query)), ''))
+
+
+class PageCache:
+    """Size-bounded LRU of validators and extraction results, persisted as one JSON file"""
+
+    def __init__(self, path='.cache/page_cache.json', max_entries=500, max_bytes=2_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'changed': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._touched = set()  # keys used or stored since the last take_updates()
+        self._reported = dict(self.stats)
+        self.load()
+
+    @staticmethod
+    def key_for(url, pincode=None):
+        """Cache key: canonical URL plus the pincode for location-priced pages"""
+        key = canonical_url(url)
+        return f"{key}|{pincode}" if pincode else key
+
+    def load(self):
+        """Load cached entries from disk"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                entries = sorted(data.get('entries', {}).items(), key=lambda item: item[1].get('last_used', 0))
+                self.entries = OrderedDict(entries)
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable page cache: {e}")
+            self.entries = OrderedDict()
+
+    def save(self):
+        """Write the cache to disk atomically"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                data = {'entries': dict(self.entries)}
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️  Could not save page cache: {e}")
+
+    def conditional_headers(self, key):
+        """If-None-Match / If-Modified-Since headers for a cached page"""
+        with self._lock:
+            entry = self.entries.get(key)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, key):
+        """Record a 304 and return the cached extraction result"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            entry['last_used'] = time.time()
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            self._touched.add(key)
+            return dict(entry['result'])
+
+    def miss(self, key):
+        """Record a full download (no entry, or the page changed)"""
+        with self._lock:
+            if key in self.entries:
+                self.stats['changed'] += 1
+            self.stats['misses'] += 1
+
+    def store(self, key, response_headers, result):
+        """Remember validators and the extraction result for a page"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'result': result,
+            'last_used': time.time(),
+        }
+        entry['size'] = len(json.dumps(entry, ensure_ascii=False))
+        with self._lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self._touched.add(key)
+            self._evict()
+
+    def take_updates(self):
+        """Entries and stat counts changed since the last call, for a worker process to send home"""
+        with self._lock:
+            entries = {key: self.entries[key] for key in self._touched if key in self.entries}
+            stats = {key: value - self._reported[key] for key, value in self.stats.items()}
+            self._touched = set()
+            self._reported = dict(self.stats)
+        return {'entries': entries, 'stats': stats}
+
+    def merge_updates(self, updates):
+        """Adopt entries and stat counts reported by a worker process"""
+        if not updates:
+            return
+        with self._lock:
+            for key, entry in updates['entries'].items():
+                self.entries[key] = entry
+                self.entries.move_to_end(key)
+            for key, value in updates['stats'].items():
+                self.stats[key] += value
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until both bounds hold"""
+        total = sum(entry.get('size', 0) for entry in self.entries.values())
+        while self.entries and (len(self.entries) > self.max_entries or total > self.max_bytes):
+            _, entry = self.entries.popitem(last=False)
+            total -= entry.get('size', 0)
+            self.stats['evictions'] += 1
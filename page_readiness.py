@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Event-driven page readiness for the Selenium scrapers
+Returns as soon as a price candidate is on the page instead of sleeping a fixed time
+"""
+
+import time
+
+# Default price hints checked by the in-page probe
+DEFAULT_READY_SELECTORS = [
+    '.price',
+    '.current-price',
+    '.product-price',
+    '[data-price]',
+    '.a-price-whole',
+    '.a-offscreen',
+    '._30jeq3',
+    '.Pricing___StyledLabel-sc-pldi2d-1',
+]
+
+ALL_CHECKS = ('meta', 'json-ld', 'selector', 'network-idle')
+
+# Header labels that show the delivery location; part of the page fingerprint
+LOCATION_LABEL_SELECTORS = [
+    "[class*='location']",
+    "[class*='Location']",
+    "[class*='address']",
+    "[class*='Address']",
+    "[class*='pincode']",
+]
+
+# Price texts (anything with a digit) and location labels, joined into one string.
+# Shared by the fingerprint snapshot and the 'changed' readiness check.
+FINGERPRINT_FN_JS = """
+function priceTrackerFingerprint(priceSelectors, labelSelectors) {
+    var parts = [], hasDigit = /\\d/;
+    var groups = [[priceSelectors, true], [labelSelectors, false]];
+    for (var g = 0; g < groups.length; g++) {
+        var selectors = groups[g][0], needsDigit = groups[g][1];
+        for (var s = 0; s < selectors.length; s++) {
+            var nodes;
+            try { nodes = document.querySelectorAll(selectors[s]); } catch (e) { continue; }
+            for (var n = 0; n < nodes.length && n < 20; n++) {
+                var text = (nodes[n].textContent || '').trim();
+                if (text && text.length <= 200 && (!needsDigit || hasDigit.test(text))) { parts.push(text); }
+            }
+        }
+    }
+    return parts.join('|');
+}
+"""
+
+PAGE_FINGERPRINT_JS = FINGERPRINT_FN_JS + """
+return priceTrackerFingerprint(arguments[0], arguments[1]);
+"""
+
+# Runs inside the page. The first call installs a MutationObserver so later
+# polls know when the DOM last changed; every call then reports which signal
+# (if any) says a price is available.
+READINESS_PROBE_JS = FINGERPRINT_FN_JS + """
+var selectors = arguments[0], checks = arguments[1], idleMs = arguments[2];
+var baseline = arguments[3], labelSelectors = arguments[4];
+var state = window.__priceTrackerReady;
+if (!state) {
+    state = window.__priceTrackerReady = {lastMutation: Date.now(), resources: -1, lastResource: Date.now()};
+    try {
+        new MutationObserver(function () { state.lastMutation = Date.now(); })
+            .observe(document, {childList: true, subtree: true, characterData: true});
+    } catch (e) {}
+}
+var hasDigit = /\\d/;
+if (checks.indexOf('changed') >= 0 && baseline !== null) {
+    // Something that was on the page before an in-page action (a pincode submit) now reads differently
+    var current = priceTrackerFingerprint(selectors, labelSelectors);
+    if (current && current !== baseline) { return 'changed'; }
+}
+if (checks.indexOf('meta') >= 0) {
+    var meta = document.querySelector('meta[property="product:price:amount"], meta[property="og:price:amount"], meta[itemprop="price"]');
+    if (meta && hasDigit.test(meta.getAttribute('content') || '')) { return 'meta'; }
+}
+if (checks.indexOf('json-ld') >= 0) {
+    var scripts = document.querySelectorAll('script[type="application/ld+json"]');
+    for (var i = 0; i < scripts.length; i++) {
+        if (/"(price|lowPrice)"\\s*:/.test(scripts[i].textContent)) { return 'json-ld'; }
+    }
+}
+if (checks.indexOf('selector') >= 0) {
+    for (var s = 0; s < selectors.length; s++) {
+        var nodes;
+        try { nodes = document.querySelectorAll(selectors[s]); } catch (e) { continue; }
+        for (var n = 0; n < nodes.length && n < 20; n++) {
+            if (hasDigit.test(nodes[n].textContent || '')) { return 'selector'; }
+        }
+    }
+}
+if (checks.indexOf('network-idle') >= 0 && document.readyState === 'complete') {
+    var count = performance.getEntriesByType('resource').length;
+    if (count !== state.resources) { state.resources = count; state.lastResource = Date.now(); }
+    var now = Date.now();
+    if (now - state.lastResource >= idleMs && now - state.lastMutation >= idleMs) { return 'network-idle'; }
+}
+return null;
+"""
+
+
+def page_fingerprint(driver, selectors=None, label_selectors=None):
+    """Snapshot of the page's price texts and location labels, or None if the page cannot be read
+
+    Take it before an in-page action and pass it as baseline with the 'changed' check; the
+    already-rendered page would otherwise satisfy the 'selector' check straight away.
+    """
+    try:
+        return driver.execute_script(PAGE_FINGERPRINT_JS, list(selectors or DEFAULT_READY_SELECTORS),
+                                     list(label_selectors or LOCATION_LABEL_SELECTORS))
+    except Exception:
+        return None
+
+
+def wait_for_price_ready(driver, selectors=None, max_wait=5, checks=ALL_CHECKS,
+                         poll_interval=0.1, idle_ms=500, baseline=None, label_selectors=None):
+    """Poll the page until a price signal shows up or max_wait seconds pass
+
+    The 'changed' check (not in ALL_CHECKS) fires once the page_fingerprint() differs from baseline.
+
+    Returns {'ready': bool, 'reason': str, 'elapsed': float}
+    """
+    selectors = list(selectors or DEFAULT_READY_SELECTORS)
+    label_selectors = list(label_selectors or LOCATION_LABEL_SELECTORS)
+    checks = list(checks)
+    started = time.time()
+    deadline = started + max_wait
+
+    while True:
+        try:
+            reason = driver.execute_script(READINESS_PROBE_JS, selectors, checks, idle_ms, baseline, label_selectors)
+        except Exception:
+            # Page is mid-navigation; try again on the next tick
+            reason = None
+
+        elapsed = time.time() - started
+        if reason:
+            return {'ready': True, 'reason': reason, 'elapsed': elapsed}
+        if time.time() >= deadline:
+            return {'ready': False, 'reason': 'timeout', 'elapsed': elapsed}
+        time.sleep(poll_interval)
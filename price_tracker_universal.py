@@ -4,8 +4,7 @@ UNIVERSAL Price Tracker - Works with ANY E-commerce Website
 Automatically detects prices from any product page
 """
 
-import requests
-from bs4 import BeautifulSoup
+import copy
 import json
 import os
 import re
@@ -15,18 +14,195 @@ from typing import Optional, Dict, List
 # Selenium imports
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from app_state import app_state_from_driver, find_app_states, find_path, product_from_state, resolve_path
+from browser_daemon import DEFAULT_STATE_FILE as BROWSER_DAEMON_STATE_FILE, browser_pid, healthy_browsers
+from driver_pool import DriverPool
+from extraction_hints import (PRODUCT_HINT_KEYS, ExtractionHints, describe as describe_hint, describe_product_hints,
+                              product_hints_from_result)
+from extraction_index import ExtractionIndex
+from html_parsers import parse_html
+from http_session import HttpClient
+from location_state import LocationStateStore
+from page_cache import PageCache
+from request_scheduler import DomainScheduler, parse_retry_after
+from selector_resolver import SelectorResolver
+from streaming_fetch import scan_response
+from structured_data import currency_symbol, load_jsonld, parse_price, product_from_jsonld
+from resilience import CircuitBreaker, error_result, retry_result
+from browser_extraction import collect_price_candidates, pick_price
+from cdp_network import (DEFAULT_BLOCKING_POLICY, apply_blocking, blocked_patterns_for, capture_product_json,
+                         drain_performance_log, network_stats, product_id_from_url)
+from page_readiness import page_fingerprint, wait_for_price_ready
+from process_workers import ProcessWorker
+from product_watchdog import ProcessReaper, kill_pids, process_tree, run_with_deadline
+
+# Tunables that can be overridden via "scraper_settings" in the config file
+DEFAULT_SCRAPER_SETTINGS = {
+    'driver_pool_size': 2,          # Chrome instances kept alive per run
+    'driver_max_pages': 25,         # Recycle a driver after this many pages
+    'driver_max_memory_mb': 1024,   # ...or once its process tree exceeds this RSS
+    # Attach to browsers kept warm by browser_daemon.py: 'auto' (when running), True or False
+    'browser_daemon': 'auto',
+    'browser_daemon_state_file': BROWSER_DAEMON_STATE_FILE,
+    # Max seconds to wait for a price signal after driver.get(), per domain
+    'readiness_max_wait': {'default': 5, 'bigbasket.com': 8},
+    'max_workers': 4,               # Products checked concurrently (1 = sequential)
+    'product_deadline_seconds': 180,  # Hard limit per product; its browsers are killed past it (0 = off)
+    # 'threads' shares one process; 'processes' gives each worker its own tracker and browsers
+    'execution_mode': 'threads',
+    'worker_processes': 0,          # 0 = one per CPU core
+    'worker_max_rss_mb': 1500,      # Worker + browsers; restarted above this, killed above twice this
+    # Same-domain browser-tier products are opened as tabs of one driver, this many at a time
+    'tab_batching': {'enabled': True, 'tabs_per_browser': 3},
+    # Per-domain pacing: requests per second and concurrent checks
+    'domain_limits': {
+        'default': {'rps': 1.0, 'max_in_flight': 2},
+        'bigbasket.com': {'rps': 0.5, 'max_in_flight': 1},
+        'amazon.in': {'rps': 0.5, 'max_in_flight': 1},
+        'flipkart.com': {'rps': 0.5, 'max_in_flight': 1},
+    },
+    # Read pages head-first and stop once a meta/JSON-LD price is found in the first max_scan_kb
+    'streaming_fetch': {'enabled': True, 'max_scan_kb': 64},
+    'extraction_hints': True,       # Try the extractor that priced a domain last time before the full cascade
+    # Store each product's tier and winning lookup in its "extraction" entry and use it as the fast path
+    'product_hints': True,
+    'html_parser': 'auto',          # 'lxml', 'html.parser' or 'auto' (lxml when installed)
+    'http_pool_maxsize': 10,        # Keep-alive connections kept per host
+    'http_connect_timeout': 5,
+    'http_read_timeout': 15,
+    'retry_attempts': 3,            # Tries per tier for timeouts, 5xx and 429
+    'retry_base_delay': 1.0,        # Seconds; doubles per retry, with full jitter
+    'retry_max_delay': 20.0,
+    'breaker_failure_threshold': 3, # Consecutive transient failures before a domain is skipped
+    'breaker_cooldown_seconds': 1800,
+    'browser_tier_recheck_hours': 24,  # A domain remembered as browser-only gets plain HTTP tried again after this
+    # Images/fonts/media/trackers blocked in headless Chrome, with per-domain allowlists
+    'resource_blocking': DEFAULT_BLOCKING_POLICY,
+    # Product-API responses (regexes on the XHR/fetch URL) read straight off the wire, per domain;
+    # only the node whose id matches product_id_pattern's group in the page URL is read
+    'network_capture': {
+        'bigbasket.com': {
+            'url_patterns': [r'/listing-svc/', r'/product-page-svc/', r'/mapi/v\d+/product', r'/ui-svc/.*product'],
+            'product_id_pattern': r'/pd/(\d+)',
+            'timeout': 4,
+        },
+    },
+    # Dotted JSON paths into __NEXT_DATA__ / window.__INITIAL_STATE__ blobs, per domain ('*' = any item)
+    'app_state_paths': {
+        'bigbasket.com': {
+            'price': ['props.pageProps.productDetails.children.0.pricing.discount.prim_price.sp',
+                      'props.pageProps.productDetails.pricing.discount.prim_price.sp'],
+            'mrp': ['props.pageProps.productDetails.children.0.pricing.discount.mrp',
+                    'props.pageProps.productDetails.pricing.discount.mrp'],
+            'in_stock': ['props.pageProps.productDetails.children.0.availability.avail_status',
+                         'props.pageProps.productDetails.availability.avail_status'],
+        },
+        'flipkart.com': {
+            'price': ['pageDataV4.page.pageData.pageContext.pricing.finalPrice.value'],
+            'mrp': ['pageDataV4.page.pageData.pageContext.pricing.mrp.value'],
+        },
+    },
+    'page_cache_file': '.cache/page_cache.json',
+    'page_cache_max_entries': 500,
+    'page_cache_max_bytes': 2000000,
+    # Cookies/localStorage saved after a pincode flow, replayed until they expire
+    'location_state_file': '.cache/location_state.json',
+    'location_state_ttl_hours': 72,
+    'selector_timeout': 5,          # One deadline per locator cascade (location, pincode, submit)
+    'selector_stats_file': '.cache/selector_hits.json',
+}
+
+def merge_settings(defaults, overrides):
+    """Defaults with the user's overrides laid on top; nested dicts are merged key by key"""
+    merged = copy.deepcopy(defaults)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_settings(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def settings_overrides(settings, defaults):
+    """Only the settings that differ from the defaults (recursing into nested dicts), for the config file"""
+    overrides = {}
+    for key, value in settings.items():
+        default = defaults.get(key)
+        if isinstance(value, dict) and isinstance(default, dict):
+            nested = settings_overrides(value, default)
+            if nested:
+                overrides[key] = nested
+        elif key not in defaults or value != default:
+            overrides[key] = value
+    return overrides
+
+def get_domain(url):
+    """Return the host of a URL without the leading www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
 
 class UniversalPriceTracker:
-    def __init__(self, config_file='price_tracker_config.json'):
+    def __init__(self, config_file='price_tracker_config.json', http_client=None):
         self.config_file = config_file
         self.products = []
         self.price_history = {}
         self.notifications_enabled = True
+        self.scraper_settings = merge_settings(DEFAULT_SCRAPER_SETTINGS, {})
+        self.driver_pool = None
+        self.daemon_leases = set()  # DevTools addresses of daemon browsers attached by this run
+        self.bad_daemon_browsers = {}  # address -> pid of a daemon browser the watchdog killed as hung
+        self.daemon_lock = threading.Lock()
+        self.reaper = ProcessReaper()
+        self.watchdog_stats = {'timeouts': 0, 'killed_processes': 0, 'reaped': 0}
+        self.watchdog_lock = threading.Lock()
+        # Held while product dicts and the domain tiers are changed off the main thread and while the
+        # config is serialised
+        self.config_lock = threading.Lock()
+        self.workers_active = False
+        self.worker_stats = {}
+        self.page_timings = []
+        # Worker threads bump the run counters below; read-modify-write them under this lock
+        self.stats_lock = threading.Lock()
+        self.network_totals = {'pages': 0, 'requests': 0, 'blocked_requests': 0, 'transferred_bytes': 0}
+        self.method_stats = {}  # extraction method -> HTTP pages it priced ('none' = no price)
+        self.stream_totals = {'pages': 0, 'early_exits': 0, 'bytes_read': 0, 'bytes_total': 0, 'unknown_total': 0}
+        self.domain_tiers = {}  # domain -> 'http' or 'browser'
+        self.tier_checked = {}  # domain -> when its 'browser' tier was last confirmed (epoch seconds)
+        self.breaker_state = {}
+        self.hint_state = {}
+        self.product_hint_stats = {'hits': 0, 'misses': 0}
         self.load_config()
+        self.extraction_hints = ExtractionHints(self.hint_state)
+        
+        # Shared keep-alive sessions; tests can inject a client pointed at a local server
+        self.http = http_client or HttpClient(
+            pool_maxsize=self.scraper_settings.get('http_pool_maxsize', 10),
+            connect_timeout=self.scraper_settings.get('http_connect_timeout', 5),
+            read_timeout=self.scraper_settings.get('http_read_timeout', 15),
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.scraper_settings.get('breaker_failure_threshold', 3),
+            cooldown_seconds=self.scraper_settings.get('breaker_cooldown_seconds', 1800),
+            state=self.breaker_state,
+            probe_timeout_seconds=self.scraper_settings.get('product_deadline_seconds', 180),
+        )
+        self.scheduler = DomainScheduler(self.scraper_settings.get('domain_limits'))
+        self.page_cache = PageCache(
+            self.scraper_settings.get('page_cache_file', '.cache/page_cache.json'),
+            max_entries=self.scraper_settings.get('page_cache_max_entries', 500),
+            max_bytes=self.scraper_settings.get('page_cache_max_bytes', 2000000),
+        )
+        self.location_state = LocationStateStore(
+            self.scraper_settings.get('location_state_file', '.cache/location_state.json'),
+            ttl_seconds=self.scraper_settings.get('location_state_ttl_hours', 72) * 3600,
+        )
+        self.selector_resolver = SelectorResolver(
+            self.scraper_settings.get('selector_stats_file', '.cache/selector_hits.json'))
         
         self.pushbullet_token = os.getenv('PUSHBULLET_TOKEN', '')
         
@@ -80,20 +256,37 @@ class UniversalPriceTracker:
                     self.notifications_enabled = config.get('notifications_enabled', True)
                     if 'pincode' in config:
                         self.pincode = config['pincode']
+                    # Saved settings are overrides only, so defaults added later still reach this install
+                    self.scraper_settings = merge_settings(DEFAULT_SCRAPER_SETTINGS, config.get('scraper_settings'))
+                    self.domain_tiers = config.get('domain_tiers', {})
+                    # Entries from before the timestamps existed start their recheck clock now
+                    self.tier_checked = {domain: config.get('domain_tiers_checked', {}).get(domain, time.time())
+                                         for domain in self.domain_tiers}
+                    self.breaker_state = config.get('circuit_breakers', {})
+                    self.hint_state = config.get('extraction_hints', {})
         except Exception as e:
             print(f"Error loading config: {e}")
     
     def save_config(self):
         """Save configuration to JSON file"""
         try:
-            config = {
-                'products': self.products,
-                'price_history': self.price_history,
-                'notifications_enabled': self.notifications_enabled,
-                'pincode': getattr(self, 'pincode', '')
-            }
+            # Serialised under the lock: worker threads add extraction hints to these product dicts
+            # and move domains between tiers
+            with self.config_lock:
+                config = {
+                    'products': self.products,
+                    'price_history': self.price_history,
+                    'notifications_enabled': self.notifications_enabled,
+                    'pincode': getattr(self, 'pincode', ''),
+                    'scraper_settings': settings_overrides(self.scraper_settings, DEFAULT_SCRAPER_SETTINGS),
+                    'domain_tiers': self.domain_tiers,
+                    'domain_tiers_checked': self.tier_checked,
+                    'circuit_breakers': self.circuit_breaker.to_dict(),
+                    'extraction_hints': self.extraction_hints.to_dict(),
+                }
+                text = json.dumps(config, indent=2, ensure_ascii=False)
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+                f.write(text)
         except Exception as e:
             print(f"Error saving config: {e}")
     
@@ -123,118 +316,286 @@ class UniversalPriceTracker:
         
         return None
     
-    def scrape_price_universal(self, url):
-        """Scrape price using multiple methods"""
+    def extract_price_from_jsonld(self, raw):
+        """Extract price from one Schema.org JSON-LD script body"""
+        product = product_from_jsonld([raw])
+        return product['price'] if product else None
+
+    def jsonld_result(self, scripts):
+        """Result dict for the page's Product/Offer JSON-LD, with availability and seller, or None"""
+        product = product_from_jsonld(scripts)
+        if not product:
+            return None
+        # Where the price sits, as a path over the page's parsed scripts, so a product hint can go straight there
+        path = find_path([load_jsonld(raw) for raw in scripts], product['price'], keys=('price', 'lowPrice'))
+        return {'price': product['price'], 'currency': currency_symbol(product['currency']), 'available': True,
+                'method': 'json-ld', 'availability': product['availability'], 'in_stock': product['in_stock'],
+                'seller': product['seller'], 'path': path}
+
+    def record_method(self, result):
+        """Count which extraction method produced each HTTP result"""
+        method = result.get('method') or 'none'
+        with self.stats_lock:
+            self.method_stats[method] = self.method_stats.get(method, 0) + 1
+        return result
+    
+    def _page_cache_key(self, url):
+        """Cache key for a product page (BigBasket prices depend on the pincode)"""
+        pincode = getattr(self, 'pincode', '') if 'bigbasket.com' in url.lower() else None
+        return PageCache.key_for(url, pincode or None)
+
+    def scrape_price_universal(self, url, hints=None):
+        """Scrape price using multiple methods, or only the lookup named by a product's hints"""
+        response = None
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            cache_key = self._page_cache_key(url)
+            streaming = self.scraper_settings.get('streaming_fetch') or {}
+            # A hinted lookup may point anywhere in the page, so it reads the whole body
+            stream = bool(streaming.get('enabled')) and not hints
+            response = self.http.get(url, headers=self.page_cache.conditional_headers(cache_key), stream=stream)
             
-            response = requests.get(url, headers=headers, timeout=10)
+            # Page unchanged since we last parsed it: reuse that result without parsing
+            if response.status_code == 304:
+                cached = self.page_cache.hit(cache_key)
+                if cached:
+                    print(f"📦 Page not modified, reusing cached price")
+                    cached['cached'] = True
+                    return cached
+                response.close()
+                response = self.http.get(url, stream=stream)
+            if response.status_code in (429, 503):
+                self.scheduler.defer(get_domain(url), parse_retry_after(response.headers.get('Retry-After')))
             response.raise_for_status()
+            self.page_cache.miss(cache_key)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Try different methods to find price
-            price = None
-            currency = '₹'
-            
-            # Method 1: Meta tags
-            for selector in self.price_selectors:
-                if selector['type'] == 'meta':
-                    meta_tags = soup.find_all('meta')
-                    for tag in meta_tags:
-                        if tag.get(selector['attr']) == selector['value']:
-                            content = tag.get('content', '')
-                            price = self.extract_price_from_text(content)
-                            if price:
-                                break
+            if hints:
+                result = self.extract_with_product_hints(response.content, hints)
+                result = self.record_method(result) if result else {'error': 'Product hint did not match',
+                                                                      'available': False}
+            elif stream:
+                result = self.extract_price_streaming(response, streaming, url)
+            else:
+                result = self.extract_price_from_html(response.content, url)
+            if 'error' not in result:
+                self.page_cache.store(cache_key, response.headers, result)
+            return result
+                
+        except Exception as e:
+            return error_result(e)
+        finally:
+            # Hands a fully read connection back to the pool (streamed responses are not auto-released)
+            if response is not None:
+                response.close()
+    
+    def extract_price_from_head(self, scanner):
+        """Meta or JSON-LD price from a partly downloaded page, or None to keep reading"""
+        for selector in self.price_selectors:
+            if selector['type'] == 'meta':
+                for content in scanner.meta_content(selector['attr'], selector['value']):
+                    price = self.extract_price_from_text(content)
+                    if price:
+                        return {'price': price, 'currency': '₹', 'available': True, 'method': 'meta',
+                                'selector': f"{selector['attr']}={selector['value']}"}
+        return self.jsonld_result(scanner.jsonld)
+
+    def extract_price_streaming(self, response, settings, url=None):
+        """Price from the page head as it arrives; the whole page is parsed only if the head has none"""
+        result, body, stats = scan_response(response, self.extract_price_from_head,
+                                            max_scan_bytes=settings.get('max_scan_kb', 64) * 1024)
+
+        totals = self.stream_totals
+        with self.stats_lock:
+            totals['pages'] += 1
+            totals['bytes_read'] += stats['bytes_read']
+            if stats['bytes_total'] is None:
+                totals['unknown_total'] += 1
+            else:
+                totals['bytes_total'] += stats['bytes_total']
+            if result:
+                totals['early_exits'] += 1
+        if result:
+            size = f"{stats['bytes_total'] / 1024:.0f} KB" if stats['bytes_total'] else 'unknown size'
+            print(f"⚡ Price found in the first {stats['bytes_read'] / 1024:.0f} KB of {size}")
+            if url and self.scraper_settings.get('extraction_hints', True):
+                self.extraction_hints.observe(get_domain(url), result)
+            return self.record_method(result)
+        return self.extract_price_from_html(body, url)
+
+    def app_state_paths_for(self, url):
+        """Configured app-state JSON paths for the URL's site, or None"""
+        domain = get_domain(url) if url else ''
+        for site, paths in self.scraper_settings.get('app_state_paths', {}).items():
+            if domain == site or domain.endswith('.' + site):
+                return paths
+        return None
+
+    def app_state_result(self, states, paths):
+        """Result dict for a price resolved from app-state blobs, or None"""
+        product = product_from_state(states, paths) if states else None
+        if not product:
+            return None
+        return {'price': product['price'], 'currency': '₹', 'available': True, 'method': 'app-state',
+                'mrp': product.get('mrp'), 'in_stock': product.get('in_stock'), 'path': product['path']}
+
+    def extract_price_from_html(self, html, url=None):
+        """Find the price in a downloaded page: the site's learned hint first, then every method"""
+        soup = parse_html(html, self.scraper_settings.get('html_parser', 'auto'))
+        # One walk over the tree; every method below reads from these lookups
+        index = ExtractionIndex(soup)
+        
+        domain = get_domain(url) if url and self.scraper_settings.get('extraction_hints', True) else None
+        hint = self.extraction_hints.get(domain) if domain else None
+        if hint:
+            result = self.extract_with_hint(index, hint, url)
+            if self.is_valid_price_result(result):
+                self.extraction_hints.record_hit(domain)
+                return self.record_method(result)
+            self.extraction_hints.record_miss(domain)
+            print(f"🧠 {domain}: hint {describe_hint(hint)} missed, trying every method")
+        
+        result = self.extract_with_cascade(soup, index, url)
+        if domain and self.is_valid_price_result(result):
+            self.extraction_hints.learn(domain, result)
+        return self.record_method(result)
+
+    def extract_with_hint(self, index, hint, url=None):
+        """Run only the extractor a domain's hint names; returns a result dict or None"""
+        method = hint['method']
+        price = None
+        if method == 'meta':
+            attr, _, value = hint['selector'].partition('=')
+            for content in index.meta_content(attr, value):
+                price = self.extract_price_from_text(content)
                 if price:
                     break
-            
-            # Method 2: Schema.org JSON-LD
-            if not price:
-                scripts = soup.find_all('script', type='application/ld+json')
-                for script in scripts:
-                    try:
-                        data = json.loads(script.string)
-                        if isinstance(data, list):
-                            data = data[0]
-                        
-                        # Look for price in various fields
-                        price_fields = ['price', 'offers', 'highPrice', 'lowPrice']
-                        for field in price_fields:
-                            if field in data:
-                                if isinstance(data[field], (int, float)):
-                                    price = float(data[field])
-                                elif isinstance(data[field], dict) and 'price' in data[field]:
-                                    price = float(data[field]['price'])
-                                elif isinstance(data[field], str):
-                                    price = self.extract_price_from_text(data[field])
-                                if price:
-                                    break
-                        
-                        # Check in offers array
-                        if not price and 'offers' in data:
-                            offers = data['offers']
-                            if isinstance(offers, list):
-                                for offer in offers:
-                                    if 'price' in offer:
-                                        price = float(offer['price'])
-                                        break
-                            elif isinstance(offers, dict) and 'price' in offers:
-                                price = float(offers['price'])
-                        
-                        if price:
-                            break
-                    except:
-                        continue
-            
-            # Method 3: CSS selectors
-            if not price:
-                for selector in self.price_selectors:
-                    if selector['type'] == 'css':
-                        elements = soup.select(selector['selector'])
-                        for element in elements:
-                            text = element.get_text(strip=True)
-                            price = self.extract_price_from_text(text)
-                            if price:
-                                break
+        elif method == 'css':
+            for element in index.select(hint['selector']):
+                price = self.extract_price_from_text(element.get_text(strip=True))
+                if price:
+                    break
+        elif method == 'json-ld':
+            return self.jsonld_result(index.jsonld)
+        elif method == 'app-state':
+            if url and self.needs_pincode_flow(url):
+                return None  # a downloaded page carries the default location's state
+            paths = dict(self.app_state_paths_for(url) or {}, price=[hint['path']])
+            return self.app_state_result(find_app_states(index.scripts), paths)
+        if not price:
+            return None
+        return {'price': price, 'currency': '₹', 'available': True, 'method': method, 'selector': hint['selector']}
+
+    def extract_with_product_hints(self, html, hints):
+        """Price from the one lookup a product's hints name (regex, selector, JSON-LD or state path), or None"""
+        price = None
+        if hints.get('regex'):
+            text = html.decode('utf-8', 'replace') if isinstance(html, bytes) else html
+            match = re.search(hints['regex'], text)
+            if match:
+                price = self.extract_price_from_text(match.group(1) if match.re.groups else match.group(0))
+        else:
+            index = ExtractionIndex(parse_html(html, self.scraper_settings.get('html_parser', 'auto')))
+            value = None
+            if hints.get('selector'):
+                attribute = hints.get('attribute')
+                for element in index.select(hints['selector']):
+                    price = self.extract_price_from_text(
+                        element.get(attribute) if attribute else element.get_text(strip=True))
+                    if price:
+                        break
+            elif hints.get('jsonld_path'):
+                value = resolve_path([load_jsonld(raw) for raw in index.jsonld], hints['jsonld_path'])
+            elif hints.get('state_path'):
+                value = resolve_path(list(find_app_states(index.scripts).values()), '*.' + hints['state_path'])
+            if value is not None and not isinstance(value, (dict, list)):
+                price = parse_price(value)
+        if not price:
+            return None
+        return {'price': price, 'currency': '₹', 'available': True, 'method': 'product-hint',
+                'hint': describe_product_hints(hints)}
+
+    def extract_with_cascade(self, soup, index, url=None):
+        """Meta tags, JSON-LD, app state, CSS selectors, then page text; the first price wins"""
+        # Try different methods to find price
+        price = None
+        method = None
+        currency = '₹'
+        
+        hit = None
+        
+        # Method 1: Meta tags
+        for selector in self.price_selectors:
+            if selector['type'] == 'meta':
+                for content in index.meta_content(selector['attr'], selector['value']):
+                    price = self.extract_price_from_text(content)
                     if price:
                         break
+            if price:
+                method = 'meta'
+                hit = f"{selector['attr']}={selector['value']}"
+                break
+        
+        # Method 2: Schema.org JSON-LD (all scripts, @graph and nested offers in one pass)
+        if not price:
+            structured = self.jsonld_result(index.jsonld)
+            if structured:
+                return structured
+
+        # Method 2b: app-state blob (__NEXT_DATA__ etc.) through the site's JSON paths; a downloaded
+        # page has no delivery location, so pincode sites only read it in the browser once one is set
+        paths = self.app_state_paths_for(url) if not (url and self.needs_pincode_flow(url)) else None
+        if not price and paths:
+            state_result = self.app_state_result(find_app_states(index.scripts), paths)
+            if state_result:
+                return state_result
+        
+        # Method 3: CSS selectors
+        if not price:
+            for selector in self.price_selectors:
+                if selector['type'] == 'css':
+                    elements = index.select(selector['selector'])
+                    for element in elements:
+                        text = element.get_text(strip=True)
+                        price = self.extract_price_from_text(text)
+                        if price:
+                            break
+                if price:
+                    method = 'css'
+                    hit = selector['selector']
+                    break
+        
+        # Method 4: Look for price patterns in all text
+        if not price:
+            all_text = soup.get_text()
+            # Look for price patterns with currency symbols
+            price_patterns = [
+                r'₹\s*(\d+\.?\d*)',
+                r'Rs\.?\s*(\d+\.?\d*)',
+                r'(\d+\.?\d*)\s*₹',
+                r'(\d+\.?\d*)\s*Rs\.?',
+            ]
             
-            # Method 4: Look for price patterns in all text
-            if not price:
-                all_text = soup.get_text()
-                # Look for price patterns with currency symbols
-                price_patterns = [
-                    r'₹\s*(\d+\.?\d*)',
-                    r'Rs\.?\s*(\d+\.?\d*)',
-                    r'(\d+\.?\d*)\s*₹',
-                    r'(\d+\.?\d*)\s*Rs\.?',
-                ]
-                
-                for pattern in price_patterns:
-                    matches = re.findall(pattern, all_text, re.IGNORECASE)
-                    if matches:
-                        prices = [float(p) for p in matches if float(p) > 0]
+            for pattern in price_patterns:
+                matches = re.findall(pattern, all_text, re.IGNORECASE)
+                if matches:
+                    prices = [float(p) for p in matches if float(p) > 0]
+                    if prices:
+                        # Take the most reasonable price (not too high or too low)
+                        prices = [p for p in prices if 1 < p < 100000]
                         if prices:
-                            # Take the most reasonable price (not too high or too low)
-                            prices = [p for p in prices if 1 < p < 100000]
-                            if prices:
-                                price = min(prices)  # Take lowest reasonable price
-                                break
-            
-            if price:
-                return {'price': price, 'currency': currency, 'available': True}
-            else:
-                return {'error': 'Price not found', 'available': False}
-                
-        except Exception as e:
-            return {'error': str(e), 'available': False}
+                            price = min(prices)  # Take lowest reasonable price
+                            method = 'text'
+                            break
+        
+        if price:
+            result = {'price': price, 'currency': currency, 'available': True, 'method': method}
+            if hit:
+                result['selector'] = hit
+            return result
+        else:
+            return {'error': 'Price not found', 'available': False}
     
-    def scrape_bigbasket_with_pincode(self, url, pincode):
-        """Scrape BigBasket with pincode using Selenium"""
+    def _chrome_options(self):
+        """Headless Chrome options shared by every Selenium path"""
         options = Options()
         options.add_argument('--headless=new')
         options.add_argument('--no-sandbox')
@@ -248,225 +609,417 @@ class UniversalPriceTracker:
         options.add_argument('--disable-blink-features=AutomationControlled')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
-        
-        try:
-            # Try to initialize driver
+        # Return from driver.get() at DOMContentLoaded; wait_for_page decides when a price is there
+        options.page_load_strategy = 'eager'
+        # DevTools network events, used for request-blocking stats
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        return options
+
+    def _lease_daemon_browser(self):
+        """Reserve a healthy daemon browser no other pooled driver is attached to"""
+        mode = self.scraper_settings.get('browser_daemon', 'auto')
+        if not mode:
+            return None
+        state_file = self.scraper_settings.get('browser_daemon_state_file', BROWSER_DAEMON_STATE_FILE)
+        with self.daemon_lock:
+            for address in healthy_browsers(state_file):
+                # A hung browser stays out of rotation until the daemon restarts it under a new pid
+                if address in self.bad_daemon_browsers and self.bad_daemon_browsers[address] == browser_pid(
+                        address, state_file):
+                    continue
+                if address not in self.daemon_leases:
+                    self.daemon_leases.add(address)
+                    return address
+        if mode is True:
+            print("⚠️  No free browser_daemon browser, launching Chrome instead")
+        return None
+
+    def _release_daemon_browser(self, driver):
+        address = getattr(driver, 'daemon_address', None)
+        if address:
+            with self.daemon_lock:
+                self.daemon_leases.discard(address)
+
+    def _kill_daemon_browser(self, driver):
+        """Kill the daemon browser behind a hung driver and keep it out of rotation; returns processes killed"""
+        address = getattr(driver, 'daemon_address', None)
+        if not address:
+            return 0
+        pid = getattr(driver, 'daemon_pid', None)
+        with self.daemon_lock:
+            self.bad_daemon_browsers[address] = pid
+        print(f"🔌 Daemon browser at {address} hung, killing it (the daemon restarts it)")
+        return kill_pids(process_tree(pid)) if pid else 0
+
+    def _create_driver(self):
+        """Start a Chrome driver with the anti-detection tweaks applied"""
+        address = self._lease_daemon_browser()
+        if address:
+            # Attach to an already-running browser: only chromedriver starts
+            print(f"🔧 Attaching to warm Chrome at {address}...")
+            options = Options()
+            options.debugger_address = address
+            options.page_load_strategy = 'eager'
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            try:
+                driver = webdriver.Chrome(options=options)
+            except Exception:
+                with self.daemon_lock:
+                    self.daemon_leases.discard(address)
+                raise
+            driver.daemon_address = address
+            driver.daemon_pid = browser_pid(
+                address, self.scraper_settings.get('browser_daemon_state_file', BROWSER_DAEMON_STATE_FILE))
+        else:
             print("🔧 Initializing Chrome driver...")
-            driver = webdriver.Chrome(options=options)
-            
-            # Hide webdriver signature
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # Set realistic user agent
-            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            
-            print(f"🌐 Loading BigBasket URL: {url}")
-            driver.get(url)
-            
-            # Wait for page to load
-            time.sleep(5)
-            print("✅ BigBasket page loaded")
+            driver = webdriver.Chrome(options=self._chrome_options())
+        try:
+            self.reaper.remember(process_tree(driver.service.process.pid))
+        except Exception:
+            pass
+
+        # Hide webdriver signature on every document, not just the current one
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        })
+
+        # Set realistic user agent
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+            "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        })
+        return driver
+
+    def get_driver_pool(self):
+        """Return the run's driver pool, creating it on first use"""
+        if self.driver_pool is None or self.driver_pool.closed:
+            settings = self.scraper_settings
+            self.driver_pool = DriverPool(
+                self._create_driver,
+                size=settings.get('driver_pool_size', 2),
+                max_pages=settings.get('driver_max_pages', 25),
+                max_memory_mb=settings.get('driver_max_memory_mb', 1024),
+                on_quit=self._release_daemon_browser,
+                on_kill=self._kill_daemon_browser,
+            )
+        return self.driver_pool
+
+    def close_driver_pool(self):
+        """Quit all pooled browsers"""
+        if self.driver_pool is not None:
+            stats = self.driver_pool.stats
+            if stats['started']:
+                print(f"📊 Driver pool: {stats['started']} Chrome start(s) in {stats['startup_seconds']:.1f}s, "
+                      f"served {stats['pages']} page(s) in {stats['page_seconds']:.1f}s")
+            self.driver_pool.close()
+            self.driver_pool = None
+
+    def prepare_page(self, driver, url, fresh_log=True):
+        """Apply the resource-blocking policy for this site before navigating
+
+        `fresh_log` drops DevTools events left over from earlier pages; tab batches clear it once
+        per batch instead, so every tab's requests reach the batch's network stats.
+        """
+        if fresh_log:
+            drain_performance_log(driver)
+        patterns = blocked_patterns_for(self.scraper_settings.get('resource_blocking'), get_domain(url))
+        try:
+            apply_blocking(driver, patterns)
+        except Exception as e:
+            print(f"⚠️  Could not apply request blocking: {e}")
+
+    def report_page_network(self, driver, events=None):
+        """Print and accumulate blocked requests / transferred bytes for the page just scraped"""
+        stats = network_stats(list(events or []) + drain_performance_log(driver))
+        if not stats['requests']:
+            return stats
+        with self.stats_lock:
+            self.network_totals['pages'] += 1
+            for key in ('requests', 'blocked_requests', 'transferred_bytes'):
+                self.network_totals[key] += stats[key]
+        print(f"🚫 Blocked {stats['blocked_requests']}/{stats['requests']} requests, "
+              f"transferred {stats['transferred_bytes'] / 1024:.0f} KB")
+        return stats
+
+    def capture_product_api(self, driver, url, events):
+        """Price, MRP and stock from the site's product-API response, if configured and it arrives in time"""
+        domain = get_domain(url)
+        for site, capture in self.scraper_settings.get('network_capture', {}).items():
+            if domain == site or domain.endswith('.' + site):
+                product_id = product_id_from_url(url, capture.get('product_id_pattern'))
+                if not product_id:
+                    # Without the id, a price in the response could belong to any listed item
+                    print(f"📡 No product id in the URL, reading the DOM")
+                    return None
+                started = time.time()
+                product = capture_product_json(driver, capture.get('url_patterns', []), product_id,
+                                               timeout=capture.get('timeout', 3), events=events)
+                if product:
+                    print(f"📡 Product API answered in {time.time() - started:.2f}s: ₹{product['price']}")
+                    return {'price': product['price'], 'currency': '₹', 'available': True, 'method': 'network',
+                            'mrp': product.get('mrp'), 'in_stock': product.get('in_stock')}
+                print(f"📡 No product API response after {time.time() - started:.2f}s, reading the DOM")
+                return None
+        return None
+
+    def wait_for_page(self, driver, url, selectors=None, checks=None, baseline=None):
+        """Wait until the page shows a price signal, bounded by the site's max wait"""
+        limits = self.scraper_settings.get('readiness_max_wait', {})
+        domain = get_domain(url)
+        max_wait = limits.get('default', 5)
+        for site, limit in limits.items():
+            if domain == site or domain.endswith('.' + site):
+                max_wait = limit
+                break
+
+        kwargs = {'selectors': selectors, 'max_wait': max_wait}
+        if checks:
+            kwargs['checks'] = checks
+        if baseline is not None:
+            kwargs['baseline'] = baseline
+        readiness = wait_for_price_ready(driver, **kwargs)
+        self.page_timings.append({'domain': domain, **readiness})
+
+        if readiness['ready']:
+            print(f"✅ Page ready in {readiness['elapsed']:.2f}s ({readiness['reason']})")
+        else:
+            print(f"⏱️  No price signal after {readiness['elapsed']:.2f}s, extracting anyway")
+        return readiness
+
+    def find_price_in_page(self, driver, css_selectors):
+        """Meta, JSON-LD and CSS candidates from one execute_script call, ranked in Python"""
+        meta_selectors = [s for s in self.price_selectors if s['type'] == 'meta']
+        candidates = collect_price_candidates(driver, css_selectors, meta_selectors)
+        return pick_price(candidates, self.extract_price_from_text, self.extract_price_from_jsonld)
+
+    def scrape_bigbasket_with_pincode(self, url, pincode):
+        """Scrape BigBasket with pincode using Selenium"""
+        try:
+            with self.get_driver_pool().driver() as driver:
+                # BigBasket specific selectors
+                bigbasket_selectors = [
+                    ".Pricing___StyledLabel-sc-pldi2d-1",
+                    ".price",
+                    ".current-price",
+                    "[data-testid='price']",
+                    "[class*='Price']",
+                    "[class*='price']",
+                    ".ProductPrice",
+                    ".ProductPriceView",
+                    ".ProductPriceView__Price",
+                    "span[class*='Price']",
+                    "div[class*='Price']",
+                    ".PriceDisplay",
+                    ".PriceDisplay__value",
+                    ".MuiTypography-root",
+                    "[class*='MuiTypography']",
+                    ".Typography",
+                    "[class*='Typography']",
+                ]
             
-            # Try to find price without pincode first
-            price = None
+                print(f"🌐 Loading BigBasket URL: {url}")
+                domain = get_domain(url)
+                self.prepare_page(driver, url)
+                saved_location = self.location_state.get(domain, pincode) if pincode else None
+                injected = None
+                if saved_location:
+                    try:
+                        injected = self.location_state.inject(driver, saved_location)
+                        print(f"📍 Reusing saved location for pincode {pincode}")
+                    except Exception as e:
+                        print(f"⚠️  Could not restore saved location: {e}")
+                        saved_location = None
+                driver.get(url)
+                self.location_state.remove_injection(driver, injected)
+
+                # Until the pincode flow has run, the page is priced for the default location; that is
+                # only the right price when no pincode is wanted or a saved location was restored
+                first_load_priced = bool(saved_location) or not pincode
+
+                # The product API usually answers before the page has rendered a price
+                events = []
+                api_result = self.capture_product_api(driver, url, events) if first_load_priced else None
+                if api_result:
+                    self.report_page_network(driver, events)
+                    return api_result
+
+                self.wait_for_page(driver, url, selectors=bigbasket_selectors)
             
-            # BigBasket specific selectors
-            bigbasket_selectors = [
-                ".Pricing___StyledLabel-sc-pldi2d-1",
-                ".price",
-                ".current-price",
-                "[data-testid='price']",
-                "[class*='Price']",
-                "[class*='price']",
-                ".ProductPrice",
-                ".ProductPriceView",
-                ".ProductPriceView__Price",
-                "span[class*='Price']",
-                "div[class*='Price']",
-                ".PriceDisplay",
-                ".PriceDisplay__value",
-                ".MuiTypography-root",
-                "[class*='MuiTypography']",
-                ".Typography",
-                "[class*='Typography']",
-            ]
+                # Try to find price without pincode first
+                price, hit = None, None
             
-            print("🔍 Searching for price on BigBasket...")
-            for selector in bigbasket_selectors:
-                try:
-                    elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in elements:
-                        text = element.text.strip()
-                        if text and ('₹' in text or 'Rs' in text or any(char.isdigit() for char in text)):
-                            price = self.extract_price_from_text(text)
-                            if price:
-                                print(f"✅ Found BigBasket price via {selector}: ₹{price}")
-                                break
-                    if price:
-                        break
-                except:
-                    continue
+                if first_load_priced:
+                    print("🔍 Searching for price on BigBasket...")
+                    price, hit = self.find_price_in_page(driver, bigbasket_selectors)
+                paths = self.app_state_paths_for(url)
+                if not price and paths and first_load_priced:
+                    # The Next.js state blob is rendered server-side for the location cookie the request
+                    # carried; after a client-side pincode change it would be stale, so only read it here
+                    state_result = self.app_state_result(app_state_from_driver(driver), paths)
+                    if state_result:
+                        print(f"✅ Found BigBasket price in app state: ₹{state_result['price']}")
+                        self.report_page_network(driver, events)
+                        return state_result
+                if price:
+                    print(f"✅ Found BigBasket price via {hit['selector']}: ₹{price}")
+                elif saved_location:
+                    # The site dropped the saved location; run the pincode flow again
+                    print("📍 Saved location was not honoured, setting it again")
+                    self.location_state.invalidate(domain, pincode)
             
-            # If no price found and pincode is provided, try to set it
-            if not price and pincode:
-                print(f"🏪 Setting location for pincode: {pincode}")
+                # If no price found and pincode is provided, try to set it
+                if not price and pincode:
+                    print(f"🏪 Setting location for pincode: {pincode}")
                 
-                # Look for location/change button - more comprehensive
-                location_selectors = [
-                    "//button[contains(text(),'Change')]",
-                    "//button[contains(text(),'Select Location')]",
-                    "//button[contains(text(),'Set Location')]",
-                    "//div[contains(text(),'Change')]",
-                    "//span[contains(text(),'Change')]",
-                    "//a[contains(text(),'Change')]",
-                    "//button[contains(@class,'location')]",
-                    "//div[contains(@class,'location')]",
-                    "//button[contains(@class,'pincode')]",
-                    "//div[contains(@class,'pincode')]",
-                    "//button[contains(@class,'address')]",
-                    "//div[contains(@class,'address')]",
-                    "//*[contains(@class,'location') and contains(@class,'button')]",
-                    "//*[contains(@class,'pincode') and contains(@class,'button')]",
-                    "//button[contains(@aria-label,'location')]",
-                    "//button[contains(@aria-label,'pincode')]",
-                    "//button[contains(@title,'location')]",
-                    "//button[contains(@title,'pincode')]",
-                ]
+                    # Look for location/change button - more comprehensive
+                    location_selectors = [
+                        "//button[contains(text(),'Change')]",
+                        "//button[contains(text(),'Select Location')]",
+                        "//button[contains(text(),'Set Location')]",
+                        "//div[contains(text(),'Change')]",
+                        "//span[contains(text(),'Change')]",
+                        "//a[contains(text(),'Change')]",
+                        "//button[contains(@class,'location')]",
+                        "//div[contains(@class,'location')]",
+                        "//button[contains(@class,'pincode')]",
+                        "//div[contains(@class,'pincode')]",
+                        "//button[contains(@class,'address')]",
+                        "//div[contains(@class,'address')]",
+                        "//*[contains(@class,'location') and contains(@class,'button')]",
+                        "//*[contains(@class,'pincode') and contains(@class,'button')]",
+                        "//button[contains(@aria-label,'location')]",
+                        "//button[contains(@aria-label,'pincode')]",
+                        "//button[contains(@title,'location')]",
+                        "//button[contains(@title,'pincode')]",
+                    ]
                 
-                location_clicked = False
-                for selector in location_selectors:
-                    try:
-                        location_btn = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        location_btn.click()
-                        location_clicked = True
+                    # Price texts and location label before the popup opens, to tell when the new location applied
+                    before_location = page_fingerprint(driver, bigbasket_selectors)
+
+                    # Each cascade is resolved in one poll loop against a single deadline
+                    timeout = self.scraper_settings.get('selector_timeout', 5)
+                    selector = self.selector_resolver.click(driver, 'bigbasket.location', location_selectors, timeout)
+                    location_clicked = selector is not None
+                    if location_clicked:
                         print(f"✅ Clicked location button: {selector}")
-                        time.sleep(2)
-                        break
-                    except:
-                        continue
                 
-                # Look for pincode input
-                if location_clicked:
-                    pincode_selectors = [
-                        "//input[@id='pincode']",
-                        "//input[@name='pincode']",
-                        "//input[@placeholder='pincode']",
-                        "//input[contains(@placeholder,'Pincode')]",
-                        "//input[contains(@placeholder,'PIN')]",
-                        "//input[contains(@placeholder,'Enter pincode')]",
-                        "//input[@type='number']",
-                        "//input[contains(@class,'pincode')]",
-                        "//input[contains(@class,'location')]",
-                        "//input[contains(@class,'address')]",
-                        "//input[contains(@placeholder,'location')]",
-                        "//input[contains(@placeholder,'address')]",
-                    ]
+                    # Look for pincode input
+                    if location_clicked:
+                        pincode_selectors = [
+                            "//input[@id='pincode']",
+                            "//input[@name='pincode']",
+                            "//input[@placeholder='pincode']",
+                            "//input[contains(@placeholder,'Pincode')]",
+                            "//input[contains(@placeholder,'PIN')]",
+                            "//input[contains(@placeholder,'Enter pincode')]",
+                            "//input[@type='number']",
+                            "//input[contains(@class,'pincode')]",
+                            "//input[contains(@class,'location')]",
+                            "//input[contains(@class,'address')]",
+                            "//input[contains(@placeholder,'location')]",
+                            "//input[contains(@placeholder,'address')]",
+                        ]
                     
-                    pincode_entered = False
-                    for selector in pincode_selectors:
-                        try:
-                            pincode_input = WebDriverWait(driver, 3).until(
-                                EC.presence_of_element_located((By.XPATH, selector))
-                            )
-                            pincode_input.clear()
-                            pincode_input.send_keys(pincode)
-                            pincode_entered = True
-                            print(f"✅ Entered pincode via: {selector}")
-                            time.sleep(1)
-                            break
-                        except:
-                            continue
+                        pincode_entered = False
+                        pincode_input, selector = self.selector_resolver.resolve(
+                            driver, 'bigbasket.pincode', pincode_selectors, timeout)
+                        if pincode_input is not None:
+                            try:
+                                pincode_input.clear()
+                                pincode_input.send_keys(pincode)
+                                pincode_entered = True
+                                print(f"✅ Entered pincode via: {selector}")
+                            except Exception as e:
+                                print(f"⚠️  Could not type pincode: {e}")
                     
-                    # Submit pincode
-                    if pincode_entered:
-                        submit_selectors = [
-                            "//button[contains(text(),'Check')]",
-                            "//button[contains(text(),'Submit')]",
-                            "//button[contains(text(),'Apply')]",
-                            "//button[contains(text(),'Continue')]",
-                            "//button[contains(text(),'Go')]",
-                            "//button[contains(text(),'Proceed')]",
-                            "//button[contains(text(),'Confirm')]",
-                            "//button[@type='submit']",
-                            "//input[@type='submit']",
-                            "//button[contains(@class,'submit')]",
-                            "//button[contains(@class,'apply')]",
-                            "//button[contains(@class,'check')]",
-                        ]
+                        # Submit pincode
+                        if pincode_entered:
+                            submit_selectors = [
+                                "//button[contains(text(),'Check')]",
+                                "//button[contains(text(),'Submit')]",
+                                "//button[contains(text(),'Apply')]",
+                                "//button[contains(text(),'Continue')]",
+                                "//button[contains(text(),'Go')]",
+                                "//button[contains(text(),'Proceed')]",
+                                "//button[contains(text(),'Confirm')]",
+                                "//button[@type='submit']",
+                                "//input[@type='submit']",
+                                "//button[contains(@class,'submit')]",
+                                "//button[contains(@class,'apply')]",
+                                "//button[contains(@class,'check')]",
+                            ]
                         
-                        for selector in submit_selectors:
-                            try:
-                                submit_btn = WebDriverWait(driver, 3).until(
-                                    EC.element_to_be_clickable((By.XPATH, selector))
-                                )
-                                submit_btn.click()
+                            selector = self.selector_resolver.click(driver, 'bigbasket.submit', submit_selectors, timeout)
+                            if selector:
                                 print(f"✅ Clicked submit button: {selector}")
-                                time.sleep(5)  # Wait longer for price update
-                                break
-                            except:
-                                continue
+                                # The location change refetches the product API; else wait for the DOM
+                                api_result = self.capture_product_api(driver, url, events)
+                                if not api_result and before_location is not None:
+                                    # The old price is still rendered, so a plain price signal would
+                                    # pass at once; wait for the price or location label to change
+                                    self.wait_for_page(driver, url, selectors=bigbasket_selectors,
+                                                       checks=('changed',), baseline=before_location)
+                                elif not api_result:
+                                    self.wait_for_page(driver, url, selectors=bigbasket_selectors,
+                                                       checks=('selector', 'network-idle'))
                     
-                    # Try to find price again after setting pincode
-                    if pincode_entered:
-                        print("🔍 Searching for price after setting pincode...")
-                        for selector in bigbasket_selectors:
-                            try:
-                                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                                for element in elements:
-                                    text = element.text.strip()
-                                    if text and ('₹' in text or 'Rs' in text or any(char.isdigit() for char in text)):
-                                        price = self.extract_price_from_text(text)
-                                        if price:
-                                            print(f"✅ Found BigBasket price after pincode via {selector}: ₹{price}")
-                                            break
-                                if price:
-                                    break
-                            except:
-                                continue
+                        if api_result:
+                            self.location_state.capture(driver, domain, pincode)
+                            self.report_page_network(driver, events)
+                            return api_result
+
+                        # Try to find price again after setting pincode
+                        if pincode_entered:
+                            print("🔍 Searching for price after setting pincode...")
+                            price, hit = self.find_price_in_page(driver, bigbasket_selectors)
+                            if price:
+                                print(f"✅ Found BigBasket price after pincode via {hit['selector']}: ₹{price}")
+                                self.location_state.capture(driver, domain, pincode)
             
-            # Last resort: check page source with more patterns
-            if not price:
-                print("🔍 Checking BigBasket page source...")
-                page_source = driver.page_source
-                bigbasket_patterns = [
-                    r'"price":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'"currentPrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'"salePrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'"mrp":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'"sellingPrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'data-price="([^"]+)"',
-                    r'data-mrp="([^"]+)"',
-                    r'data-selling-price="([^"]+)"',
-                    r'₹\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'price["\s:]+["\s]*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'mrp["\s:]+["\s]*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'sellingPrice["\s:]+["\s]*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                ]
+                if not price and not first_load_priced:
+                    # The pincode flow did not price the page; the default location's price beats none
+                    price, hit = self.find_price_in_page(driver, bigbasket_selectors)
+                    if price:
+                        print(f"⚠️  Pincode not applied, using the page price via {hit['selector']}: ₹{price}")
+            
+                # Last resort: check page source with more patterns
+                if not price:
+                    print("🔍 Checking BigBasket page source...")
+                    page_source = driver.page_source
+                    bigbasket_patterns = [
+                        r'"price":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                        r'"currentPrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                        r'"salePrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                        r'"mrp":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                        r'"sellingPrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                        r'data-price="([^"]+)"',
+                        r'data-mrp="([^"]+)"',
+                        r'data-selling-price="([^"]+)"',
+                        r'₹\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                        r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                        r'price["\s:]+["\s]*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                        r'mrp["\s:]+["\s]*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                        r'sellingPrice["\s:]+["\s]*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                    ]
                 
-                for pattern in bigbasket_patterns:
-                    matches = re.findall(pattern, page_source, re.IGNORECASE)
-                    if matches:
-                        prices = []
-                        for p in matches:
-                            p = p.replace(',', '')
-                            try:
-                                price_val = float(p)
-                                if 10 < price_val < 50000:  # Reasonable range for groceries
-                                    prices.append(price_val)
-                            except:
-                                continue
+                    for pattern in bigbasket_patterns:
+                        matches = re.findall(pattern, page_source, re.IGNORECASE)
+                        if matches:
+                            prices = []
+                            for p in matches:
+                                p = p.replace(',', '')
+                                try:
+                                    price_val = float(p)
+                                    if 10 < price_val < 50000:  # Reasonable range for groceries
+                                        prices.append(price_val)
+                                except:
+                                    continue
                         
-                        if prices:
-                            price = min(prices)
-                            print(f"✅ Found BigBasket price in page source: ₹{price}")
-                            break
+                            if prices:
+                                price = min(prices)
+                                print(f"✅ Found BigBasket price in page source: ₹{price}")
+                                break
             
-            driver.quit()
+                self.report_page_network(driver, events)
             
             if price:
                 return {'price': price, 'currency': '₹', 'available': True}
@@ -474,193 +1027,308 @@ class UniversalPriceTracker:
                 return {'error': 'BigBasket price not found - may need manual location selection', 'available': False}
                 
         except Exception as e:
-            try:
-                driver.quit()
-            except:
-                pass
             error_msg = f'BigBasket scraping error: {str(e)}'
             print(f"❌ {error_msg}")
-            return {'error': error_msg, 'available': False}
+            return error_result(e, error_msg)
     
     def scrape_with_selenium(self, url):
         """Scrape price using Selenium for any website"""
-        options = Options()
-        options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-plugins')
-        options.add_argument('--disable-web-security')
-        options.add_argument('--allow-running-insecure-content')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
         try:
-            # Try to initialize driver
-            print("🔧 Initializing Chrome driver...")
-            driver = webdriver.Chrome(options=options)
-            
-            # Hide webdriver signature
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # Set realistic user agent
-            driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            
-            print(f"🌐 Loading URL: {url}")
-            driver.get(url)
-            
-            # Wait for page to load
-            time.sleep(5)
-            print("✅ Page loaded")
-            
-            # Try to find price using multiple selectors
-            price = None
-            currency = '₹'
-            
-            # Method 1: Try all price selectors
-            print("🔍 Searching for price using CSS selectors...")
-            for selector in self.price_selectors:
-                if selector['type'] == 'css':
-                    try:
-                        elements = driver.find_elements(By.CSS_SELECTOR, selector['selector'])
-                        for element in elements:
-                            text = element.text.strip()
-                            price = self.extract_price_from_text(text)
-                            if price:
-                                print(f"✅ Found price via selector: {selector['selector']} - ₹{price}")
-                                break
-                        if price:
-                            break
-                    except Exception as e:
-                        continue
-                elif selector['type'] == 'meta':
-                    try:
-                        meta_tags = driver.find_elements(By.TAG_NAME, 'meta')
-                        for tag in meta_tags:
-                            if tag.get_attribute(selector['attr']) == selector['value']:
-                                content = tag.get_attribute('content', '')
-                                price = self.extract_price_from_text(content)
-                                if price:
-                                    print(f"✅ Found price via meta: {selector['value']} - ₹{price}")
-                                    break
-                        if price:
-                            break
-                    except:
-                        continue
-            
-            # Method 2: Look for price in page source
-            if not price:
-                print("🔍 Searching for price in page source...")
-                page_source = driver.page_source
-                # Look for price patterns with currency symbols
-                price_patterns = [
-                    r'₹\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*₹',
-                    r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*Rs\.?',
-                    r'"price":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'"currentPrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'"salePrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
-                    r'data-asin-price="([^"]+)"',
-                    r'data-price="([^"]+)"',
-                    r'priceWhole["\s:]+["\s]*(\d+(?:,\d{3})*)',
-                    r'priceFraction["\s:]+["\s]*(\d+)',
-                ]
-                
-                for pattern in price_patterns:
-                    matches = re.findall(pattern, page_source, re.IGNORECASE)
-                    if matches:
-                        prices = []
-                        for p in matches:
-                            # Clean up the price string
-                            p = p.replace(',', '')
-                            try:
-                                price_val = float(p)
-                                if 1 < price_val < 100000:  # Reasonable price range
-                                    prices.append(price_val)
-                            except:
-                                continue
-                        
-                        if prices:
-                            price = min(prices)  # Take lowest reasonable price
-                            print(f"✅ Found price via pattern matching: ₹{price}")
-                            break
-            
-            # Method 3: Try common price element IDs and classes
-            if not price:
-                print("🔍 Searching for price using common selectors...")
-                common_selectors = [
-                    "#price",
-                    "#productPrice",
-                    "#salePrice",
-                    "#currentPrice",
-                    ".price",
-                    ".product-price",
-                    ".sale-price",
-                    ".current-price",
-                    "[data-price]",
-                    "[data-testid*='price']",
-                    "[class*='Price']",
-                    "[class*='price']",
-                    "span[class*='price']",
-                    "div[class*='price']",
-                    "h1[class*='price']",
-                    "h2[class*='price']",
-                    "h3[class*='price']",
-                    ".a-price-whole",
-                    ".a-price-fraction",
-                    ".a-offscreen",
-                    "[id*='price']",
-                    "[aria-label*='price']",
-                ]
-                
-                for selector in common_selectors:
-                    try:
-                        element = driver.find_element(By.CSS_SELECTOR, selector)
-                        text = element.text.strip()
-                        price = self.extract_price_from_text(text)
-                        if price:
-                            print(f"✅ Found price via common selector: {selector} - ₹{price}")
-                            break
-                    except:
-                        continue
-            
-            driver.quit()
-            
-            if price:
-                return {'price': price, 'currency': currency, 'available': True}
-            else:
-                return {'error': 'Price not found with Selenium', 'available': False}
+            with self.get_driver_pool().driver() as driver:
+                print(f"🌐 Loading URL: {url}")
+                self.prepare_page(driver, url)
+                driver.get(url)
+
+                events = []
+                api_result = self.capture_product_api(driver, url, events)
+                if api_result:
+                    self.report_page_network(driver, events)
+                    return api_result
+
+                result = self.extract_with_selenium(driver, url)
+                self.report_page_network(driver, events)
+            return result
                 
         except Exception as e:
-            try:
-                driver.quit()
-            except:
-                pass
             error_msg = f'Selenium scraping error: {str(e)}'
             print(f"❌ {error_msg}")
-            return {'error': error_msg, 'available': False}
+            return error_result(e, error_msg)
+    
+    def scrape_with_product_hints(self, url, hints):
+        """Load the page in a pooled browser and run only the product's hinted lookup on the rendered DOM"""
+        try:
+            with self.get_driver_pool().driver() as driver:
+                print(f"🌐 Loading URL: {url}")
+                self.prepare_page(driver, url)
+                driver.get(url)
+                selector = hints.get('selector')
+                self.wait_for_page(driver, url, selectors=[selector] if selector else None)
+                result = self.extract_with_product_hints(driver.page_source, hints)
+                self.report_page_network(driver)
+            return result or {'error': 'Product hint did not match', 'available': False}
+        except Exception as e:
+            error_msg = f'Selenium scraping error: {str(e)}'
+            print(f"❌ {error_msg}")
+            return error_result(e, error_msg)
+
+    def extract_with_selenium(self, driver, url):
+        """Wait for the loaded page in the current tab and run the in-page extraction cascade"""
+        css_selectors = [s['selector'] for s in self.price_selectors if s['type'] == 'css']
+        self.wait_for_page(driver, url, selectors=css_selectors)
+
+        # Method 1: meta tags, JSON-LD and the CSS price selectors, collected in one round trip
+        price = None
+        currency = '₹'
+        meta_selectors = [s for s in self.price_selectors if s['type'] == 'meta']
+        common_selectors = [
+            "#price",
+            "#productPrice",
+            "#salePrice",
+            "#currentPrice",
+            ".price",
+            ".product-price",
+            ".sale-price",
+            ".current-price",
+            "[data-price]",
+            "[data-testid*='price']",
+            "[class*='Price']",
+            "[class*='price']",
+            "span[class*='price']",
+            "div[class*='price']",
+            "h1[class*='price']",
+            "h2[class*='price']",
+            "h3[class*='price']",
+            ".a-price-whole",
+            ".a-price-fraction",
+            ".a-offscreen",
+            "[id*='price']",
+            "[aria-label*='price']",
+        ]
+        candidates = collect_price_candidates(
+            driver, list(dict.fromkeys(css_selectors + common_selectors)), meta_selectors
+        )
+
+        print(f"🔍 Ranking {len(candidates)} in-page price candidates...")
+        price, hit = pick_price(candidates, self.extract_price_from_text, self.extract_price_from_jsonld,
+                                selectors=set(css_selectors))
+        if price:
+            print(f"✅ Found price via {hit['source']}: {hit['selector']} - ₹{price}")
+
+        # Method 1b: the page's app-state blob, before regexes over the whole source
+        paths = self.app_state_paths_for(url)
+        if not price and paths:
+            state_result = self.app_state_result(app_state_from_driver(driver), paths)
+            if state_result:
+                print(f"✅ Found price in app state ({state_result['path']}): ₹{state_result['price']}")
+                return state_result
+
+        # Method 2: Look for price in page source
+        if not price:
+            print("🔍 Searching for price in page source...")
+            page_source = driver.page_source
+            # Look for price patterns with currency symbols
+            price_patterns = [
+                r'₹\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                r'Rs\.?\s*(\d+(?:,\d{3})*(?:\.\d{2})?)',
+                r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*₹',
+                r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*Rs\.?',
+                r'"price":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                r'"currentPrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                r'"salePrice":\s*"?(\d+(?:,\d{3})*(?:\.\d{2})?)"?',
+                r'data-asin-price="([^"]+)"',
+                r'data-price="([^"]+)"',
+                r'priceWhole["\s:]+["\s]*(\d+(?:,\d{3})*)',
+                r'priceFraction["\s:]+["\s]*(\d+)',
+            ]
+
+            for pattern in price_patterns:
+                matches = re.findall(pattern, page_source, re.IGNORECASE)
+                if matches:
+                    prices = []
+                    for p in matches:
+                        # Clean up the price string
+                        p = p.replace(',', '')
+                        try:
+                            price_val = float(p)
+                            if 1 < price_val < 100000:  # Reasonable price range
+                                prices.append(price_val)
+                        except:
+                            continue
+
+                    if prices:
+                        price = min(prices)  # Take lowest reasonable price
+                        print(f"✅ Found price via pattern matching: ₹{price}")
+                        break
+
+        # Method 3: Try common price element IDs and classes
+        if not price:
+            print("🔍 Searching for price using common selectors...")
+            price, hit = pick_price(candidates, self.extract_price_from_text,
+                                    selectors=set(common_selectors), sources=('css',))
+            if price:
+                print(f"✅ Found price via common selector: {hit['selector']} - ₹{price}")
+        
+        if price:
+            result = {'price': price, 'currency': currency, 'available': True}
+            if hit:
+                # What priced the page, so the product can go straight there next time
+                result.update(method=hit['source'], selector=hit['selector'])
+                if hit['source'] == 'json-ld':
+                    documents = [load_jsonld(c['text']) for c in candidates if c['source'] == 'json-ld']
+                    result['path'] = find_path(documents, price, keys=('price', 'lowPrice'))
+            return result
+        else:
+            return {'error': 'Price not found with Selenium', 'available': False}
     
+    def is_valid_price_result(self, result):
+        """Check that a scrape result carries a trustworthy price"""
+        if not result or 'error' in result or not result.get('price'):
+            return False
+        if not 1 < result['price'] < 100000:
+            return False
+        # A bare "₹123" found somewhere in the page text is too weak to skip the browser
+        return result.get('method') != 'text'
+
+    def _with_retries(self, fetch, label, url):
+        """Retry a scrape that failed transiently, with jittered exponential backoff"""
+        settings = self.scraper_settings
+        domain = get_domain(url)
+
+        def attempt():
+            # Every attempt is a new request to the site, so each one waits for the domain's token
+            self.scheduler.pace(domain)
+            return fetch()
+
+        return retry_result(
+            attempt,
+            attempts=settings.get('retry_attempts', 3),
+            base_delay=settings.get('retry_base_delay', 1.0),
+            max_delay=settings.get('retry_max_delay', 20.0),
+            label=label,
+        )
+
+    def needs_pincode_flow(self, url):
+        return 'bigbasket.com' in url.lower() and bool(getattr(self, 'pincode', None))
+
+    def scrape_with_browser(self, url):
+        """Scrape with headless Chrome (BigBasket gets the pincode flow)"""
+        if self.needs_pincode_flow(url):
+            print(f"🏪 BigBasket detected, using pincode: {self.pincode}")
+            return self.scrape_bigbasket_with_pincode(url, self.pincode)
+        print(f"🌐 Using Selenium for price extraction")
+        return self.scrape_with_selenium(url)
+
     def check_product_price(self, product):
-        """Check price for a single product using Selenium"""
+        """Check price for a single product, plain HTTP first and Selenium as fallback"""
         url = product['url']
         name = product['name']
         
         print(f"\n🔍 Checking: {name}")
         print(f"📍 URL: {url}")
         
-        # Always use Selenium for consistency in GitHub Actions
-        if 'bigbasket.com' in url.lower() and hasattr(self, 'pincode') and self.pincode:
-            print(f"🏪 BigBasket detected, using pincode: {self.pincode}")
-            result = self.scrape_bigbasket_with_pincode(url, self.pincode)
-        else:
-            print(f"🌐 Using Selenium for price extraction")
-            result = self.scrape_with_selenium(url)
+        domain = get_domain(url)
+        if domain and not self.circuit_breaker.allow(domain):
+            print(f"🔌 Circuit open for {domain}, skipping until the cooldown passes")
+            return None
+        
+        tier = self.tier_for(domain)
+        result = None
+        
+        # Fast path: the product's own hints name the tier and the one lookup that prices it
+        use_hints = self.scraper_settings.get('product_hints', True)
+        hints = product.get('extraction') if use_hints else None
+        if hints:
+            hinted = self.check_with_product_hints(url, hints)
+            if hinted is not None:
+                if self.is_valid_price_result(hinted) or hinted.get('transient'):
+                    if 'error' not in hinted:
+                        with self.stats_lock:
+                            self.product_hint_stats['hits'] += 1
+                    return self._finish_check(domain, hinted)
+                with self.stats_lock:
+                    self.product_hint_stats['misses'] += 1
+                print(f"🎯 Product hint {describe_product_hints(hints)} missed, rediscovering")
+            if hints.get('tier') == 'browser':
+                tier = 'browser'
+        
+        # The pincode flow sets the delivery location first; a plain request would price the default one
+        if self.needs_pincode_flow(url):
+            tier = 'browser'
+        
+        # Tier 1: requests + BeautifulSoup, unless this site is known to need a browser
+        http_miss = False
+        if tier == 'http':
+            print(f"⚡ Trying plain HTTP extraction")
+            result = self._with_retries(lambda: self.scrape_price_universal(url), 'HTTP', url)
+            if self.is_valid_price_result(result):
+                if self.domain_tiers.get(domain) == 'browser':
+                    print(f"📝 {domain} works over plain HTTP again")
+                    with self.config_lock:
+                        self.domain_tiers.pop(domain, None)
+                        self.tier_checked.pop(domain, None)
+            else:
+                print(f"↗️  HTTP result not usable ({result.get('error') or 'unvalidated price'}), escalating to browser")
+                # A timeout or 429 that outlived the retries says nothing about whether the site needs a browser
+                http_miss = not result.get('transient')
+                result = None
+        
+        # Tier 2: headless Chrome
+        if result is None:
+            result = self._with_retries(lambda: self.scrape_with_browser(url), 'Browser', url)
+            if domain and http_miss and self.is_valid_price_result(result):
+                print(f"📝 Remembering that {domain} needs a browser")
+                with self.config_lock:
+                    self.domain_tiers[domain] = 'browser'
+                    self.tier_checked[domain] = time.time()
+            tier = 'browser'
+        
+        if use_hints and self.is_valid_price_result(result):
+            self.learn_product_hints(product, result, tier)
+        return self._finish_check(domain, result)
+    
+    def tier_for(self, domain):
+        """'browser' if the domain is remembered as needing one and that is not due a recheck, else 'http'"""
+        if self.domain_tiers.get(domain) != 'browser':
+            return 'http'
+        max_age = self.scraper_settings.get('browser_tier_recheck_hours', 24) * 3600
+        checked = self.tier_checked.get(domain)
+        if max_age and checked is not None and time.time() - checked > max_age:
+            return 'http'
+        return 'browser'
+    
+    def check_with_product_hints(self, url, hints):
+        """One fetch on the product's hinted tier and one targeted lookup; None if the hints name no lookup"""
+        # The pincode flow has to set the location first, so it never takes a fast path
+        if not any(hints.get(key) for key in PRODUCT_HINT_KEYS) or self.needs_pincode_flow(url):
+            return None
+        if hints.get('tier') == 'browser':
+            print(f"🎯 Using product hint: {describe_product_hints(hints)}")
+            return self._with_retries(lambda: self.scrape_with_product_hints(url, hints), 'Browser', url)
+        print(f"🎯 Using product hint: {describe_product_hints(hints)}")
+        return self._with_retries(lambda: self.scrape_price_universal(url, hints=hints), 'HTTP', url)
+    
+    def has_product_lookup(self, product):
+        """True if the product's hints name a targeted lookup (not just a tier)"""
+        hints = product.get('extraction') if self.scraper_settings.get('product_hints', True) else None
+        return bool(hints) and any(hints.get(key) for key in PRODUCT_HINT_KEYS)
+    
+    def learn_product_hints(self, product, result, tier):
+        """Store the hints that would reproduce this result on the product, if they changed"""
+        hints = product_hints_from_result(result, tier)
+        if product.get('extraction') != hints:
+            print(f"🎯 {product['name']}: product hint set to {describe_product_hints(hints)}")
+            with self.config_lock:
+                product['extraction'] = hints
+        return hints
+    
+    def _finish_check(self, domain, result):
+        """Update the circuit breaker from a scrape result and return its price (or None)"""
+        # Only network-level failures count against the site; "price not found" means it answered
+        if domain:
+            if result.get('transient'):
+                self.circuit_breaker.record_failure(domain)
+            else:
+                self.circuit_breaker.record_success(domain)
         
         if 'error' in result:
             print(f"❌ Error: {result['error']}")
@@ -670,6 +1338,78 @@ class UniversalPriceTracker:
             print(f"💰 Price: ₹{price}")
             return price
     
+    def scrape_in_tabs(self, urls):
+        """Load same-domain URLs as parallel tabs of one pooled driver; returns {url: result}"""
+        tabs = max(1, int(self.scraper_settings.get('tab_batching', {}).get('tabs_per_browser', 3)))
+        domain = get_domain(urls[0])
+        results = {}
+        try:
+            with self.get_driver_pool().driver() as driver:
+                home = driver.current_window_handle
+                drain_performance_log(driver)
+                for start in range(0, len(urls), tabs):
+                    opened = []
+                    for url in urls[start:start + tabs]:
+                        if start or opened:
+                            # The batch holds one in-flight slot, but every tab still takes a token
+                            self.scheduler.pace(domain)
+                        driver.switch_to.new_window('tab')
+                        self.prepare_page(driver, url, fresh_log=False)
+                        # Navigate without blocking so the tabs load side by side
+                        driver.execute_script("window.location.href = arguments[0];", url)
+                        opened.append((driver.current_window_handle, url))
+                        print(f"🗂️  Opened tab for {url}")
+                    
+                    for handle, url in opened:
+                        driver.switch_to.window(handle)
+                        try:
+                            results[url] = self.extract_with_selenium(driver, url)
+                        except Exception as e:
+                            results[url] = error_result(e, f'Tab scraping error: {str(e)}')
+                        driver.close()
+                    driver.switch_to.window(home)
+                self.report_page_network(driver)
+        except Exception as e:
+            error_msg = f'Tab batch error: {str(e)}'
+            print(f"❌ {error_msg}")
+            for url in urls:
+                results.setdefault(url, error_result(e, error_msg))
+        return results
+    
+    def check_products_in_tabs(self, products):
+        """Check a same-domain group of browser-tier products in one driver, one tab each"""
+        domain = get_domain(products[0]['url'])
+        print(f"\n🗂️  Checking {len(products)} {domain} products as tabs of one browser")
+        if not self.circuit_breaker.allow(domain):
+            print(f"🔌 Circuit open for {domain}, skipping until the cooldown passes")
+            return [None] * len(products)
+        
+        results = self.scrape_in_tabs([product['url'] for product in products])
+        prices = []
+        for product in products:
+            print(f"\n🔍 Checking: {product['name']}")
+            result = results[product['url']]
+            if not self.is_valid_price_result(result):
+                # A tab that failed gets the usual single-page path, with retries
+                result = self._with_retries(lambda: self.scrape_with_browser(product['url']), 'Browser', product['url'])
+            if self.scraper_settings.get('product_hints', True) and self.is_valid_price_result(result):
+                self.learn_product_hints(product, result, 'browser')
+            prices.append(self._finish_check(domain, result))
+        return prices
+    
+    def plan_tab_batches(self, products):
+        """Index groups of 2+ same-domain products that are known to need the browser"""
+        if not self.scraper_settings.get('tab_batching', {}).get('enabled'):
+            return []
+        groups = {}
+        for i, product in enumerate(products):
+            domain = get_domain(product['url'])
+            # The pincode flow drives the page itself, so it keeps its own driver; a product hint has its own fast path
+            if (self.tier_for(domain) == 'browser' and not self.needs_pincode_flow(product['url'])
+                    and not self.has_product_lookup(product)):
+                groups.setdefault(domain, []).append(i)
+        return [indices for indices in groups.values() if len(indices) > 1]
+    
     def send_notification(self, message: str, title: str = "Price Alert"):
         """Send notification via Pushbullet"""
         if not self.notifications_enabled:
@@ -694,7 +1434,7 @@ class UniversalPriceTracker:
                 'body': message
             }
             
-            response = requests.post(url, headers=headers, json=data)
+            response = self.http.post(url, headers=headers, json=data)
             if response.status_code == 200:
                 print(f"\n📱 Pushbullet notification sent!")
             else:
@@ -703,6 +1443,223 @@ class UniversalPriceTracker:
         except Exception as e:
             print(f"\n❌ Notification error: {e}")
     
+    def record_price(self, product, price):
+        """Store a fresh price in the product and its history, and send alerts"""
+        alerts = []
+        product['current_price'] = price
+        product['last_checked'] = datetime.now().isoformat()
+        
+        # Update price history
+        if product['name'] not in self.price_history:
+            self.price_history[product['name']] = []
+        
+        self.price_history[product['name']].append({
+            'price': price,
+            'date': datetime.now().isoformat()
+        })
+        
+        # Check for price changes
+        target_price = product.get('target_price')
+        if target_price and price <= target_price:
+            message = f"🎯 Target Price Alert!\n\n{product['name']}\nCurrent: ₹{price}\nTarget: ₹{target_price}\n\n{product['url']}"
+            self.send_notification(message, f"Target Price Reached: {product['name']}")
+            alerts.append(f"🎯 {product['name']}: ₹{price} (Target: ₹{target_price})")
+        
+        # Check for significant price drops
+        if len(self.price_history[product['name']]) > 1:
+            prev_price = self.price_history[product['name']][-2]['price']
+            if price < prev_price:
+                drop_percent = ((prev_price - price) / prev_price) * 100
+                if drop_percent >= 5:  # 5% or more drop
+                    message = f"📉 Price Drop Alert!\n\n{product['name']}\nPrevious: ₹{prev_price}\nCurrent: ₹{price}\nDrop: {drop_percent:.1f}%\n\n{product['url']}"
+                    self.send_notification(message, f"Price Drop: {product['name']}")
+                    alerts.append(f"📉 {product['name']}: ₹{price} (↓{drop_percent:.1f}%)")
+        
+        return alerts
+    
+    def run_with_watchdog(self, fn, label, seconds):
+        """Run fn under a hard deadline; on overrun kill its browsers and return (False, None)"""
+        if not seconds:
+            return True, fn()
+        
+        def on_timeout(owner):
+            pool = self.driver_pool
+            killed = pool.kill_owned_by(owner) if pool is not None else 0
+            with self.watchdog_lock:
+                self.watchdog_stats['timeouts'] += 1
+                self.watchdog_stats['killed_processes'] += killed
+            print(f"⏰ {label} exceeded {seconds}s, killed {killed} browser process(es)")
+        
+        return run_with_deadline(fn, seconds, on_timeout)
+    
+    def reap_orphans(self):
+        """Kill browser processes this run started that no live pooled driver owns"""
+        if self.workers_active:
+            return 0  # worker processes own (and clean up) the browsers under them
+        pool = self.driver_pool
+        # Taken after the reaper's scan; None while a driver is mid-start (try again after the next product)
+        reaped = self.reaper.reap(pool.live_pids if pool is not None else set)
+        if reaped:
+            with self.watchdog_lock:
+                self.watchdog_stats['reaped'] += reaped
+            print(f"🧟 Reaped {reaped} orphaned browser process(es)")
+        return reaped
+    
+    def _scheduled_check(self, product):
+        """Run check_product_price once the scheduler lets this product's domain go"""
+        domain = get_domain(product['url'])
+        deadline = self.scraper_settings.get('product_deadline_seconds', 180)
+        # The check takes a token per fetch attempt itself (see _with_retries), retries and fallback included
+        with self.scheduler.slot(domain, paced=False):
+            try:
+                finished, price = self.run_with_watchdog(
+                    lambda: self.check_product_price(product), product['name'], deadline)
+                if not finished:
+                    self.circuit_breaker.record_failure(domain)
+                return price
+            except Exception as e:
+                print(f"❌ Error checking {product['name']}: {e}")
+                return None
+    
+    def check_one_product(self, product):
+        """Check a single product outside a run (e.g. from the UI): same deadline, then the run's teardown"""
+        try:
+            return self._scheduled_check(product)
+        finally:
+            self.close_driver_pool()
+            self.reap_orphans()
+            self.page_cache.save()
+            self.location_state.save()
+            self.selector_resolver.save()
+    
+    def _scheduled_batch(self, products):
+        """Run check_products_in_tabs inside one scheduler slot for the batch's domain"""
+        domain = get_domain(products[0]['url'])
+        deadline = self.scraper_settings.get('product_deadline_seconds', 180) * len(products)
+        with self.scheduler.slot(domain):
+            try:
+                finished, prices = self.run_with_watchdog(
+                    lambda: self.check_products_in_tabs(products), f'{domain} tab batch', deadline)
+                if not finished:
+                    self.circuit_breaker.record_failure(domain)
+                    return [None] * len(products)
+                return prices
+            except Exception as e:
+                print(f"❌ Error checking tab batch: {e}")
+                return [None] * len(products)
+    
+    def fetch_prices_in_processes(self, products):
+        """Like fetch_prices, but every check runs in a worker process that owns its browsers"""
+        settings = self.scraper_settings
+        count = int(settings.get('worker_processes') or os.cpu_count() or 1)
+        count = max(1, min(count, len(products)))
+        deadline = settings.get('product_deadline_seconds', 180)
+        workers = [ProcessWorker(i + 1, self.config_file, max_rss_mb=settings.get('worker_max_rss_mb', 1500))
+                   for i in range(count)]
+        idle = queue.Queue()
+        for worker in workers:
+            idle.put(worker)
+        
+        def state():
+            # Restarted workers start from what the run has learned so far
+            with self.config_lock:
+                tiers = dict(self.domain_tiers)
+            return dict(self.scraper_settings), tiers, self.circuit_breaker.to_dict()
+        
+        def run(product):
+            domain = get_domain(product['url'])
+            # Gate here, not in the worker: each worker has its own copy of the breaker and would
+            # half-open it independently, letting one trial per worker through
+            if not self.circuit_breaker.allow(domain):
+                print(f"🔌 Circuit open for {domain}, skipping {product['name']} until the cooldown passes")
+                return None
+            # Only the slot here: the worker asks this scheduler for a token before each fetch attempt
+            with self.scheduler.slot(domain, paced=False):
+                worker = idle.get()
+                try:
+                    reply = worker.check(product, deadline, state, self.circuit_breaker.to_dict().get(domain),
+                                         self.scheduler)
+                finally:
+                    idle.put(worker)
+            if reply is None:
+                self.circuit_breaker.record_failure(domain)
+                return None
+            with self.config_lock:
+                if reply['tier']:
+                    self.domain_tiers[domain] = reply['tier']
+                    if reply.get('tier_checked'):
+                        self.tier_checked[domain] = reply['tier_checked']
+                elif domain in self.domain_tiers:
+                    # The worker found the site works over plain HTTP again
+                    self.domain_tiers.pop(domain)
+                    self.tier_checked.pop(domain, None)
+            self.extraction_hints.merge(domain, reply.get('hints'))
+            self.page_cache.merge_updates(reply.get('page_cache'))
+            self.location_state.merge_updates(reply.get('location_state'))
+            self.selector_resolver.merge_updates(reply.get('selector_stats'))
+            if reply.get('extraction'):
+                with self.config_lock:
+                    product['extraction'] = reply['extraction']
+            self.circuit_breaker.merge(domain, reply['breaker'])
+            return reply['price']
+        
+        print(f"\n🧩 Checking {len(products)} products in {count} worker process(es)")
+        order = DomainScheduler.interleave(range(len(products)), lambda i: get_domain(products[i]['url']))
+        self.workers_active = True
+        try:
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                futures = {i: executor.submit(run, products[i]) for i in order}
+                for i in range(len(products)):
+                    yield futures[i].result()
+        finally:
+            for worker in workers:
+                worker.stop()
+            self.workers_active = False
+            self.worker_stats = {
+                key: sum(worker.stats[key] for worker in workers) for key in workers[0].stats
+            }
+    
+    def fetch_prices(self, products):
+        """Yield the price (or None) for each product, in order, checking them concurrently"""
+        if self.scraper_settings.get('execution_mode') == 'processes' and products:
+            yield from self.fetch_prices_in_processes(products)
+            return
+        
+        max_workers = max(1, int(self.scraper_settings.get('max_workers', 1)))
+        batches = self.plan_tab_batches(products)
+        batch_of = {i: batch for batch in batches for i in batch}
+        
+        if max_workers == 1 or len(products) < 2:
+            batch_prices = {}
+            for i, product in enumerate(products):
+                if i not in batch_of:
+                    yield self._scheduled_check(product)
+                    continue
+                batch = batch_of[i]
+                if i == batch[0]:
+                    prices = self._scheduled_batch([products[j] for j in batch])
+                    batch_prices.update(zip(batch, prices))
+                yield batch_prices.pop(i)
+            return
+        
+        print(f"\n⚙️  Checking {len(products)} products with {max_workers} workers")
+        # Submit round-robin across domains so the pool stays busy, but yield in config order
+        order = DomainScheduler.interleave(range(len(products)), lambda i: get_domain(products[i]['url']))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for i in order:
+                if i not in batch_of:
+                    futures[i] = executor.submit(self._scheduled_check, products[i])
+                elif i == batch_of[i][0]:
+                    batch_future = executor.submit(self._scheduled_batch, [products[j] for j in batch_of[i]])
+                    futures.update({j: (batch_future, position) for position, j in enumerate(batch_of[i])})
+            for i in range(len(products)):
+                if i in batch_of:
+                    batch_future, position = futures[i]
+                    yield batch_future.result()[position]
+                else:
+                    yield futures[i].result()
+    
     def check_all_prices(self):
         """Check prices for all products"""
         print(f"\n{'='*70}")
@@ -721,41 +1678,24 @@ class UniversalPriceTracker:
         
         price_changes = []
         
-        for product in self.products:
-            price = self.check_product_price(product)
-            
-            if price:
-                product['current_price'] = price
-                product['last_checked'] = datetime.now().isoformat()
-                
-                # Update price history
-                if product['name'] not in self.price_history:
-                    self.price_history[product['name']] = []
-                
-                self.price_history[product['name']].append({
-                    'price': price,
-                    'date': datetime.now().isoformat()
-                })
-                
-                # Check for price changes
-                target_price = product.get('target_price')
-                if target_price and price <= target_price:
-                    message = f"🎯 Target Price Alert!\n\n{product['name']}\nCurrent: ₹{price}\nTarget: ₹{target_price}\n\n{product['url']}"
-                    self.send_notification(message, f"Target Price Reached: {product['name']}")
-                    price_changes.append(f"🎯 {product['name']}: ₹{price} (Target: ₹{target_price})")
-                
-                # Check for significant price drops
-                if len(self.price_history[product['name']]) > 1:
-                    prev_price = self.price_history[product['name']][-2]['price']
-                    if price < prev_price:
-                        drop_percent = ((prev_price - price) / prev_price) * 100
-                        if drop_percent >= 5:  # 5% or more drop
-                            message = f"📉 Price Drop Alert!\n\n{product['name']}\nPrevious: ₹{prev_price}\nCurrent: ₹{price}\nDrop: {drop_percent:.1f}%\n\n{product['url']}"
-                            self.send_notification(message, f"Price Drop: {product['name']}")
-                            price_changes.append(f"📉 {product['name']}: ₹{price} (↓{drop_percent:.1f}%)")
+        try:
+            # Prices come back in product order, so history and alerts stay deterministic
+            for product, price in zip(self.products, self.fetch_prices(self.products)):
+                if price:
+                    price_changes.extend(self.record_price(product, price))
+                    # Save as we go, so a killed run keeps the prices it already collected
+                    self.save_config()
+                self.reap_orphans()
+        finally:
+            # Always tear down the browsers started for this run, and anything they left behind
+            self.close_driver_pool()
+            self.reap_orphans()
         
         # Save updated configuration
         self.save_config()
+        self.page_cache.save()
+        self.location_state.save()
+        self.selector_resolver.save()
         
         # Summary
         print(f"\n{'='*70}")
@@ -765,6 +1705,61 @@ class UniversalPriceTracker:
                 print(f"   {change}")
         else:
             print(f"✅ No significant price changes detected")
+        if self.page_timings:
+            ready = [t for t in self.page_timings if t['ready']]
+            average = sum(t['elapsed'] for t in self.page_timings) / len(self.page_timings)
+            print(f"⏱️  Browser pages: {len(self.page_timings)} "
+                  f"(avg wait {average:.2f}s, {len(ready)} ready before timeout)")
+        totals = self.network_totals
+        if totals['pages']:
+            print(f"🚫 Request blocking: {totals['blocked_requests']}/{totals['requests']} requests blocked "
+                  f"over {totals['pages']} page(s), {totals['transferred_bytes'] / 1048576:.1f} MB transferred")
+        open_domains = self.circuit_breaker.open_domains()
+        if open_domains:
+            print(f"🔌 Circuit open (skipped until cooldown): {', '.join(open_domains)}")
+        for domain, waits in self.scheduler.report().items():
+            print(f"🚦 {domain}: {waits['requests']} check(s), {waits['paced']} paced request(s), "
+                  f"queued avg {waits['avg_wait']:.1f}s / max {waits['max_wait']:.1f}s")
+        cache_stats = self.page_cache.stats
+        if self.method_stats:
+            pages = sum(self.method_stats.values())
+            shares = ', '.join(f"{method} {count / pages:.0%}" for method, count in
+                               sorted(self.method_stats.items(), key=lambda item: -item[1]))
+            print(f"🧭 Extraction methods over {pages} page(s): {shares}")
+        streamed = self.stream_totals
+        if streamed['pages']:
+            unknown = f" ({streamed['unknown_total']} of unknown size)" if streamed['unknown_total'] else ''
+            print(f"⚡ Streaming fetch: {streamed['early_exits']}/{streamed['pages']} page(s) stopped early, "
+                  f"read {streamed['bytes_read'] / 1024:.0f} KB of {streamed['bytes_total'] / 1024:.0f} KB{unknown}")
+        if cache_stats['hits'] or cache_stats['misses']:
+            print(f"📦 Page cache: {cache_stats['hits']} not-modified hit(s), {cache_stats['misses']} download(s) "
+                  f"({cache_stats['changed']} changed), {cache_stats['evictions']} eviction(s)")
+        if self.worker_stats:
+            stats = self.worker_stats
+            print(f"🧩 Worker processes: {stats['starts']} start(s) for {stats['tasks']} check(s), "
+                  f"{stats['crashes']} crash(es), {stats['memory_kills']} memory restart(s), {stats['timeouts']} timeout(s)")
+        watchdog = self.watchdog_stats
+        if watchdog['timeouts'] or watchdog['reaped']:
+            print(f"⏰ Watchdog: {watchdog['timeouts']} timeout(s), {watchdog['killed_processes']} process(es) killed, "
+                  f"{watchdog['reaped']} orphan(s) reaped")
+        location_stats = self.location_state.stats
+        if location_stats['reused'] or location_stats['saved']:
+            print(f"📍 Location state: reused {location_stats['reused']}, set up {location_stats['saved']}, "
+                  f"{location_stats['expired']} expired")
+        for domain, hint in sorted(self.extraction_hints.report().items()):
+            tries = hint['hits'] + hint['misses']
+            if tries:
+                print(f"🧠 {domain}: hint {hint['hint']} hit {hint['hit_rate']:.0%} of {tries} page(s), "
+                      f"relearned {hint['relearned']}x")
+        hinted = self.product_hint_stats
+        if hinted['hits'] or hinted['misses']:
+            print(f"🎯 Product hints: {hinted['hits']} fast-path hit(s), {hinted['misses']} miss(es) rediscovered")
+        for group, cascade in sorted(self.selector_resolver.report().items()):
+            print(f"🎯 {group}: {cascade['hit_rate']:.0%} of {cascade['hits'] + cascade['misses']} lookup(s) resolved, "
+                  f"leader {cascade['top']}")
+        for host, counts in self.http.stats().items():
+            print(f"🔌 {host}: {counts['requests']} request(s) over {counts['connections']} connection(s), "
+                  f"{counts['reused']} reused")
         print(f"{'='*70}\n")
 
 def main():
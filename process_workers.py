@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Process-isolated scrape workers
+Each worker process owns its tracker and browsers; a crash or memory blowup only costs that worker
+"""
+
+import multiprocessing
+import time
+
+from product_watchdog import PSUTIL_AVAILABLE, kill_pids, process_tree
+from request_scheduler import DomainScheduler
+
+if PSUTIL_AVAILABLE:
+    import psutil
+
+
+def tree_rss_mb(pid):
+    """Resident memory of a process and all its children (MB), or None without psutil"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    total = 0
+    for child_pid in process_tree(pid):
+        try:
+            total += psutil.Process(child_pid).memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class ParentPacedScheduler(DomainScheduler):
+    """A worker's scheduler: tokens and Retry-After go through the parent's, so limits hold across workers"""
+
+    def __init__(self, conn):
+        super().__init__()
+        self.conn = conn
+
+    def pace(self, domain):
+        # The parent answers once its bucket for the domain hands out a token
+        self.conn.send({'pace': domain})
+        self.conn.recv()
+
+    def defer(self, domain, seconds):
+        if seconds:
+            self.conn.send({'defer': domain, 'seconds': seconds})
+
+
+def worker_main(conn, config_file, scraper_settings, domain_tiers, breaker_state):
+    """Worker loop: receive a product, check it, send back the price and what the check learned"""
+    # Imported here so the parent can import this module without pulling in the tracker
+    from price_tracker_universal import UniversalPriceTracker, get_domain
+
+    tracker = UniversalPriceTracker(config_file=config_file)
+    tracker.scraper_settings.update(scraper_settings)
+    tracker.domain_tiers.update(domain_tiers)
+    tracker.circuit_breaker.state.update(breaker_state)
+    tracker.scheduler = ParentPacedScheduler(conn)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            product, breaker_entry = message
+            domain = get_domain(product['url'])
+            # The parent's breaker already let this check through; start from its view of the domain
+            tracker.circuit_breaker.merge(domain, breaker_entry)
+            try:
+                price = tracker.check_product_price(product)
+            except Exception as e:
+                print(f"❌ Error checking {product['name']}: {e}")
+                price = None
+            conn.send({
+                'price': price,
+                'tier': tracker.domain_tiers.get(domain),
+                'tier_checked': tracker.tier_checked.get(domain),
+                'breaker': tracker.circuit_breaker.to_dict().get(domain),
+                'hints': tracker.extraction_hints.get(domain),
+                'extraction': product.get('extraction'),
+                # The parent owns these files; it merges the changes and saves once at the end of the run
+                'page_cache': tracker.page_cache.take_updates(),
+                'location_state': tracker.location_state.take_updates(),
+                'selector_stats': tracker.selector_resolver.take_updates(),
+            })
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        tracker.close_driver_pool()
+
+
+class ProcessWorker:
+    """One worker process plus the pipe the parent talks to it over; restarted on crash or bloat"""
+
+    def __init__(self, index, config_file, max_rss_mb=1500, context=None, target=worker_main):
+        self.index = index
+        self.config_file = config_file
+        self.max_rss_mb = max_rss_mb
+        self.target = target
+        self.context = context or multiprocessing.get_context('spawn')
+        self.process = None
+        self.conn = None
+        self.stats = {'tasks': 0, 'starts': 0, 'crashes': 0, 'memory_kills': 0, 'timeouts': 0}
+
+    def start(self, scraper_settings, domain_tiers, breaker_state):
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=self.target, name=f'scrape-worker-{self.index}', daemon=True,
+            args=(child_conn, self.config_file, scraper_settings, domain_tiers, breaker_state),
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.stats['starts'] += 1
+
+    def kill(self):
+        """Kill the worker and every browser under it"""
+        if self.process is not None and self.process.is_alive():
+            kill_pids(process_tree(self.process.pid))
+            self.process.join(5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def stop(self):
+        """Ask the worker to finish cleanly, killing it if it does not"""
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+            self.process.join(30)
+        except (OSError, EOFError):
+            pass
+        self.kill()
+
+    def check(self, product, deadline, state, breaker_entry=None, scheduler=None):
+        """Run one product in the worker; returns the reply dict, or None if the worker had to die
+
+        `state` is a callable giving (scraper_settings, domain_tiers, breaker_state) for restarts;
+        `breaker_entry` is the parent's current circuit breaker entry for the product's domain;
+        `scheduler` is the parent's DomainScheduler, which paces every request the worker makes.
+        """
+        if self.process is None or not self.process.is_alive():
+            if self.process is not None:
+                self.stats['crashes'] += 1  # died between products
+            self.kill()
+            self.start(*state())
+
+        self.stats['tasks'] += 1
+        try:
+            self.conn.send((product, breaker_entry))
+        except (OSError, EOFError):
+            self.stats['crashes'] += 1
+            self.kill()
+            return None
+
+        started = time.time()
+        reply = None
+        while True:
+            try:
+                if self.conn.poll(0.5):
+                    reply = self.conn.recv()
+                    if 'pace' in reply:
+                        if scheduler is not None:
+                            scheduler.pace(reply['pace'])
+                        self.conn.send(True)
+                        continue
+                    if 'defer' in reply:
+                        if scheduler is not None:
+                            scheduler.defer(reply['defer'], reply['seconds'])
+                        continue
+                    break
+            except (OSError, EOFError):
+                print(f"💥 Worker {self.index} crashed while checking {product['name']}")
+                self.stats['crashes'] += 1
+                self.kill()
+                return None
+            if not self.process.is_alive():
+                print(f"💥 Worker {self.index} died while checking {product['name']}")
+                self.stats['crashes'] += 1
+                self.kill()
+                return None
+            if deadline and time.time() - started > deadline:
+                print(f"⏰ Worker {self.index} exceeded {deadline}s on {product['name']}, killing it")
+                self.stats['timeouts'] += 1
+                self.kill()
+                return None
+            rss = tree_rss_mb(self.process.pid)
+            if self.max_rss_mb and rss is not None and rss > 2 * self.max_rss_mb:
+                print(f"🧠 Worker {self.index} hit {rss:.0f} MB on {product['name']}, killing it")
+                self.stats['memory_kills'] += 1
+                self.kill()
+                return None
+
+        # Over the soft limit between products: restart before the next one
+        rss = tree_rss_mb(self.process.pid)
+        if self.max_rss_mb and rss is not None and rss > self.max_rss_mb:
+            print(f"♻️  Worker {self.index} at {rss:.0f} MB, restarting it")
+            self.stats['memory_kills'] += 1
+            self.stop()
+        return reply
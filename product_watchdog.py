@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Per-product hard deadlines and cleanup of orphaned Chrome processes
+A check that overruns its deadline has its browsers killed, so a hung driver.get() cannot stall the run
+"""
+
+import os
+import signal
+import threading
+
+# Make psutil optional (process-tree kills fall back to the chromedriver pid only)
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'chromedriver', 'headless_shell')
+
+
+def process_tree(pid):
+    """pid plus all of its descendants (just [pid] without psutil)"""
+    if not PSUTIL_AVAILABLE:
+        return [pid]
+    try:
+        root = psutil.Process(pid)
+        return [pid] + [child.pid for child in root.children(recursive=True)]
+    except psutil.Error:
+        return []
+
+
+def kill_pids(pids):
+    """SIGKILL each pid; returns how many were still alive"""
+    killed = 0
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            continue
+    return killed
+
+
+def is_browser_process(process):
+    try:
+        name = process.name().lower()
+    except psutil.Error:
+        return False
+    return any(marker in name for marker in BROWSER_PROCESS_NAMES)
+
+
+class ProcessReaper:
+    """Remembers every browser pid this run started and kills the ones no live driver owns"""
+
+    def __init__(self):
+        self.known = set()
+        self._lock = threading.Lock()
+
+    def remember(self, pids):
+        with self._lock:
+            self.known.update(pids)
+
+    def reap(self, live_pids):
+        """Kill remembered or descendant browser processes outside live_pids; returns the count
+
+        `live_pids` may be a callable returning the set (or None to skip this pass). It is called
+        after the candidate scan, so a renderer a live driver starts in between counts as live.
+        """
+        if not PSUTIL_AVAILABLE:
+            return 0
+        candidates = set()
+        with self._lock:
+            candidates.update(self.known)
+        try:
+            for child in psutil.Process().children(recursive=True):
+                if is_browser_process(child):
+                    candidates.add(child.pid)
+        except psutil.Error:
+            pass
+        if callable(live_pids):
+            live_pids = live_pids()
+            if live_pids is None:
+                return 0
+
+        orphans = []
+        for pid in candidates - set(live_pids):
+            try:
+                if is_browser_process(psutil.Process(pid)):
+                    orphans.append(pid)
+            except psutil.Error:
+                continue
+        with self._lock:
+            self.known -= candidates - set(live_pids)
+        return kill_pids(orphans)
+
+
+def run_with_deadline(fn, seconds, on_timeout):
+    """Run fn() in a worker thread; if it overruns, call on_timeout(thread_ident) and give up on it
+
+    Returns (finished, value). on_timeout should kill whatever the call is blocked on so the
+    abandoned thread unwinds on its own shortly after.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome['value'] = fn()
+        except BaseException as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=target, daemon=True, name='product-check')
+    worker.start()
+    worker.join(seconds)
+    if worker.is_alive():
+        on_timeout(worker.ident)
+        # Give the killed driver a moment to error out before moving on
+        worker.join(5)
+        return False, None
+    if 'error' in outcome:
+        raise outcome['error']
+    return True, outcome.get('value')
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Per-domain request scheduler
+Token-bucket pacing plus a max-in-flight cap per retailer, with Retry-After support
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class TokenBucket:
+    """Classic token bucket; reserve() hands out the wait before the next request may start"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.blocked_until - now)
+
+    def block_for(self, seconds):
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class DomainScheduler:
+    """Paces requests per domain and reports how long each domain's work queued"""
+
+    def __init__(self, limits=None):
+        # limits: {'default': {'rps': 1.0, 'max_in_flight': 2}, 'bigbasket.com': {...}}
+        self.limits = limits or {}
+        self._buckets = {}
+        self._slots = {}
+        self._waits = {}
+        self._token_waits = {}  # seconds each pace() call slept for a token
+        self._lock = threading.Lock()
+
+    def _limit_for(self, domain):
+        limit = dict(self.limits.get('default', {'rps': 1.0, 'max_in_flight': 2}))
+        for site, site_limit in self.limits.items():
+            if site != 'default' and (domain == site or domain.endswith('.' + site)):
+                limit.update(site_limit)
+                break
+        return limit
+
+    def _state_for(self, domain):
+        with self._lock:
+            if domain not in self._buckets:
+                limit = self._limit_for(domain)
+                rps = float(limit.get('rps', 1.0))
+                self._buckets[domain] = TokenBucket(rps, capacity=max(1.0, rps)) if rps > 0 else None
+                self._slots[domain] = threading.BoundedSemaphore(max(1, int(limit.get('max_in_flight', 2))))
+                self._waits[domain] = []
+                self._token_waits[domain] = []
+            return self._buckets[domain], self._slots[domain]
+
+    @contextmanager
+    def slot(self, domain, paced=True):
+        """Block until the domain has a free in-flight slot and a token, then run the body
+
+        With paced=False only the slot is taken; the body calls pace() before each request it makes.
+        """
+        bucket, slots = self._state_for(domain)
+        queued = time.monotonic()
+        slots.acquire()
+        try:
+            if paced and bucket is not None:
+                wait = bucket.reserve()
+                if wait > 0:
+                    time.sleep(wait)
+            with self._lock:
+                self._waits[domain].append(time.monotonic() - queued)
+            yield
+        finally:
+            slots.release()
+
+    def pace(self, domain):
+        """Wait for the domain's next token without taking another in-flight slot"""
+        bucket, _ = self._state_for(domain)
+        if bucket is not None:
+            wait = bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            with self._lock:
+                self._token_waits[domain].append(max(wait, 0.0))
+
+    def defer(self, domain, seconds):
+        """Honour Retry-After: no new request to the domain for `seconds`"""
+        bucket, _ = self._state_for(domain)
+        if bucket is not None and seconds:
+            print(f"⏳ {domain} asked us to back off for {seconds:.0f}s")
+            bucket.block_for(seconds)
+
+    @staticmethod
+    def interleave(items, key):
+        """Round-robin items across domains so one retailer never hogs the pipeline"""
+        queues = OrderedDict()
+        for item in items:
+            queues.setdefault(key(item), []).append(item)
+        ordered = []
+        while queues:
+            for domain in list(queues):
+                ordered.append(queues[domain].pop(0))
+                if not queues[domain]:
+                    del queues[domain]
+        return ordered
+
+    def report(self):
+        """Queueing delay per domain: slot entries and paced requests, with average and max seconds
+
+        'requests' counts slot() entries (checks) and 'paced' counts pace() calls (fetch attempts);
+        the averages and maxima cover both kinds of wait.
+        """
+        with self._lock:
+            report = {}
+            for domain, slot_waits in self._waits.items():
+                waits = slot_waits + self._token_waits[domain]
+                if waits:
+                    report[domain] = {
+                        'requests': len(slot_waits),
+                        'paced': len(self._token_waits[domain]),
+                        'avg_wait': sum(waits) / len(waits),
+                        'max_wait': max(waits),
+                    }
+            return report
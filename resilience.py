@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Fetch resilience: jittered exponential retries and a per-domain circuit breaker
+Scrape results stay plain dicts; a result with 'transient': True is worth retrying
+"""
+
+import random
+import threading
+import time
+
+import requests
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from request_scheduler import parse_retry_after
+
+TRANSIENT_STATUS_CODES = (429, 500, 502, 503, 504)
+TRANSIENT_BROWSER_ERRORS = ('net::ERR_CONNECTION', 'net::ERR_TIMED_OUT', 'net::ERR_NAME_NOT_RESOLVED',
+                            'net::ERR_INTERNET_DISCONNECTED', 'timeout')
+
+
+def is_transient(exc):
+    """True for timeouts, dropped connections, 5xx and 429 - the errors a retry can fix"""
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError, TimeoutException)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code in TRANSIENT_STATUS_CODES
+    if isinstance(exc, WebDriverException):
+        message = str(exc)
+        return any(marker in message for marker in TRANSIENT_BROWSER_ERRORS)
+    return False
+
+
+def error_result(exc, message=None):
+    """Build the usual error dict, tagging transient failures for the retry layer"""
+    result = {'error': message or str(exc), 'available': False}
+    if is_transient(exc):
+        result['transient'] = True
+        response = getattr(exc, 'response', None)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                result['retry_after'] = retry_after
+    return result
+
+
+def retry_result(fetch, attempts=3, base_delay=1.0, max_delay=20.0, label='fetch'):
+    """Call fetch() until it returns a non-transient result or attempts run out"""
+    result = fetch()
+    for attempt in range(1, attempts):
+        if not result.get('transient'):
+            break
+        # Full jitter, but never sooner than the server's Retry-After
+        delay = random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+        delay = max(delay, min(result.get('retry_after') or 0, max_delay))
+        print(f"🔁 {label}: transient error ({result['error']}), retry {attempt}/{attempts - 1} in {delay:.1f}s")
+        time.sleep(delay)
+        result = fetch()
+    return result
+
+
+class CircuitBreaker:
+    """Per-domain breaker: opens after repeated transient failures, half-opens after a cooldown"""
+
+    def __init__(self, failure_threshold=3, cooldown_seconds=1800, state=None, probe_timeout_seconds=600):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        # domain -> {'failures': int, 'opened_at': float or None}
+        self.state = dict(state or {})
+        # domain -> start time of the half-open trial in flight; in memory only, never saved
+        self.probes = {}
+        self._lock = threading.Lock()
+
+    def allow(self, domain):
+        """False while the domain's breaker is open; lets one trial at a time through after the cooldown"""
+        with self._lock:
+            entry = self.state.get(domain)
+            if not entry:
+                return True
+            now = time.time()
+            if entry.get('opened_at'):
+                if now - entry['opened_at'] < self.cooldown_seconds:
+                    return False
+                # Half-open: one failure re-opens immediately
+                entry['opened_at'] = None
+                entry['failures'] = self.failure_threshold - 1
+                self.probes[domain] = now
+                return True
+            started = self.probes.get(domain)
+            if started is None:
+                return True
+            if now - started >= self.probe_timeout_seconds:
+                # The trial never reported back (it crashed); let the next check be the trial
+                self.probes[domain] = now
+                return True
+            # Other checks wait for the trial's verdict instead of piling onto a site that may be down
+            return False
+
+    def record_success(self, domain):
+        with self._lock:
+            self.state.pop(domain, None)
+            self.probes.pop(domain, None)
+
+    def record_failure(self, domain):
+        with self._lock:
+            self.probes.pop(domain, None)
+            entry = self.state.setdefault(domain, {'failures': 0, 'opened_at': None})
+            entry['failures'] += 1
+            if entry['failures'] >= self.failure_threshold and not entry.get('opened_at'):
+                entry['opened_at'] = time.time()
+                print(f"🔌 Circuit opened for {domain} after {entry['failures']} failures")
+
+    def merge(self, domain, entry):
+        """Adopt a domain's state reported by a worker process (None means healthy)"""
+        with self._lock:
+            self.probes.pop(domain, None)
+            if entry:
+                self.state[domain] = dict(entry)
+            else:
+                self.state.pop(domain, None)
+
+    def open_domains(self):
+        with self._lock:
+            return [domain for domain, entry in self.state.items() if entry.get('opened_at')]
+
+    def to_dict(self):
+        """Breaker state for the config file"""
+        with self._lock:
+            return {domain: dict(entry) for domain, entry in self.state.items()}
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Single-poll-loop resolution of alternative XPath locators
+One execute_script per poll checks every alternative, so a cascade costs one deadline instead of one per selector
+"""
+
+import json
+import os
+import threading
+import time
+
+# Returns [index, element] for the first XPath (in the given order) with a usable match, else null
+RESOLVE_XPATHS_JS = """
+var xpaths = arguments[0], clickable = arguments[1];
+function usable(node) {
+    if (!clickable) { return true; }
+    if (node.disabled) { return false; }
+    var rect = node.getBoundingClientRect(), style = window.getComputedStyle(node);
+    return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+}
+for (var i = 0; i < xpaths.length; i++) {
+    var snapshot;
+    try {
+        snapshot = document.evaluate(xpaths[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) { continue; }
+    for (var j = 0; j < snapshot.snapshotLength; j++) {
+        if (usable(snapshot.snapshotItem(j))) { return [i, snapshot.snapshotItem(j)]; }
+    }
+}
+return null;
+"""
+
+
+class SelectorResolver:
+    """Resolves locator cascades within one deadline and re-sorts them by past hits"""
+
+    def __init__(self, path='.cache/selector_hits.json', poll_interval=0.2):
+        self.path = path
+        self.poll_interval = poll_interval
+        # group -> {xpath: hits}; a group is one cascade, e.g. 'bigbasket.location'
+        self.hits = {}
+        self.misses = {}
+        # Counts since the last take_updates(), for a worker process to send home
+        self._new_hits = {}
+        self._new_misses = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load hit counts from disk"""
+        try:
+            if self.path and os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.hits = data.get('hits', {})
+                self.misses = data.get('misses', {})
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable selector stats: {e}")
+
+    def save(self):
+        """Write hit counts to disk atomically"""
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                data = {'hits': self.hits, 'misses': self.misses}
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️  Could not save selector stats: {e}")
+
+    def ordered(self, group, xpaths):
+        """The cascade with the most frequent winners first; ties keep their written order"""
+        with self._lock:
+            counts = dict(self.hits.get(group, {}))
+        return sorted(xpaths, key=lambda xpath: -counts.get(xpath, 0))
+
+    def resolve(self, driver, group, xpaths, timeout=5, clickable=False):
+        """First matching alternative by priority within one deadline: (element, xpath) or (None, None)"""
+        ordered = self.ordered(group, xpaths)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                found = driver.execute_script(RESOLVE_XPATHS_JS, ordered, clickable)
+            except Exception:
+                found = None
+            if found:
+                index, element = found
+                with self._lock:
+                    for counts in (self.hits, self._new_hits):
+                        group_hits = counts.setdefault(group, {})
+                        group_hits[ordered[index]] = group_hits.get(ordered[index], 0) + 1
+                return element, ordered[index]
+            if time.monotonic() >= deadline:
+                with self._lock:
+                    for misses in (self.misses, self._new_misses):
+                        misses[group] = misses.get(group, 0) + 1
+                return None, None
+            time.sleep(self.poll_interval)
+
+    def click(self, driver, group, xpaths, timeout=5):
+        """Resolve a clickable alternative and click it; returns the XPath that matched or None"""
+        element, xpath = self.resolve(driver, group, xpaths, timeout=timeout, clickable=True)
+        if element is None:
+            return None
+        try:
+            element.click()
+        except Exception:
+            # Overlays intercept native clicks on some layouts; a DOM click still fires the handler
+            driver.execute_script("arguments[0].click();", element)
+        return xpath
+
+    def take_updates(self):
+        """Hits and misses counted since the last call"""
+        with self._lock:
+            updates = {'hits': self._new_hits, 'misses': self._new_misses}
+            self._new_hits, self._new_misses = {}, {}
+        return updates
+
+    def merge_updates(self, updates):
+        """Add hits and misses counted by a worker process"""
+        if not updates:
+            return
+        with self._lock:
+            for group, counts in updates['hits'].items():
+                group_hits = self.hits.setdefault(group, {})
+                for xpath, count in counts.items():
+                    group_hits[xpath] = group_hits.get(xpath, 0) + count
+            for group, count in updates['misses'].items():
+                self.misses[group] = self.misses.get(group, 0) + count
+
+    def report(self):
+        """Hit rate per cascade and its current leading alternative"""
+        with self._lock:
+            report = {}
+            for group in set(self.hits) | set(self.misses):
+                counts = self.hits.get(group, {})
+                hits = sum(counts.values())
+                total = hits + self.misses.get(group, 0)
+                report[group] = {
+                    'hits': hits,
+                    'misses': self.misses.get(group, 0),
+                    'hit_rate': hits / total if total else 0.0,
+                    'top': max(counts, key=counts.get) if counts else None,
+                }
+            return report
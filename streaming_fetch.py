@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Head-first streaming reads of product pages
+Meta tags and JSON-LD are parsed as the body arrives, so the download can stop once the price is known
+"""
+
+import codecs
+from html.parser import HTMLParser
+
+
+class HeadScanner(HTMLParser):
+    """Incremental parser that keeps only <meta> attributes and JSON-LD script bodies"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = []
+        self.jsonld = []
+        self.head_closed = False
+        self._script = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            self.meta.append(dict(attrs))
+        elif tag == 'script' and dict(attrs).get('type') == 'application/ld+json':
+            self._script = []
+        elif tag == 'body':
+            self.head_closed = True
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+        elif tag == 'script' and self._script is not None:
+            self.jsonld.append(''.join(self._script))
+            self._script = None
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script.append(data)
+
+    def meta_content(self, attr, value):
+        """content= of every <meta attr="value"> seen so far, in document order"""
+        return [tag.get('content') or '' for tag in self.meta if tag.get(attr) == value]
+
+
+def response_charset(response):
+    """Charset from the Content-Type header; retail pages without one are UTF-8 in practice"""
+    content_type = response.headers.get('Content-Type', '')
+    for part in content_type.split(';'):
+        key, _, value = part.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            try:
+                codecs.lookup(value.strip('"\''))
+                return value.strip('"\'')
+            except LookupError:
+                break
+    return 'utf-8'
+
+
+def content_length(response):
+    try:
+        return int(response.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return None
+
+
+def wire_bytes(response):
+    """Bytes taken off the socket so far (before decompression)"""
+    try:
+        return response.raw.tell()
+    except Exception:
+        return None
+
+
+def scan_response(response, find_price, max_scan_bytes=65536, drain_bytes=16384, chunk_size=8192):
+    """Read a streamed response until find_price(scanner) returns a result, once <head> is complete
+
+    Returns (result, body, stats). On an early exit body is None and the connection is dropped,
+    unless at most drain_bytes remain, which are read so the connection can be reused. Otherwise
+    result is None and body holds the whole page for full-document extraction.
+    """
+    scanner = HeadScanner()
+    decoder = codecs.getincrementaldecoder(response_charset(response))(errors='replace')
+    chunks = []
+    read = 0
+    scanning = True
+    result = None
+    stream = response.iter_content(chunk_size=chunk_size)
+
+    for chunk in stream:
+        chunks.append(chunk)
+        read += len(chunk)
+        if not scanning:
+            continue
+        scanner.feed(decoder.decode(chunk))
+        if scanner.head_closed:
+            result = find_price(scanner)
+            if result:
+                break
+        if read >= max_scan_bytes:
+            scanning = False
+
+    total = content_length(response)
+    if result:
+        remaining = total - (wire_bytes(response) or 0) if total is not None else None
+        if remaining is not None and remaining <= drain_bytes:
+            for chunk in stream:
+                read += len(chunk)
+        else:
+            response.close()
+        stats = {'bytes_read': wire_bytes(response) or read, 'bytes_total': total, 'early_exit': True}
+        return result, None, stats
+
+    body = b''.join(chunks)
+    stats = {'bytes_read': wire_bytes(response) or read, 'bytes_total': total or wire_bytes(response) or read,
+             'early_exit': False}
+    return None, body, stats
@@ -19,6 +19,7 @@ try:
 except ImportError:
     PLOTLY_AVAILABLE = False
 
+from extraction_hints import describe_product_hints
 from price_tracker_universal import UniversalPriceTracker
 
 # --- HELPER FUNCTIONS ---
@@ -207,6 +208,15 @@ def main():
     elif page == "➕ Add Product":
         st.markdown('<h1 class="main-header">➕ Add Product</h1>', unsafe_allow_html=True)
         
+        # Outcome of the last add, kept across the rerun that refreshes the product list
+        added = st.session_state.pop('added_product', None)
+        if added:
+            st.success(f"✅ Added {added['name']}")
+            if added['price'] and added['hint']:
+                st.caption(f"Price ₹{added['price']}, found via {added['hint']}")
+            elif not added['price']:
+                st.warning("Could not get a price yet; it will be checked again on the next run")
+        
         with st.form("add_product"):
             name = st.text_input("Product Name")
             url = st.text_input("Product URL")
@@ -221,8 +231,19 @@ def main():
                         'last_checked': None
                     }
                     tracker.products.append(product)
+                    # The first check finds the price and stores the product's extraction hints
+                    with st.spinner(f"Checking {name}..."):
+                        price = tracker.check_one_product(product)
+                    if price:
+                        product['current_price'] = price
+                        product['last_checked'] = datetime.now().isoformat()
+                        tracker.price_history.setdefault(name, []).append({
+                            'price': price,
+                            'date': datetime.now().isoformat()
+                        })
                     tracker.save_config()
-                    st.success(f"✅ Added {name}")
+                    hint = describe_product_hints(product['extraction']) if product.get('extraction') else None
+                    st.session_state['added_product'] = {'name': name, 'price': price, 'hint': hint}
                     st.rerun()
                 else:
                     st.error("Please fill in all fields")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Schema.org Product/Offer extraction from JSON-LD
+Handles @graph wrappers, nested and multiple offers, AggregateOffer, priceSpecification and several Products
+"""
+
+import json
+import re
+
+IN_STOCK = {'InStock', 'LimitedAvailability', 'OnlineOnly', 'InStoreOnly', 'PreOrder', 'PreSale', 'BackOrder'}
+OUT_OF_STOCK = {'OutOfStock', 'SoldOut', 'Discontinued'}
+# Offer price specifications that are not what the customer pays
+NON_SELLING_PRICE_TYPES = ('StrikethroughPrice', 'ListPrice', 'MSRP', 'InvoicePrice', 'MinimumAdvertisedPrice')
+CURRENCY_SYMBOLS = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£', 'JPY': '¥'}
+
+
+def parse_price(value):
+    """Positive float from a JSON-LD price value ("1,299.00", 1299, "₹1,299"), else None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value > 0 else None
+    if isinstance(value, str):
+        match = re.search(r'\d+(?:\.\d+)?', value.replace(',', ''))
+        if match and float(match.group()) > 0:
+            return float(match.group())
+    return None
+
+
+def types_of(node):
+    """Schema.org types of a node, without the schema.org/ prefix"""
+    types = node.get('@type', [])
+    if isinstance(types, str):
+        types = [types]
+    return {str(t).rsplit('/', 1)[-1] for t in types}
+
+
+def load_jsonld(raw):
+    """Parsed JSON-LD script body, or None if it is not valid JSON"""
+    if not raw:
+        return None
+    try:
+        # strict=False tolerates the raw newlines/tabs some sites leave inside strings
+        return json.loads(raw, strict=False)
+    except ValueError:
+        return None
+
+
+def iter_nodes(data):
+    """Every dict in a JSON-LD document (through @graph, lists and nested values), breadth first"""
+    queue = [data]
+    while queue:
+        node = queue.pop(0)
+        if isinstance(node, list):
+            queue.extend(node)
+        elif isinstance(node, dict):
+            yield node
+            queue.extend(value for value in node.values() if isinstance(value, (dict, list)))
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _availability(offer):
+    value = offer.get('availability')
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not isinstance(value, str) or not value:
+        return None
+    return value.rstrip('/').rsplit('/', 1)[-1]
+
+
+def _seller(offer):
+    seller = offer.get('seller') or offer.get('offeredBy')
+    if isinstance(seller, list):
+        seller = seller[0] if seller else None
+    if isinstance(seller, dict):
+        return seller.get('name')
+    return seller if isinstance(seller, str) else None
+
+
+def _specification_price(offer):
+    """Selling price from priceSpecification, skipping strikethrough/list prices"""
+    for spec in _as_list(offer.get('priceSpecification')):
+        if not isinstance(spec, dict):
+            continue
+        price_type = str(spec.get('priceType', '')).rsplit('/', 1)[-1]
+        if price_type in NON_SELLING_PRICE_TYPES:
+            continue
+        price = parse_price(spec.get('price'))
+        if price:
+            return price, spec.get('priceCurrency')
+    return None, None
+
+
+def offer_entries(offer):
+    """(price, currency, availability, seller) for an Offer or AggregateOffer and the offers inside it"""
+    if not isinstance(offer, dict):
+        return []
+    currency = offer.get('priceCurrency')
+    price = parse_price(offer.get('price'))
+    if not price:
+        price, spec_currency = _specification_price(offer)
+        currency = currency or spec_currency
+    if not price:
+        # AggregateOffer (and some plain Offers) only give a range
+        price = parse_price(offer.get('lowPrice'))
+    entries = []
+    if price:
+        entries.append((price, currency, _availability(offer), _seller(offer)))
+    for nested in _as_list(offer.get('offers')):
+        for nested_price, nested_currency, availability, seller in offer_entries(nested):
+            entries.append((nested_price, nested_currency or currency, availability or _availability(offer),
+                            seller or _seller(offer)))
+    return entries
+
+
+def _best_entry(entries):
+    """First in-stock offer, else the first one with a price"""
+    for entry in entries:
+        if entry[2] in IN_STOCK:
+            return entry
+    return entries[0] if entries else None
+
+
+def product_from_jsonld(scripts):
+    """Price, currency, availability and seller of the page's product from its JSON-LD scripts
+
+    Product nodes are tried in document order and the first with a priced offer wins; pages
+    with only bare Offer nodes fall back to those. Returns a dict or None.
+    """
+    products, offers = [], []
+    for raw in scripts:
+        data = load_jsonld(raw) if isinstance(raw, str) else raw
+        for node in iter_nodes(data):
+            types = types_of(node)
+            if types & {'Product', 'ProductGroup', 'IndividualProduct', 'ProductModel'}:
+                products.append(node)
+            elif types & {'Offer', 'AggregateOffer'} or (not types and ('price' in node or 'offers' in node)):
+                offers.append(node)
+
+    for node in products:
+        entries = [entry for offer in _as_list(node.get('offers')) for entry in offer_entries(offer)]
+        best = _best_entry(entries)
+        if best:
+            return _product_result(best, node.get('name'))
+    for node in offers:
+        best = _best_entry(offer_entries(node))
+        if best:
+            return _product_result(best, None)
+    return None
+
+
+def _product_result(entry, name):
+    price, currency, availability, seller = entry
+    if availability in IN_STOCK:
+        in_stock = True
+    elif availability in OUT_OF_STOCK:
+        in_stock = False
+    else:
+        in_stock = None
+    return {'price': price, 'currency': currency, 'availability': availability, 'in_stock': in_stock,
+            'seller': seller, 'name': name}
+
+
+def currency_symbol(code):
+    """Display symbol for an ISO currency code (rupees when the page does not say)"""
+    if not code:
+        return '₹'
+    return CURRENCY_SYMBOLS.get(str(code).upper(), code)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test app-state blob extraction (__NEXT_DATA__, window.__INITIAL_STATE__) over HTTP and from a driver
+"""
+
+import json
+import os
+import tempfile
+
+from app_state import app_state_from_driver, find_app_states, product_from_state, resolve_path
+from benchmark_parsers import load_corpus
+from price_tracker_universal import UniversalPriceTracker
+
+
+class FakeDriver:
+    def __init__(self, scripts):
+        self.scripts = scripts
+
+    def execute_script(self, script, *args):
+        return self.scripts
+
+
+def test_app_state():
+    """Blobs are found in their usual script shapes and priced through per-site paths"""
+    print("🧱 Testing app-state extraction...")
+
+    next_data = {"props": {"pageProps": {"productDetails": {"children": [
+        {"pricing": {"discount": {"mrp": "₹60", "prim_price": {"sp": "52.50"}}}, "availability": {"avail_status": "001"}}]}}}}
+    escaped = json.dumps(json.dumps({"product": {"price": 410}}))
+    states = find_app_states([
+        ('__NEXT_DATA__', json.dumps(next_data)),
+        ('', 'window.dataLayer = [];'),
+        ('', 'window.__INITIAL_STATE__ = {"cart": {"items": []}, "pdp": {"price": 999}};window.x = 1;'),
+        ('', f'window.__PRELOADED_STATE__ = JSON.parse({escaped});'),
+        ('', 'window.__APOLLO_STATE__ = {broken: true};'),
+    ])
+    assert set(states) == {'__NEXT_DATA__', '__INITIAL_STATE__', '__PRELOADED_STATE__'}
+    assert states['__PRELOADED_STATE__'] == {"product": {"price": 410}}
+
+    assert resolve_path(next_data, 'props.pageProps.productDetails.children.0.pricing.discount.prim_price.sp') == '52.50'
+    assert resolve_path({"offers": [{"p": None}, {"p": 7}]}, 'offers.*.p') == 7
+    assert resolve_path(next_data, 'props.missing.sp') is None
+
+    paths = {'price': ['props.pageProps.productDetails.children.0.pricing.discount.prim_price.sp'],
+             'mrp': ['props.pageProps.productDetails.children.0.pricing.discount.mrp'],
+             'in_stock': ['props.pageProps.productDetails.children.0.availability.avail_status']}
+    product = product_from_state(states, paths)
+    assert (product['price'], product['mrp'], product['in_stock'], product['state']) == (52.5, 60.0, '001', '__NEXT_DATA__')
+    assert product_from_state(states, {'price': ['pdp.nothing']}) is None
+
+    # Over HTTP, only sites with configured paths read the blob
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    pages, expected = load_corpus()
+    html = pages['flipkart_state.html']
+    result = tracker.extract_price_from_html(html, expected['flipkart_state.html']['url'])
+    assert (result['method'], result['price'], result['mrp']) == ('app-state', 1799.0, 4999.0)
+    assert 'error' in tracker.extract_price_from_html(html, 'https://unknown-shop.example/p/1')
+
+    # With a pincode set, a downloaded BigBasket page only holds the default location's state
+    bigbasket = expected['bigbasket_product.html']['url']
+    assert tracker.extract_price_from_html(pages['bigbasket_product.html'], bigbasket)['method'] == 'app-state'
+    tracker.pincode = '560001'
+    assert tracker.extract_price_from_html(pages['bigbasket_product.html'], bigbasket).get('method') != 'app-state'
+    del tracker.pincode
+
+    # The browser paths read the same blobs from the live page in one round trip
+    driver = FakeDriver([['__NEXT_DATA__', json.dumps(next_data)], ['', 'console.log(1)']])
+    assert tracker.app_state_result(app_state_from_driver(driver), paths)['price'] == 52.5
+
+    print("✅ App-state extraction test passed!")
+
+
+if __name__ == "__main__":
+    test_app_state()
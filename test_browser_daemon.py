@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test the browser daemon's launch, health check and restart loop with a fake Chrome binary
+"""
+
+import os
+import stat
+import sys
+import tempfile
+
+from browser_daemon import BrowserDaemon, browser_pid, healthy_browsers, read_state
+from price_tracker_universal import UniversalPriceTracker
+
+# Stands in for Chrome: answers /json/version on the --remote-debugging-port it is given
+FAKE_CHROME = """#!{python}
+import sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+port = int([a for a in sys.argv if a.startswith('--remote-debugging-port=')][0].split('=')[1])
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{{"Browser": "FakeChrome/1.0"}}')
+
+    def log_message(self, *args):
+        pass
+
+HTTPServer(('127.0.0.1', port), Handler).serve_forever()
+"""
+
+
+class FakeDriver:
+    def __init__(self, address, state_file):
+        self.daemon_address = address
+        self.daemon_pid = browser_pid(address, state_file)
+
+
+def test_browser_daemon():
+    """Browsers come up on their ports, are published, and crashed ones are restarted"""
+    print("🔧 Testing browser daemon...")
+
+    workdir = tempfile.mkdtemp()
+    chrome = os.path.join(workdir, 'fake-chrome')
+    with open(chrome, 'w') as f:
+        f.write(FAKE_CHROME.format(python=sys.executable))
+    os.chmod(chrome, os.stat(chrome).st_mode | stat.S_IEXEC)
+
+    state_file = os.path.join(workdir, 'browser_daemon.json')
+    daemon = BrowserDaemon(size=2, base_port=29300 + os.getpid() % 500, chrome_binary=chrome,
+                           profile_dir=os.path.join(workdir, 'profiles'), state_file=state_file)
+    try:
+        daemon.ensure()
+        addresses = healthy_browsers(state_file)
+        assert len(addresses) == 2
+        assert os.path.isdir(os.path.join(workdir, 'profiles', 'slot-1'))
+        assert read_state(state_file)['stats']['starts'] == 2
+
+        # Simulate a crash: the next health check brings the slot back
+        daemon.browsers[0]['process'].kill()
+        daemon.browsers[0]['process'].wait()
+        daemon.ensure()
+        assert len(healthy_browsers(state_file)) == 2
+        assert daemon.stats['restarts'] == 1
+        assert read_state(state_file)['browsers'][0]['restarts'] == 1
+
+        # A daemon browser the watchdog kills as hung is not leased again until the daemon restarts it
+        tracker = UniversalPriceTracker(config_file=os.path.join(workdir, 'config.json'))
+        tracker.scraper_settings.update(browser_daemon=True, browser_daemon_state_file=state_file)
+        hung = FakeDriver(tracker._lease_daemon_browser(), state_file)
+        assert tracker._kill_daemon_browser(hung) >= 1
+        daemon.browsers[0]['process'].wait(5)
+        tracker._release_daemon_browser(hung)
+        assert tracker._lease_daemon_browser() == addresses[1]
+        daemon.ensure()
+        assert tracker._lease_daemon_browser() == addresses[0], "restarted under a new pid"
+
+        # Even if the hung browser still answers, the same pid is skipped
+        tracker.daemon_leases.clear()
+        tracker.bad_daemon_browsers[addresses[0]] = browser_pid(addresses[0], state_file)
+        assert tracker._lease_daemon_browser() == addresses[1]
+    finally:
+        daemon.stop()
+
+    assert read_state(state_file) is None
+    print("✅ Browser daemon test passed!")
+
+
+if __name__ == "__main__":
+    test_browser_daemon()
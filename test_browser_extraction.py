@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test ranking of in-page price candidates (no Chrome needed)
+"""
+
+import os
+import tempfile
+
+from browser_extraction import collect_price_candidates, pick_price
+from price_tracker_universal import UniversalPriceTracker
+
+
+class FakeDriver:
+    """Returns a canned candidate payload and counts round trips"""
+
+    def __init__(self, candidates):
+        self.candidates = candidates
+        self.calls = 0
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        return self.candidates
+
+
+def test_browser_extraction():
+    """One round trip, then meta > JSON-LD > CSS in selector order"""
+    print("🔍 Testing in-page candidate ranking...")
+
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    driver = FakeDriver([
+        {'source': 'meta', 'selector': 'property=og:price:amount', 'text': 'N/A'},
+        {'source': 'json-ld', 'selector': 'script', 'text': '{"@type": "Product", "offers": {"price": "1499"}}'},
+        {'source': 'css', 'selector': '.price', 'text': '₹1,599'},
+    ])
+
+    candidates = collect_price_candidates(driver, ['.price'])
+    assert driver.calls == 1
+
+    price, hit = pick_price(candidates, tracker.extract_price_from_text, tracker.extract_price_from_jsonld)
+    assert price == 1499.0 and hit['source'] == 'json-ld'
+
+    price, hit = pick_price(candidates, tracker.extract_price_from_text, sources=('css',))
+    assert price == 1599.0 and hit['selector'] == '.price'
+
+    price, hit = pick_price(candidates, tracker.extract_price_from_text, selectors={'.other'}, sources=('css',))
+    assert price is None and hit is None
+
+    print("✅ In-page candidate ranking test passed!")
+
+
+if __name__ == "__main__":
+    test_browser_extraction()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the request-blocking policy, DevTools network stats and product-API capture (no Chrome needed)
+"""
+
+import json
+
+from cdp_network import (DEFAULT_BLOCKING_POLICY, RESOURCE_TYPE_PATTERNS, blocked_patterns_for, capture_product_json,
+                         network_stats, product_from_json, product_id_from_url)
+
+
+def test_cdp_network():
+    """Allowlists remove patterns per site, and log events roll up into page stats"""
+    print("🚫 Testing request blocking policy...")
+
+    policy = dict(DEFAULT_BLOCKING_POLICY, allow={'bigbasket.com': ['image', '*moengage.com*']})
+
+    amazon = blocked_patterns_for(policy, 'amazon.in')
+    assert '*.png' in amazon and '*moengage.com*' in amazon
+    assert '*.jpg?*' in amazon, "CDN images with resize query strings are blocked too"
+
+    bigbasket = blocked_patterns_for(policy, 'bigbasket.com')
+    assert not set(RESOURCE_TYPE_PATTERNS['image']) & set(bigbasket)
+    assert '*.woff2' in bigbasket and '*moengage.com*' not in bigbasket
+
+    assert blocked_patterns_for(dict(policy, enabled=False), 'amazon.in') == []
+
+    events = [
+        {'method': 'Network.requestWillBeSent', 'params': {}},
+        {'method': 'Network.requestWillBeSent', 'params': {}},
+        {'method': 'Network.requestWillBeSent', 'params': {}},
+        {'method': 'Network.loadingFailed', 'params': {'blockedReason': 'inspector'}},
+        {'method': 'Network.loadingFailed', 'params': {'errorText': 'net::ERR_ABORTED'}},
+        {'method': 'Network.loadingFinished', 'params': {'encodedDataLength': 2048}},
+    ]
+    assert network_stats(events) == {'requests': 3, 'blocked_requests': 1, 'transferred_bytes': 2048}
+
+    print("✅ Request blocking test passed!")
+
+
+class FakeDriver:
+    """Serves canned performance-log batches and response bodies"""
+
+    def __init__(self, batches, bodies):
+        self.batches = list(batches)
+        self.bodies = bodies
+
+    def get_log(self, name):
+        batch = self.batches.pop(0) if self.batches else []
+        return [{'message': json.dumps({'message': event})} for event in batch]
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == 'Network.getResponseBody'
+        return {'body': self.bodies[params['requestId']], 'base64Encoded': False}
+
+
+def response(request_id, url, mime='application/json'):
+    return {'method': 'Network.responseReceived',
+            'params': {'requestId': request_id, 'response': {'url': url, 'mimeType': mime}}}
+
+
+def finished(request_id):
+    return {'method': 'Network.loadingFinished', 'params': {'requestId': request_id, 'encodedDataLength': 100}}
+
+
+def test_capture_product_json():
+    """The matching API response is parsed as soon as it finishes loading"""
+    print("📡 Testing product API capture...")
+
+    similar = {'id': 30001, 'desc': 'Rock Salt', 'pricing': {'discount': {'mrp': '90', 'prim_price': {'sp': '75'}}}}
+    payload = {'recommended': [similar], 'products': [{'id': 241600, 'desc': 'Tata Salt 1 kg', 'pricing': {'discount': {
+        'mrp': '28', 'prim_price': {'sp': '26.50'}}}, 'availability': {'avail_status': '001'},
+        'similar': [similar]}]}
+    # Recommended and similar items are skipped; every field comes from the product's own node
+    assert product_from_json(payload, '241600') == {'price': 26.5, 'mrp': 28.0, 'in_stock': '001'}
+    assert product_from_json(payload, '999') is None
+    assert product_from_json({'items': []}, '241600') is None
+    assert product_id_from_url('https://www.bigbasket.com/pd/241600/tata-salt-1-kg/', r'/pd/(\d+)') == '241600'
+    assert product_id_from_url('https://www.bigbasket.com/cl/foodgrains/', r'/pd/(\d+)') is None
+
+    driver = FakeDriver(
+        batches=[
+            [response('1', 'https://www.bigbasket.com/ui-svc/v1/header'), finished('1')],
+            [response('2', 'https://www.bigbasket.com/listing-svc/v2/products?id=1'),
+             response('3', 'https://www.bigbasket.com/static/logo.svg', mime='image/svg+xml')],
+            [finished('2')],
+        ],
+        bodies={'1': json.dumps({'id': 241600, 'price': 1}), '2': json.dumps(payload)},
+    )
+    events = []
+    product = capture_product_json(driver, [r'/listing-svc/'], '241600', timeout=2, poll_interval=0.01, events=events)
+    assert product['price'] == 26.5 and product['mrp'] == 28.0
+    assert product['source_url'].endswith('products?id=1')
+    assert len(events) == 5, "every drained event is kept for the page stats"
+
+    assert capture_product_json(FakeDriver([], {}), [r'/listing-svc/'], '241600', timeout=0.05, poll_interval=0.01) is None
+
+    print("✅ Product API capture test passed!")
+
+
+if __name__ == "__main__":
+    test_cdp_network()
+    test_capture_product_json()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test concurrent price checks: ordering and per-domain limits
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from price_tracker_universal import UniversalPriceTracker, get_domain
+from request_scheduler import DomainScheduler
+
+
+def test_concurrent_check():
+    """Prices come back in product order and no domain exceeds its slot count"""
+    print("⚙️  Testing concurrent checks...")
+
+    config_file = os.path.join(tempfile.mkdtemp(), 'config.json')
+    tracker = UniversalPriceTracker(config_file=config_file)
+    tracker.scraper_settings['max_workers'] = 4
+    tracker.scheduler = DomainScheduler({'default': {'rps': 0, 'max_in_flight': 1}})
+
+    in_flight = {}
+    peak = {}
+    lock = threading.Lock()
+
+    def fake_check(product):
+        domain = get_domain(product['url'])
+        with lock:
+            in_flight[domain] = in_flight.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), in_flight[domain])
+        time.sleep(0.05)
+        with lock:
+            in_flight[domain] -= 1
+        return product['expected']
+
+    tracker.check_product_price = fake_check
+
+    products = [
+        {'name': f'P{i}', 'url': f'https://{site}/item/{i}', 'expected': float(100 + i)}
+        for i, site in enumerate(['a.com', 'a.com', 'b.com', 'c.com', 'a.com', 'b.com'])
+    ]
+
+    started = time.time()
+    prices = list(tracker.fetch_prices(products))
+    elapsed = time.time() - started
+
+    assert prices == [p['expected'] for p in products]
+    assert all(count == 1 for count in peak.values())
+    assert elapsed < 0.05 * len(products)  # faster than running them one by one
+
+    print("✅ Concurrent check test passed!")
+
+
+if __name__ == "__main__":
+    test_concurrent_check()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test that the config file keeps only overridden scraper settings and merges nested defaults on load
+"""
+
+import json
+import os
+import tempfile
+
+from price_tracker_universal import DEFAULT_SCRAPER_SETTINGS, UniversalPriceTracker, merge_settings
+
+
+def test_config_settings():
+    """Defaults are never frozen into the config; nested overrides keep the other defaults"""
+    print("⚙️  Testing scraper settings persistence...")
+
+    config_file = os.path.join(tempfile.mkdtemp(), 'config.json')
+    tracker = UniversalPriceTracker(config_file=config_file)
+    tracker.save_config()
+    with open(config_file, encoding='utf-8') as f:
+        assert json.load(f)['scraper_settings'] == {}
+
+    tracker.scraper_settings['max_workers'] = 8
+    tracker.scraper_settings['domain_limits']['shop.example'] = {'rps': 2.0, 'max_in_flight': 1}
+    tracker.save_config()
+    with open(config_file, encoding='utf-8') as f:
+        saved = json.load(f)['scraper_settings']
+    assert saved == {'max_workers': 8, 'domain_limits': {'shop.example': {'rps': 2.0, 'max_in_flight': 1}}}
+    assert 'shop.example' not in DEFAULT_SCRAPER_SETTINGS['domain_limits'], "defaults are never mutated"
+
+    # An older config that saved a whole nested dict still picks up keys added to the defaults since
+    saved['network_capture'] = {'bigbasket.com': {'url_patterns': [r'/listing-svc/'], 'timeout': 4}}
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump({'scraper_settings': saved}, f)
+    reloaded = UniversalPriceTracker(config_file=config_file)
+    settings = reloaded.scraper_settings
+    assert settings['max_workers'] == 8 and settings['domain_limits']['shop.example']['rps'] == 2.0
+    assert settings['domain_limits']['amazon.in'] == DEFAULT_SCRAPER_SETTINGS['domain_limits']['amazon.in']
+    assert settings['network_capture']['bigbasket.com']['url_patterns'] == [r'/listing-svc/']
+    assert settings['network_capture']['bigbasket.com']['product_id_pattern'] == r'/pd/(\d+)'
+    assert merge_settings({'a': {'b': 1}}, {'a': 5}) == {'a': 5}
+
+    print("✅ Scraper settings test passed!")
+
+
+if __name__ == "__main__":
+    test_config_settings()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the WebDriver pool with a fake driver (no Chrome needed)
+"""
+
+from driver_pool import DriverPool
+
+
+class FakeDriver:
+    """Minimal stand-in for a Selenium WebDriver"""
+
+    def __init__(self):
+        self.window_handles = ['main']
+        self.quit_called = False
+        self.cookies_cleared = 0
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def close(self):
+        pass
+
+    def execute_script(self, script):
+        pass
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_driver_pool():
+    """Drivers are reused, recycled after max_pages and torn down on close"""
+    print("🔧 Testing driver pool...")
+
+    started = []
+
+    def factory():
+        driver = FakeDriver()
+        started.append(driver)
+        return driver
+
+    quit_hook = []
+    pool = DriverPool(factory, size=1, max_pages=3, max_memory_mb=None, on_quit=quit_hook.append)
+
+    for _ in range(3):
+        with pool.driver() as driver:
+            assert driver is started[0]
+    assert len(started) == 1
+    assert started[0].cookies_cleared == 2  # reset between pages
+    assert started[0].quit_called  # recycled after 3 pages
+
+    with pool.driver() as driver:
+        assert driver is started[1]
+
+    try:
+        with pool.driver():
+            raise ValueError("page blew up")
+    except ValueError:
+        pass
+    assert started[1].quit_called  # broken drivers are discarded
+
+    with pool.driver():
+        pass
+    pool.close()
+    assert all(d.quit_called for d in started)
+    assert pool.stats['started'] == 3
+    assert quit_hook == started  # every quit driver is reported back
+    assert pool.stats['page_seconds'] >= 0 and pool.stats['startup_seconds'] >= 0
+
+    print("✅ Driver pool test passed!")
+
+
+if __name__ == "__main__":
+    test_driver_pool()
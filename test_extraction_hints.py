@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test per-domain extraction hints: learning, the fast path, misses after a layout change, persistence
+"""
+
+import os
+import tempfile
+
+from price_tracker_universal import UniversalPriceTracker
+
+URL = 'https://shop.example/p/{}'
+OLD_LAYOUT = '<html><body><div class="pdp"><span class="value">₹ 450</span><span class="mrp">₹ 600</span></div></body></html>'
+NEW_LAYOUT = '<html><head><meta property="og:price:amount" content="440"></head><body><b class="now">₹ 440</b></body></html>'
+# .value still matches, but now holds the cart quantity
+QTY_LAYOUT = '<html><head><meta property="og:price:amount" content="445"></head><body><span class="value">1</span></body></html>'
+
+
+def test_extraction_hints():
+    """The winning selector is tried first, a miss falls back and relearns, and hints survive a reload"""
+    print("🧠 Testing extraction hints...")
+
+    config_file = os.path.join(tempfile.mkdtemp(), 'config.json')
+    tracker = UniversalPriceTracker(config_file=config_file)
+
+    first = tracker.extract_price_from_html(OLD_LAYOUT, URL.format(1))
+    assert (first['price'], first['selector']) == (450.0, '.value')
+    assert tracker.extraction_hints.get('shop.example')['selector'] == '.value'
+
+    # The fast path runs only the remembered selector
+    tracker.extract_with_cascade = lambda *args: {'error': 'cascade should not run', 'available': False}
+    assert tracker.extract_price_from_html(OLD_LAYOUT, URL.format(2))['price'] == 450.0
+    del tracker.extract_with_cascade
+
+    # A new layout: the hinted .value selector is gone, so the cascade runs and a new hint is learned
+    result = tracker.extract_price_from_html(NEW_LAYOUT, URL.format(3))
+    assert (result['method'], result['price']) == ('meta', 440.0)
+    assert tracker.extract_price_from_html(NEW_LAYOUT, URL.format(4))['price'] == 440.0
+
+    report = tracker.extraction_hints.report()['shop.example']
+    assert report == {'hint': 'meta property=og:price:amount', 'hits': 2, 'misses': 1,
+                      'hit_rate': 2 / 3, 'relearned': 1}
+
+    # A hint that still matches but reads an implausible price (₹1) is a miss as well
+    tracker.extract_price_from_html(OLD_LAYOUT, 'https://qty.example/p/1')
+    result = tracker.extract_price_from_html(QTY_LAYOUT, 'https://qty.example/p/2')
+    assert (result['method'], result['price']) == ('meta', 445.0)
+    assert tracker.extraction_hints.report()['qty.example']['misses'] == 1
+
+    # Text-only prices are never learned, and hints are per domain
+    tracker.extract_price_from_html('<p>Now only Rs. 75</p>', 'https://other.example/x')
+    assert tracker.extraction_hints.get('other.example') is None
+
+    tracker.save_config()
+    reloaded = UniversalPriceTracker(config_file=config_file)
+    assert reloaded.extraction_hints.get('shop.example')['selector'] == 'property=og:price:amount'
+
+    print("✅ Extraction hints test passed!")
+
+
+if __name__ == "__main__":
+    test_extraction_hints()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the one-pass extraction index against BeautifulSoup's own selector engine
+"""
+
+import os
+import tempfile
+
+from bs4 import BeautifulSoup
+
+from extraction_index import ExtractionIndex
+from price_tracker_universal import UniversalPriceTracker
+
+PAGE = """
+<html><head>
+  <meta property="og:title" content="Basmati Rice 5kg">
+  <meta name="price" content="n/a">
+  <meta name="price" content="₹ 612.00">
+  <script type="application/ld+json">{"@type": "Product", "offers": {"price": "599"}}</script>
+</head><body>
+  <div id="product-price-box" class="pdp priceBlock">
+    <span class="Price strike">₹ 750</span>
+    <span class="a-price-whole sale-price" data-price="599">599</span>
+  </div>
+  <div class="card"><span class="offer-PriceTag">₹ 580</span></div>
+  <section class="price"><p class="value">599</p></section>
+  <span id="unit_price_label">per kg</span>
+</body></html>
+"""
+
+
+def test_extraction_index():
+    """Every price selector gives the same elements, in the same order, as soup.select"""
+    print("🗂️  Testing extraction index...")
+
+    soup = BeautifulSoup(PAGE, 'html.parser')
+    index = ExtractionIndex(soup)
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+
+    selectors = [s['selector'] for s in tracker.price_selectors if s['type'] == 'css']
+    selectors += ['span', 'div.priceBlock', '#unit_price_label', 'span[data-price="599"]', 'section > p']
+    for selector in selectors:
+        assert index.select(selector) == soup.select(selector), selector
+    assert index.fallbacks == 1, "only the child combinator needs the full selector engine"
+
+    assert index.meta_content('name', 'price') == ['n/a', '₹ 612.00']
+    assert index.meta_content('property', 'product:price:amount') == []
+    assert len(index.jsonld) == 1
+
+    result = tracker.extract_price_from_html(PAGE)
+    assert result['price'] == 612.0 and result['method'] == 'meta'
+
+    print("✅ Extraction index test passed!")
+
+
+if __name__ == "__main__":
+    test_extraction_index()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test pooled keep-alive HTTP sessions against a local test server
+"""
+
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from http_session import HttpClient
+from price_tracker_universal import UniversalPriceTracker
+
+PAGE = '<html><head><meta property="product:price:amount" content="799"></head></html>'.encode('utf-8')
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_session():
+    """Repeated fetches to one host reuse a single connection"""
+    print("🔌 Testing pooled HTTP sessions...")
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"127.0.0.1:{server.server_port}"
+
+    try:
+        client = HttpClient(connect_timeout=2, read_timeout=2)
+        config_file = os.path.join(tempfile.mkdtemp(), 'config.json')
+        tracker = UniversalPriceTracker(config_file=config_file, http_client=client)
+
+        for i in range(5):
+            result = tracker.scrape_price_universal(f"http://{host}/product/{i}")
+            assert result['price'] == 799.0
+
+        stats = client.stats()[host]
+        assert stats == {'requests': 5, 'connections': 1, 'reused': 4}
+        client.close()
+    finally:
+        server.shutdown()
+
+    print("✅ HTTP session test passed!")
+
+
+if __name__ == "__main__":
+    test_http_session()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test saving, expiring and replaying BigBasket location state (no Chrome needed)
+"""
+
+import os
+import tempfile
+import time
+
+from location_state import LocationStateStore
+
+
+class FakeDriver:
+    """Records CDP commands and serves a fixed cookie jar and localStorage"""
+
+    current_url = 'https://www.bigbasket.com/pd/40326186/some-product/'
+
+    def __init__(self):
+        self.commands = []
+
+    def get_cookies(self):
+        return [{'name': '_bb_pin_code', 'value': '560102', 'domain': '.bigbasket.com', 'path': '/',
+                 'secure': True, 'httpOnly': False, 'sameSite': 'Lax', 'expiry': int(time.time()) + 3600}]
+
+    def execute_script(self, script):
+        return {'bb_address': '{"pincode":"560102"}'}
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append((cmd, params))
+        return {'identifier': '7'} if cmd == 'Page.addScriptToEvaluateOnNewDocument' else {}
+
+
+def test_location_state():
+    """State survives a reload, is injected via CDP and drops out once expired"""
+    print("📍 Testing location state store...")
+
+    path = os.path.join(tempfile.mkdtemp(), 'location_state.json')
+    store = LocationStateStore(path, ttl_seconds=60)
+    assert store.get('bigbasket.com', '560102') is None
+
+    store.capture(FakeDriver(), 'bigbasket.com', '560102')
+    store.save()
+
+    reloaded = LocationStateStore(path, ttl_seconds=60)
+    entry = reloaded.get('bigbasket.com', '560102')
+    assert entry['origin'] == 'https://www.bigbasket.com'
+    assert reloaded.get('bigbasket.com', '400001') is None
+
+    driver = FakeDriver()
+    identifier = reloaded.inject(driver, entry)
+    reloaded.remove_injection(driver, identifier)
+    (set_cookies, cookie_params), (add_script, script_params), (remove_script, _) = driver.commands
+    assert set_cookies == 'Network.setCookies'
+    cookie = cookie_params['cookies'][0]
+    assert cookie['name'] == '_bb_pin_code' and cookie['sameSite'] == 'Lax' and 'expires' in cookie
+    assert add_script == 'Page.addScriptToEvaluateOnNewDocument' and 'bb_address' in script_params['source']
+    assert remove_script == 'Page.removeScriptToEvaluateOnNewDocument'
+    assert reloaded.stats['reused'] == 1
+
+    reloaded.entries[LocationStateStore.key_for('bigbasket.com', '560102')]['expires_at'] = time.time() - 1
+    assert reloaded.get('bigbasket.com', '560102') is None
+    assert reloaded.stats['expired'] == 1
+
+    print("✅ Location state test passed!")
+
+
+if __name__ == "__main__":
+    test_location_state()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test saving and resuming the BigBasket login session without an OTP prompt (no Chrome needed)
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+from bigbasket_login_scraper import BigBasketLoginScraper, ReloginRequired
+from html_parsers import LXML_AVAILABLE
+
+LOGGED_OUT_HEADER = """<html><body><header>
+<div class="user-menu"><span>Welcome to bigbasket</span><button>Login/Sign Up</button></div>
+<span>My Account</span></header></body></html>"""
+LOGGED_IN_HEADER = """<html><body><header>
+<div class="user-menu"><span>Hi, Asha</span><ul style="display:none">
+<li><a href="/member/orders/">My Orders</a></li><li><a href="/auth/logout/">Logout</a></li></ul></div>
+</header></body></html>"""
+
+
+class FakeDriver:
+    """Serves a cookie jar and records CDP commands; logged_in controls the account indicator"""
+
+    current_url = 'https://www.bigbasket.com/'
+
+    def __init__(self, logged_in=True):
+        self.logged_in = logged_in
+        self.commands = []
+        self.visited = []
+
+    def get_cookies(self):
+        return [
+            {'name': 'BBAUTHTOKEN', 'value': 'abc', 'domain': '.bigbasket.com', 'path': '/',
+             'expiry': int(time.time()) + 86400},
+            {'name': 'stale', 'value': 'x', 'domain': '.bigbasket.com', 'path': '/', 'expiry': int(time.time()) - 5},
+        ]
+
+    def execute_script(self, script, *args):
+        if 'localStorage' in script:
+            return {'user': '{"id": 1}'}
+        # Selector resolver probe: the logout link is the only match when logged in
+        return [1, object()] if self.logged_in else None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.commands.append(cmd)
+        return {}
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def quit(self):
+        pass
+
+
+def make_scraper(session_file, driver):
+    scraper = BigBasketLoginScraper('9876543210', session_file=session_file)
+    scraper.selector_resolver.path = None
+    scraper.selector_resolver.poll_interval = 0.01
+
+    def setup_driver(headless=False):
+        scraper.driver = driver
+        return True
+
+    scraper.setup_driver = setup_driver
+    scraper.scrape_product_price = lambda url: driver.get(url) or 99.0
+    return scraper
+
+
+def test_login_session():
+    """A saved session resumes headless, lapsed sessions raise instead of waiting on input()"""
+    print("🔑 Testing BigBasket login session reuse...")
+
+    session_file = os.path.join(tempfile.mkdtemp(), 'bigbasket_session.json')
+
+    # No session yet: resuming must ask for a re-login, not prompt
+    try:
+        make_scraper(session_file, FakeDriver()).resume_session()
+        assert False, "expected ReloginRequired"
+    except ReloginRequired:
+        pass
+
+    # Non-interactive OTP entry fails fast
+    stdin, sys.stdin = sys.stdin, io.StringIO()
+    try:
+        make_scraper(session_file, FakeDriver()).wait_for_manual_otp()
+        assert False, "expected ReloginRequired"
+    except ReloginRequired:
+        pass
+    finally:
+        sys.stdin = stdin
+
+    # Save once after an interactive login, then resume and batch-scrape
+    first = make_scraper(session_file, FakeDriver())
+    first.setup_driver()
+    assert first.save_session()
+
+    driver = FakeDriver()
+    scraper = make_scraper(session_file, driver)
+    assert len(scraper.load_session()['cookies']) == 1, "expired cookies are dropped"
+    scraper.resume_session()
+    assert driver.commands == ['Network.setCookies', 'Page.addScriptToEvaluateOnNewDocument']
+    urls = ['https://www.bigbasket.com/pd/1/a/', 'https://www.bigbasket.com/pd/2/b/']
+    assert scraper.scrape_products(urls) == {urls[0]: 99.0, urls[1]: 99.0}
+    assert driver.visited == urls
+
+    # The first product page shows we are logged out: stop the batch
+    lapsed = make_scraper(session_file, FakeDriver(logged_in=False))
+    lapsed.resume_session()
+    try:
+        lapsed.scrape_products(urls)
+        assert False, "expected ReloginRequired"
+    except ReloginRequired:
+        assert not lapsed.logged_in
+
+    if LXML_AVAILABLE:
+        from lxml import html
+        # The indicators must not match the logged-out header, which has a 'user' class and a greeting
+        for page, expected in ((LOGGED_OUT_HEADER, False), (LOGGED_IN_HEADER, True)):
+            tree = html.fromstring(page)
+            assert any(tree.xpath(xpath) for xpath in BigBasketLoginScraper.LOGIN_INDICATORS) == expected
+
+    # The login flow's cascades are not the tracker's: their stats go to their own file and groups
+    assert BigBasketLoginScraper('9876543210').selector_resolver.path == '.cache/selector_hits_login.json'
+    assert set(lapsed.selector_resolver.misses) == {'bigbasket_login.logged_in'}
+
+    # Sessions older than the max age are ignored
+    old = make_scraper(session_file, FakeDriver())
+    old.session_max_age_days = 0
+    assert old.load_session() is None
+
+    print("✅ Login session test passed!")
+
+
+if __name__ == "__main__":
+    test_login_session()
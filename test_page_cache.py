@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the conditional-GET page cache against a local test server
+"""
+
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from page_cache import PageCache, canonical_url
+from price_tracker_universal import UniversalPriceTracker
+
+PAGE = '<html><head><meta property="product:price:amount" content="349"></head></html>'.encode('utf-8')
+served = {'full': 0, 'not_modified': 0}
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"v1"':
+            served['not_modified'] += 1
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        served['full'] += 1
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_page_cache():
+    """A 304 reuses the cached price, and the LRU respects its entry bound"""
+    print("📦 Testing page cache...")
+
+    assert canonical_url('HTTPS://WWW.Shop.com/pd/1/?utm_source=x&nc=cl&b=2&a=1#top') == \
+        'https://www.shop.com/pd/1/?a=1&b=2'
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    workdir = tempfile.mkdtemp()
+
+    try:
+        tracker = UniversalPriceTracker(config_file=os.path.join(workdir, 'config.json'))
+        tracker.page_cache = PageCache(os.path.join(workdir, 'cache.json'))
+        url = f"http://127.0.0.1:{server.server_port}/pd/1/"
+
+        first = tracker.scrape_price_universal(url)
+        second = tracker.scrape_price_universal(url + '?utm_source=mail')
+        assert first['price'] == second['price'] == 349.0
+        assert second.get('cached') is True
+        assert served == {'full': 1, 'not_modified': 1}
+        assert tracker.page_cache.stats['hits'] == 1
+
+        # Survives a restart
+        tracker.page_cache.save()
+        reloaded = PageCache(os.path.join(workdir, 'cache.json'))
+        assert PageCache.key_for(url) in reloaded.entries
+    finally:
+        server.shutdown()
+
+    cache = PageCache(os.path.join(workdir, 'lru.json'), max_entries=2)
+    for i in range(3):
+        cache.store(f'k{i}', {'ETag': f'"{i}"'}, {'price': i})
+    cache.hit('k1')
+    cache.store('k3', {'ETag': '"3"'}, {'price': 3})
+    assert list(cache.entries) == ['k1', 'k3']
+    assert cache.stats['evictions'] == 2
+
+    print("✅ Page cache test passed!")
+
+
+if __name__ == "__main__":
+    test_page_cache()
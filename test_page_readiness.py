@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test the page readiness poller with a fake driver (no Chrome needed)
+"""
+
+from page_readiness import LOCATION_LABEL_SELECTORS, page_fingerprint, wait_for_price_ready
+
+
+class FakeDriver:
+    """Reports a price signal after a given number of polls"""
+
+    def __init__(self, polls_until_ready, reason='selector'):
+        self.polls = 0
+        self.polls_until_ready = polls_until_ready
+        self.reason = reason
+
+    def execute_script(self, script, *args):
+        self.polls += 1
+        return self.reason if self.polls >= self.polls_until_ready else None
+
+
+class RerenderDriver:
+    """Renders a new price text after a few polls; the probe compares it against the baseline"""
+
+    def __init__(self, polls_until_rerender):
+        self.polls = 0
+        self.polls_until_rerender = polls_until_rerender
+        self.label_selectors = None
+
+    def fingerprint(self):
+        return '₹ 120|Bengaluru 560102' if self.polls >= self.polls_until_rerender else '₹ 99|Select location'
+
+    def execute_script(self, script, *args):
+        if 'checks' not in script:
+            return self.fingerprint()
+        self.polls += 1
+        selectors, checks, idle_ms, baseline, self.label_selectors = args
+        if 'selector' in checks:
+            return 'selector'  # the pre-submit price is already on the page
+        return 'changed' if 'changed' in checks and self.fingerprint() != baseline else None
+
+
+class BrokenDriver:
+    def execute_script(self, script, *args):
+        raise RuntimeError('no page')
+
+
+def test_page_readiness():
+    """Returns on the first price signal and gives up at max_wait"""
+    print("⏱️  Testing page readiness...")
+
+    readiness = wait_for_price_ready(FakeDriver(3, 'json-ld'), max_wait=5, poll_interval=0.01)
+    assert readiness['ready'] and readiness['reason'] == 'json-ld'
+    assert readiness['elapsed'] < 1
+
+    readiness = wait_for_price_ready(FakeDriver(10 ** 6), max_wait=0.2, poll_interval=0.01)
+    assert not readiness['ready'] and readiness['reason'] == 'timeout'
+    assert 0.2 <= readiness['elapsed'] < 1
+
+    # After an in-page action, wait for the page to differ from the snapshot taken before it
+    driver = RerenderDriver(4)
+    baseline = page_fingerprint(driver)
+    assert baseline == '₹ 99|Select location'
+    readiness = wait_for_price_ready(driver, max_wait=5, checks=('changed',), baseline=baseline, poll_interval=0.01)
+    assert readiness['reason'] == 'changed' and driver.polls == 4
+    assert driver.label_selectors == LOCATION_LABEL_SELECTORS
+    assert page_fingerprint(BrokenDriver()) is None
+
+    print("✅ Page readiness test passed!")
+
+
+if __name__ == "__main__":
+    test_page_readiness()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test the HTML parser backends: selection, fallback and identical results on the saved-page corpus
+"""
+
+import os
+import tempfile
+
+from benchmark_parsers import benchmark_backend, compare_backends, expected_fields, load_corpus
+from html_parsers import DEFAULT_PARSER, LXML_AVAILABLE, PARSER_BACKENDS, resolve_parser
+from price_tracker_universal import UniversalPriceTracker
+
+
+def test_parser_backends():
+    """Every installed backend extracts the recorded result from every saved page"""
+    print("🧪 Testing HTML parser backends...")
+
+    assert resolve_parser('auto') == DEFAULT_PARSER
+    assert resolve_parser('html.parser') == 'html.parser'
+    assert resolve_parser('html5lib-not-installed') == DEFAULT_PARSER
+    assert DEFAULT_PARSER == ('lxml' if LXML_AVAILABLE else 'html.parser')
+
+    pages, expected = load_corpus()
+    assert pages and set(expected) <= set(pages)
+
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    urls = {name: want['url'] for name, want in expected.items()}
+    results = {backend: benchmark_backend(tracker, backend, pages, repeat=1, urls=urls) for backend in PARSER_BACKENDS}
+    assert compare_backends(results) == []
+
+    for name, want in expected.items():
+        got = results[DEFAULT_PARSER][name]['result']
+        assert all(got.get(key) == value for key, value in expected_fields(want).items()), (name, got)
+
+    print(f"✅ Parser backend test passed ({', '.join(PARSER_BACKENDS)})!")
+
+
+if __name__ == "__main__":
+    test_parser_backends()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test that the BigBasket pincode flow runs before a product-API price is trusted (no Chrome needed)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+from location_state import LocationStateStore
+from price_tracker_universal import UniversalPriceTracker
+
+URL = 'https://www.bigbasket.com/pd/40123456/amul-butter-500-g/'
+
+
+class FakeInput:
+    def clear(self):
+        pass
+
+    def send_keys(self, text):
+        self.text = text
+
+
+class FakeDriver:
+    current_url = URL
+    page_source = ''
+
+    def get(self, url):
+        pass
+
+    def get_cookies(self):
+        return [{'name': '_bb_pin_code', 'value': '560001', 'domain': '.bigbasket.com', 'path': '/'}]
+
+    def execute_script(self, script, *args):
+        return {} if 'localStorage' in script else None
+
+
+class FakePool:
+    def __init__(self, driver):
+        self._driver = driver
+
+    @contextmanager
+    def driver(self):
+        yield self._driver
+
+
+class FakeResolver:
+    """Every cascade finds its first alternative"""
+
+    def __init__(self):
+        self.groups = []
+
+    def click(self, driver, group, xpaths, timeout=5):
+        self.groups.append(group)
+        return xpaths[0]
+
+    def resolve(self, driver, group, xpaths, timeout=5, clickable=False):
+        self.groups.append(group)
+        return FakeInput(), xpaths[0]
+
+
+def make_tracker(steps):
+    directory = tempfile.mkdtemp()
+    tracker = UniversalPriceTracker(config_file=os.path.join(directory, 'config.json'))
+    tracker.location_state = LocationStateStore(os.path.join(directory, 'location_state.json'))
+    tracker.selector_resolver = FakeResolver()
+    tracker.get_driver_pool = lambda: FakePool(FakeDriver())
+    tracker.prepare_page = lambda driver, url, fresh_log=True: None
+    tracker.wait_for_page = lambda *args, **kwargs: None
+    tracker.report_page_network = lambda driver, events=None: None
+    tracker.find_price_in_page = lambda driver, selectors: (None, None)
+
+    def capture_product_api(driver, url, events):
+        # The response priced for whatever location the page was on when it loaded
+        steps.append('capture')
+        price = 61.0 if 'bigbasket.submit' in tracker.selector_resolver.groups else 58.0
+        return {'price': price, 'currency': '₹', 'available': True, 'method': 'network'}
+
+    tracker.capture_product_api = capture_product_api
+    return tracker
+
+
+def test_pincode_flow():
+    """Without a saved location, the first load's API price is ignored and the pincode flow runs"""
+    print("🏪 Testing the BigBasket pincode flow...")
+
+    steps = []
+    tracker = make_tracker(steps)
+    result = tracker.scrape_bigbasket_with_pincode(URL, '560001')
+    assert result['price'] == 61.0, "only the capture after the submit is trusted"
+    assert steps == ['capture']
+    assert tracker.selector_resolver.groups == ['bigbasket.location', 'bigbasket.pincode', 'bigbasket.submit']
+    assert tracker.location_state.get('bigbasket.com', '560001') is not None
+
+    # With the location restored, the first load is already priced for the pincode
+    steps.clear()
+    tracker.selector_resolver.groups.clear()
+    tracker.location_state.inject = lambda driver, entry: None
+    assert tracker.scrape_bigbasket_with_pincode(URL, '560001')['price'] == 58.0
+    assert steps == ['capture'] and tracker.selector_resolver.groups == []
+
+    # No pincode wanted: the default location is the right one
+    steps.clear()
+    assert make_tracker(steps).scrape_bigbasket_with_pincode(URL, None)['price'] == 58.0
+
+    print("✅ Pincode flow test passed!")
+
+
+if __name__ == "__main__":
+    test_pincode_flow()
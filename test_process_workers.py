@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test process-isolated workers: crash containment, deadlines and the tracker's process mode
+"""
+
+import os
+import tempfile
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from page_cache import PageCache
+from price_tracker_universal import UniversalPriceTracker
+from process_workers import ProcessWorker
+from request_scheduler import DomainScheduler
+
+PAGE = b'<html><head><meta property="product:price:amount" content="499.00"></head><body></body></html>'
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.send_header('ETag', '"v1"')
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def scripted_worker(conn, config_file, scraper_settings, domain_tiers, breaker_state):
+    """Worker stand-in whose products say whether to answer, crash or hang"""
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        product, _ = message
+        if product['action'] == 'crash':
+            os._exit(1)
+        if product['action'] == 'hang':
+            time.sleep(60)
+        conn.send({'price': product['price'], 'tier': None, 'breaker': None})
+
+
+def no_state():
+    return {}, {}, {}
+
+
+def test_process_worker():
+    """A crashed or hung worker costs only its product; the next product gets a fresh worker"""
+    print("🧩 Testing process worker restarts...")
+
+    worker = ProcessWorker(1, config_file=None, max_rss_mb=None, target=scripted_worker)
+    try:
+        assert worker.check({'name': 'A', 'action': 'ok', 'price': 10.0}, 10, no_state)['price'] == 10.0
+        assert worker.check({'name': 'B', 'action': 'crash'}, 10, no_state) is None
+        assert worker.check({'name': 'C', 'action': 'ok', 'price': 30.0}, 10, no_state)['price'] == 30.0
+        assert worker.check({'name': 'D', 'action': 'hang'}, 0.5, no_state) is None
+        assert worker.check({'name': 'E', 'action': 'ok', 'price': 50.0}, 10, no_state)['price'] == 50.0
+    finally:
+        worker.stop()
+
+    assert worker.stats['starts'] == 3
+    assert worker.stats['crashes'] == 1 and worker.stats['timeouts'] == 1
+    print("✅ Process worker test passed!")
+
+
+def test_tracker_process_mode():
+    """The tracker's process mode checks real products in workers and keeps product order"""
+    print("🧩 Testing tracker process mode...")
+
+    server = HTTPServer(('127.0.0.1', 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        workdir = tempfile.mkdtemp()
+        tracker = UniversalPriceTracker(config_file=os.path.join(workdir, 'config.json'))
+        tracker.page_cache = PageCache(os.path.join(workdir, 'cache.json'))
+        tracker.scraper_settings.update({'execution_mode': 'processes', 'worker_processes': 2})
+        tracker.scheduler = DomainScheduler({'default': {'rps': 1000, 'max_in_flight': 2}})
+        products = [{'name': f'P{i}', 'url': f'{base}/item/{i}'} for i in range(3)]
+
+        assert list(tracker.fetch_prices(products)) == [499.0, 499.0, 499.0]
+        assert tracker.worker_stats['tasks'] == 3 and tracker.worker_stats['starts'] == 2
+        assert not tracker.workers_active
+        # What the workers learned reaches the parent, which is the only one that saves it
+        assert len(tracker.page_cache.entries) == 3 and tracker.page_cache.stats['misses'] == 3
+        # Every fetch the workers made took its token from the parent's scheduler
+        report = tracker.scheduler.report()[f"127.0.0.1:{server.server_port}"]
+        assert report['requests'] == 3 and report['paced'] == 3
+    finally:
+        server.shutdown()
+
+    print("✅ Tracker process mode test passed!")
+
+
+if __name__ == "__main__":
+    test_process_worker()
+    test_tracker_process_mode()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test per-product extraction hints: learned on the first check, then used as the only lookup
+"""
+
+import json
+import os
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from extraction_hints import describe_product_hints, product_hints_from_result
+from price_tracker_universal import UniversalPriceTracker
+from request_scheduler import DomainScheduler
+
+GRAPH = {"@context": "https://schema.org", "@graph": [
+    {"@type": "BreadcrumbList", "itemListElement": []},
+    {"@type": "Product", "name": "Kettle", "offers": {"@type": "Offer", "price": "1,849.00", "priceCurrency": "INR"}},
+]}
+STATE = {"pdp": {"product": {"pricing": {"final": {"value": 612}, "mrp": {"value": 899}}}}}
+
+PAGES = {
+    '/meta': '<html><head><meta property="og:price:amount" content="1299.00"></head><body></body></html>',
+    '/css': '<html><body><h1>Mixer</h1><div class="now-price">₹ 749</div></body></html>',
+    '/ld': f'<html><head><script type="application/ld+json">{json.dumps(GRAPH)}</script></head><body></body></html>',
+    '/state': f'<html><body><script>window.__INITIAL_STATE__ = {json.dumps(STATE)};</script></body></html>',
+    '/spa': '<html><body><div id="root"></div><script>var sku = {"amount": "2,499"};</script></body></html>',
+}
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGES.get(self.path, '').encode('utf-8')
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_product_hints():
+    """The first check stores a targeted hint; later checks use only it and rediscover on a miss"""
+    print("🎯 Testing per-product extraction hints...")
+
+    assert product_hints_from_result({'method': 'meta', 'selector': 'property=og:price:amount'}, 'http') == {
+        'tier': 'http', 'selector': 'meta[property="og:price:amount"]', 'attribute': 'content'}
+    assert product_hints_from_result({'price': 5.0}, 'browser') == {'tier': 'browser'}
+    assert describe_product_hints({'tier': 'browser', 'state_path': 'a.b'}) == 'browser state_path a.b'
+
+    server = HTTPServer(('127.0.0.1', 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+        tracker.scheduler = DomainScheduler({'default': {'rps': 0, 'max_in_flight': 1}})
+        # Every page comes from one host; keep the per-domain hints out of the way
+        tracker.scraper_settings['extraction_hints'] = False
+        tracker.scraper_settings['app_state_paths'] = {
+            f"127.0.0.1:{server.server_port}": {'price': ['pdp.product.pricing.final.value']}}
+        cascades = []
+        full_cascade = tracker.extract_with_cascade
+        tracker.extract_with_cascade = lambda *args: cascades.append(1) or full_cascade(*args)
+
+        products = {name: {'name': name, 'url': base + path} for name, path in
+                    [('Meta', '/meta'), ('CSS', '/css'), ('JSON-LD', '/ld'), ('State', '/state')]}
+        first = {name: tracker.check_product_price(product) for name, product in products.items()}
+        assert first == {'Meta': 1299.0, 'CSS': 749.0, 'JSON-LD': 1849.0, 'State': 612.0}
+        # Meta and JSON-LD were found in the streamed head; the other two needed the full cascade
+        assert len(cascades) == 2
+
+        assert products['Meta']['extraction']['attribute'] == 'content'
+        assert products['CSS']['extraction'] == {'tier': 'http', 'selector': '[class*="price"]'}
+        assert products['JSON-LD']['extraction'] == {'tier': 'http', 'jsonld_path': '0.@graph.1.offers.price'}
+        assert products['State']['extraction'] == {'tier': 'http', 'state_path': 'pdp.product.pricing.final.value'}
+
+        # Steady state: one targeted lookup per product, no discovery
+        assert {name: tracker.check_product_price(product) for name, product in products.items()} == first
+        assert len(cascades) == 2 and tracker.stream_totals['pages'] == 4
+        assert tracker.product_hint_stats == {'hits': 4, 'misses': 0}
+        assert tracker.method_stats['product-hint'] == 4
+
+        # A hand-written regex hint works the same way
+        spa = {'name': 'SPA', 'url': base + '/spa', 'extraction': {'tier': 'http', 'regex': r'"amount": "([\d,]+)"'}}
+        assert tracker.check_product_price(spa) == 2499.0
+        assert len(cascades) == 2
+
+        # The layout changes: the hint misses, discovery runs and the new hint replaces it
+        PAGES['/css'] = '<html><head><meta property="product:price:amount" content="759"></head><body></body></html>'
+        assert tracker.check_product_price(products['CSS']) == 759.0
+        assert tracker.product_hint_stats['misses'] == 1 and tracker.stream_totals['pages'] == 5
+        assert products['CSS']['extraction']['selector'] == 'meta[property="product:price:amount"]'
+
+        # Browser-tier hints skip the HTTP attempt and go to the hinted browser lookup
+        tracker.scrape_with_browser = lambda url: {'price': 449.0, 'currency': '₹', 'available': True,
+                                                   'method': 'css', 'selector': '.a-price-whole'}
+        browser_product = {'name': 'Browser', 'url': base + '/missing'}
+        assert tracker.check_product_price(browser_product) == 449.0
+        assert browser_product['extraction'] == {'tier': 'browser', 'selector': '.a-price-whole'}
+        hinted = []
+        tracker.scrape_price_universal = lambda url, hints=None: hinted.append('http')
+        tracker.scrape_with_product_hints = lambda url, hints: hinted.append(hints['selector']) or {
+            'price': 455.0, 'currency': '₹', 'available': True, 'method': 'product-hint'}
+        assert tracker.check_product_price(browser_product) == 455.0
+        assert hinted == ['.a-price-whole']
+
+        # Hinted products are left out of tab batches
+        tracker.domain_tiers[f"127.0.0.1:{server.server_port}"] = 'browser'
+        assert tracker.plan_tab_batches([browser_product, {'name': 'A', 'url': base + '/a'},
+                                         {'name': 'B', 'url': base + '/b'}]) == [[1, 2]]
+    finally:
+        server.shutdown()
+
+    print("✅ Product hints test passed!")
+
+
+if __name__ == "__main__":
+    test_product_hints()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test per-product deadlines, watchdog kills and the orphan reaper (no Chrome needed)
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+from driver_pool import DriverPool
+from price_tracker_universal import UniversalPriceTracker
+from product_watchdog import ProcessReaper, run_with_deadline
+from request_scheduler import DomainScheduler
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class ProcessDriver:
+    """Fake driver backed by a real process named like chromedriver"""
+
+    def __init__(self, binary):
+        self.process = subprocess.Popen([binary, '60'])
+        self.service = FakeService(self.process)
+
+    def quit(self):
+        pass
+
+
+def fake_chromedriver():
+    """A copy of `sleep` called chromedriver, so the reaper recognises it"""
+    binary = os.path.join(tempfile.mkdtemp(), 'chromedriver')
+    shutil.copy(shutil.which('sleep'), binary)
+    return binary
+
+
+def test_run_with_deadline():
+    """Overruns call on_timeout with the worker's thread id; normal calls pass values through"""
+    print("⏰ Testing run_with_deadline...")
+
+    assert run_with_deadline(lambda: 42, 1, lambda owner: None) == (True, 42)
+
+    unblock = threading.Event()
+    owners = []
+
+    def on_timeout(owner):
+        owners.append(owner)
+        unblock.set()  # what killing the browser does to a blocked driver.get()
+
+    started = time.time()
+    assert run_with_deadline(lambda: unblock.wait(10), 0.1, on_timeout) == (False, None)
+    assert time.time() - started < 2 and len(owners) == 1
+
+    try:
+        run_with_deadline(lambda: 1 / 0, 1, on_timeout)
+        assert False, "expected ZeroDivisionError"
+    except ZeroDivisionError:
+        pass
+
+    print("✅ run_with_deadline test passed!")
+
+
+def test_product_watchdog():
+    """A hung check is cut off, its browser killed, and leftover processes are reaped"""
+    print("⏰ Testing product watchdog...")
+
+    binary = fake_chromedriver()
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    tracker.scraper_settings['product_deadline_seconds'] = 0.3
+    tracker.scheduler = DomainScheduler({'default': {'rps': 0, 'max_in_flight': 1}})
+    drivers = []
+
+    def create_driver():
+        drivers.append(ProcessDriver(binary))
+        tracker.reaper.remember([drivers[-1].process.pid])
+        return drivers[-1]
+
+    tracker._create_driver = create_driver
+    tracker.driver_pool = DriverPool(create_driver, size=1, max_pages=10, max_memory_mb=None)
+
+    def hung_check(product):
+        with tracker.driver_pool.driver():
+            drivers[0].process.wait()  # blocks until the watchdog kills the "browser"
+            raise RuntimeError('chromedriver connection refused')
+
+    tracker.check_product_price = hung_check
+    started = time.time()
+    assert tracker._scheduled_check({'name': 'Stuck', 'url': 'https://slow.example/item'}) is None
+    assert time.time() - started < 5
+    assert drivers[0].process.poll() is not None, "the hung browser was killed"
+    assert tracker.watchdog_stats['timeouts'] == 1 and tracker.watchdog_stats['killed_processes'] >= 1
+    assert tracker.circuit_breaker.state['slow.example']['failures'] == 1
+
+    # A driver nobody owns any more is cleaned up between products
+    reaper = ProcessReaper()
+    orphan = subprocess.Popen([binary, '60'])
+    reaper.remember([orphan.pid])
+    assert reaper.reap(live_pids=set()) == 1
+    orphan.wait(5)
+
+    live = subprocess.Popen([binary, '60'])
+    reaper.remember([live.pid])
+    assert reaper.reap(live_pids={live.pid}) == 0
+    # The live set is taken after the scan, and a pool with a driver mid-start skips the pass
+    assert reaper.reap(live_pids=lambda: {live.pid}) == 0
+    assert reaper.reap(live_pids=lambda: None) == 0 and live.poll() is None
+    live.kill()
+    live.wait()
+
+    print("✅ Product watchdog test passed!")
+
+
+if __name__ == "__main__":
+    test_run_with_deadline()
+    test_product_watchdog()
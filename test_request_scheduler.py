@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test per-domain pacing, interleaving and Retry-After handling
+"""
+
+import time
+
+from request_scheduler import DomainScheduler, parse_retry_after
+
+
+def test_request_scheduler():
+    """Token bucket spaces requests, Retry-After blocks the domain, domains interleave"""
+    print("🚦 Testing request scheduler...")
+
+    scheduler = DomainScheduler({'default': {'rps': 20, 'max_in_flight': 1}})
+
+    started = time.monotonic()
+    for _ in range(25):  # 20-token burst, then 5 more at 20/s
+        with scheduler.slot('shop.com'):
+            pass
+    assert 0.2 <= time.monotonic() - started < 1
+
+    scheduler.defer('shop.com', 0.3)
+    started = time.monotonic()
+    with scheduler.slot('shop.com'):
+        pass
+    assert time.monotonic() - started >= 0.3
+
+    report = scheduler.report()['shop.com']
+    assert report['requests'] == 26 and report['max_wait'] >= 0.3
+
+    # Token waits taken per fetch attempt with pace() are part of the report too
+    paced = DomainScheduler({'default': {'rps': 10, 'max_in_flight': 1}})
+    with paced.slot('slow.com', paced=False):
+        for _ in range(12):  # 10-token burst, then two 0.1 s waits
+            paced.pace('slow.com')
+    report = paced.report()['slow.com']
+    assert report['requests'] == 1 and report['paced'] == 12
+    assert report['max_wait'] >= 0.08
+
+    items = ['a1', 'a2', 'a3', 'b1', 'c1', 'b2']
+    assert DomainScheduler.interleave(items, key=lambda x: x[0]) == ['a1', 'b1', 'c1', 'a2', 'b2', 'a3']
+
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('not a date') is None
+
+    print("✅ Request scheduler test passed!")
+
+
+if __name__ == "__main__":
+    test_request_scheduler()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test retries with backoff and the per-domain circuit breaker
+"""
+
+import time
+import requests
+
+from resilience import CircuitBreaker, error_result, retry_result
+
+
+def test_resilience():
+    """Transient errors are retried, and repeated failures open the breaker"""
+    print("🔁 Testing retries and circuit breaker...")
+
+    calls = []
+
+    def flaky_fetch():
+        calls.append(1)
+        if len(calls) < 3:
+            return error_result(requests.Timeout('read timed out'))
+        return {'price': 99.0, 'currency': '₹', 'available': True}
+
+    result = retry_result(flaky_fetch, attempts=3, base_delay=0.01)
+    assert result['price'] == 99.0 and len(calls) == 3
+
+    # Permanent errors are not retried
+    calls.clear()
+    result = retry_result(lambda: calls.append(1) or error_result(ValueError('bad html')), attempts=3, base_delay=0.01)
+    assert len(calls) == 1 and 'transient' not in result
+
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60)
+    breaker.record_failure('down.com')
+    assert breaker.allow('down.com')
+    breaker.record_failure('down.com')
+    assert not breaker.allow('down.com')
+
+    # State survives a round trip through the config, and the cooldown half-opens it
+    restored = CircuitBreaker(failure_threshold=2, cooldown_seconds=60, state=breaker.to_dict())
+    assert not restored.allow('down.com')
+    restored.state['down.com']['opened_at'] -= 61
+    assert restored.allow('down.com')
+    restored.record_failure('down.com')
+    assert not restored.allow('down.com')
+    restored.record_success('down.com')
+    assert restored.allow('down.com')
+
+    # Half-open lets a single trial through; concurrent checks wait for its verdict
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=60, probe_timeout_seconds=30)
+    breaker.merge('down.com', {'failures': 2, 'opened_at': time.time() - 61})
+    assert breaker.allow('down.com')
+    assert not breaker.allow('down.com') and not breaker.allow('down.com')
+    assert set(breaker.to_dict()['down.com']) == {'failures', 'opened_at'}, "the trial in flight is not saved"
+    breaker.record_success('down.com')
+    assert breaker.allow('down.com') and breaker.allow('down.com')
+
+    # A trial that never reports back stops blocking after the probe timeout
+    breaker.merge('down.com', {'failures': 2, 'opened_at': time.time() - 61})
+    assert breaker.allow('down.com') and not breaker.allow('down.com')
+    breaker.probes['down.com'] -= 31
+    assert breaker.allow('down.com') and not breaker.allow('down.com')
+    # A worker's reply ends the trial too
+    breaker.merge('down.com', {'failures': 1, 'opened_at': None})
+    assert breaker.allow('down.com')
+
+    print("✅ Resilience test passed!")
+
+
+if __name__ == "__main__":
+    test_resilience()
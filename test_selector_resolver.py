@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test single-loop XPath cascade resolution and hit-rate re-sorting (no Chrome needed)
+"""
+
+import os
+import tempfile
+import time
+
+from selector_resolver import SelectorResolver
+
+
+class FakeElement:
+    def __init__(self, xpath):
+        self.xpath = xpath
+        self.clicked = False
+
+    def click(self):
+        self.clicked = True
+
+
+class FakeDriver:
+    """Emulates RESOLVE_XPATHS_JS: the first present XPath in the order given wins"""
+
+    def __init__(self, present, appears_after=0):
+        self.present = present
+        self.appears_after = appears_after
+        self.calls = 0
+
+    def execute_script(self, script, xpaths=None, clickable=None):
+        self.calls += 1
+        if self.calls <= self.appears_after:
+            return None
+        for index, xpath in enumerate(xpaths):
+            if xpath in self.present:
+                return [index, FakeElement(xpath)]
+        return None
+
+
+def test_selector_resolver():
+    """One call per poll covers every alternative, priority holds, and winners move up"""
+    print("🎯 Testing selector resolver...")
+
+    cascade = ["//button[contains(text(),'Change')]", "//div[contains(@class,'location')]", "//button[@type='submit']"]
+    path = os.path.join(tempfile.mkdtemp(), 'selector_hits.json')
+    resolver = SelectorResolver(path, poll_interval=0.01)
+
+    # Both later alternatives exist: the higher-priority one wins, found on the third poll
+    driver = FakeDriver(present={cascade[1], cascade[2]}, appears_after=2)
+    element, xpath = resolver.resolve(driver, 'bigbasket.location', cascade, timeout=1)
+    assert xpath == cascade[1] and element.xpath == cascade[1]
+    assert driver.calls == 3
+
+    # A full miss costs one deadline, not one per selector
+    started = time.monotonic()
+    assert resolver.resolve(FakeDriver(present=set()), 'bigbasket.location', cascade, timeout=0.1) == (None, None)
+    assert time.monotonic() - started < 0.5
+
+    # The winner is tried first next time and the stats survive a reload
+    resolver.save()
+    reloaded = SelectorResolver(path)
+    assert reloaded.ordered('bigbasket.location', cascade)[0] == cascade[1]
+    report = reloaded.report()['bigbasket.location']
+    assert report['hits'] == 1 and report['misses'] == 1 and report['top'] == cascade[1]
+
+    clicked = reloaded.click(FakeDriver(present={cascade[2]}), 'bigbasket.submit', cascade, timeout=0.1)
+    assert clicked == cascade[2]
+
+    print("✅ Selector resolver test passed!")
+
+
+if __name__ == "__main__":
+    test_selector_resolver()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test the Schema.org Product/Offer extractor on the JSON-LD shapes retailers actually publish
+"""
+
+import json
+import os
+import tempfile
+
+from price_tracker_universal import UniversalPriceTracker
+from structured_data import product_from_jsonld
+
+
+def test_structured_data():
+    """@graph, AggregateOffer, priceSpecification, several offers and several products"""
+    print("🧬 Testing JSON-LD product extraction...")
+
+    graph = {"@context": "https://schema.org", "@graph": [
+        {"@type": "BreadcrumbList", "itemListElement": [{"@type": "ListItem", "position": 1}]},
+        {"@type": "http://schema.org/Product", "name": "Kettle", "offers": {
+            "@type": "Offer", "price": "1,499.00", "priceCurrency": "INR",
+            "availability": "https://schema.org/InStock", "seller": {"@type": "Organization", "name": "Appliance Hub"}}},
+    ]}
+    assert product_from_jsonld([json.dumps(graph)]) == {
+        'price': 1499.0, 'currency': 'INR', 'availability': 'InStock', 'in_stock': True,
+        'seller': 'Appliance Hub', 'name': 'Kettle'}
+
+    aggregate = {"@type": "Product", "offers": {"@type": "AggregateOffer", "lowPrice": 249, "highPrice": 399,
+                                                "priceCurrency": "INR", "offerCount": 3}}
+    assert product_from_jsonld([json.dumps(aggregate)])['price'] == 249.0
+
+    specification = {"@type": "Product", "offers": {"@type": "Offer", "priceSpecification": [
+        {"@type": "UnitPriceSpecification", "priceType": "https://schema.org/StrikethroughPrice", "price": 999},
+        {"@type": "UnitPriceSpecification", "price": 749, "priceCurrency": "INR"}]}}
+    product = product_from_jsonld([json.dumps(specification)])
+    assert product['price'] == 749.0 and product['currency'] == 'INR'
+
+    # Out-of-stock marketplace offer is skipped for the first seller that has it
+    sellers = [{"@type": "Product", "name": "Atta 5kg", "offers": [
+        {"@type": "Offer", "price": 310, "availability": "OutOfStock", "seller": "A"},
+        {"@type": "Offer", "price": 325, "availability": "http://schema.org/InStock", "seller": "B"}]},
+        {"@type": "Product", "name": "Atta 10kg", "offers": {"@type": "Offer", "price": 590}}]
+    product = product_from_jsonld(['{not json', json.dumps(sellers)])
+    assert (product['price'], product['seller'], product['name']) == (325.0, 'B', 'Atta 5kg')
+
+    # Products without prices do not hide a bare Offer elsewhere on the page
+    assert product_from_jsonld(['{"@type": "Product", "name": "x"}', '{"@type": "Offer", "price": "₹ 88"}'])['price'] == 88.0
+    assert product_from_jsonld(['{"@type": "Organization"}', '']) is None
+
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    page = f'<html><head><script type="application/ld+json">{json.dumps(graph)}</script></head><body></body></html>'
+    result = tracker.extract_price_from_html(page)
+    assert result['method'] == 'json-ld' and result['currency'] == '₹' and result['seller'] == 'Appliance Hub'
+    tracker.extract_price_from_html('<html><body><p>No price here</p></body></html>')
+    assert tracker.method_stats == {'json-ld': 1, 'none': 1}
+
+    print("✅ JSON-LD product extraction test passed!")
+
+
+if __name__ == "__main__":
+    test_structured_data()
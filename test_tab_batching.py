@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test multi-tab batching of same-domain browser products (no Chrome needed)
+"""
+
+import json
+import os
+import tempfile
+
+from price_tracker_universal import UniversalPriceTracker
+from request_scheduler import DomainScheduler
+
+
+class FakeDriver:
+    """Tracks open tabs and which URL each tab navigated to"""
+
+    def __init__(self):
+        self.handles = ['home']
+        self.current = 'home'
+        self.urls = {}
+        self.peak_tabs = 1
+        self.switch_to = self
+        self.log = []  # performance-log entries not yet read
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def new_window(self, kind):
+        handle = f'tab{len(self.urls) + len(self.handles)}'
+        self.handles.append(handle)
+        self.current = handle
+        self.peak_tabs = max(self.peak_tabs, len(self.handles))
+
+    def window(self, handle):
+        self.current = handle
+
+    def execute_script(self, script, *args):
+        if 'location.href' in script:
+            self.urls[self.current] = args[0]
+            self.log.append({'message': json.dumps({'message': {'method': 'Network.requestWillBeSent', 'params': {}}})})
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def get_log(self, name):
+        entries, self.log = self.log, []
+        return entries
+
+    def close(self):
+        self.handles.remove(self.current)
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        pass
+
+
+def make_tracker(max_workers):
+    tracker = UniversalPriceTracker(config_file=os.path.join(tempfile.mkdtemp(), 'config.json'))
+    tracker.scraper_settings['max_workers'] = max_workers
+    tracker.scraper_settings['tab_batching'] = {'enabled': True, 'tabs_per_browser': 2}
+    tracker.scheduler = DomainScheduler({'default': {'rps': 0, 'max_in_flight': 1}})
+    tracker.domain_tiers = {'shop.com': 'browser'}
+    tracker.wait_for_page = lambda driver, url, selectors=None, checks=None: None
+
+    drivers = []
+
+    def create_driver():
+        drivers.append(FakeDriver())
+        return drivers[-1]
+
+    tracker._create_driver = create_driver
+    # The in-page cascade is covered elsewhere; here the tab's URL decides the price
+    tracker.extract_with_selenium = lambda driver, url: {
+        'price': float(driver.urls[driver.current].rsplit('/', 1)[1]), 'currency': '₹', 'available': True}
+    tracker.check_product_price = lambda product: -1.0
+    return tracker, drivers
+
+
+def test_tab_batching():
+    """Same-domain browser products share one driver's tabs and prices keep product order"""
+    print("🗂️  Testing multi-tab batching...")
+
+    products = [
+        {'name': 'A', 'url': 'https://shop.com/item/101'},
+        {'name': 'X', 'url': 'https://other.com/item/1'},
+        {'name': 'B', 'url': 'https://www.shop.com/item/102'},
+        {'name': 'C', 'url': 'https://shop.com/item/103'},
+    ]
+
+    for max_workers in (1, 4):
+        tracker, drivers = make_tracker(max_workers)
+        assert tracker.plan_tab_batches(products) == [[0, 2, 3]]
+
+        prices = list(tracker.fetch_prices(products))
+        tracker.close_driver_pool()
+
+        assert prices == [101.0, -1.0, 102.0, 103.0]  # other.com took the normal path
+        assert len(drivers) == 1, "one browser for the whole batch"
+        assert drivers[0].peak_tabs == 3, "home tab plus tabs_per_browser"
+        assert drivers[0].handles == ['home'], "tabs are closed after extraction"
+        assert tracker.network_totals['requests'] == 3, "opening a tab keeps the earlier tabs' events"
+        assert products[0]['extraction'] == {'tier': 'browser'}, "tab checks fill in the product hints too"
+
+    tracker, _ = make_tracker(1)
+    tracker.scraper_settings['tab_batching']['enabled'] = False
+    assert tracker.plan_tab_batches(products) == []
+
+    print("✅ Tab batching test passed!")
+
+
+if __name__ == "__main__":
+    test_tab_batching()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the HTTP-first tiered fetch against a local test server
+"""
+
+import os
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from price_tracker_universal import UniversalPriceTracker
+from request_scheduler import DomainScheduler
+
+PAGES = {
+    '/meta': '<html><head><meta property="product:price:amount" content="1299.00"></head><body></body></html>',
+    '/spa': '<html><head></head><body><div id="root">Free delivery over ₹500</div></body></html>',
+}
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGES.get(self.path, '').encode('utf-8')
+        self.send_response(200 if body else 404)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = HTTPServer(('127.0.0.1', 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_tiered_fetch():
+    """HTTP wins when it can, otherwise the browser tier is used and remembered"""
+    print("⚡ Testing tiered fetch...")
+
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_port}"
+    config_file = os.path.join(tempfile.mkdtemp(), 'config.json')
+
+    try:
+        tracker = UniversalPriceTracker(config_file=config_file)
+        tracker.scheduler = DomainScheduler({'default': {'rps': 0, 'max_in_flight': 1}})
+        paced = []
+        unpaced = tracker.scheduler.pace
+        tracker.scheduler.pace = lambda domain: paced.append(domain) or unpaced(domain)
+        browser_calls = []
+
+        def fake_browser(url):
+            browser_calls.append(url)
+            return {'price': 449.0, 'currency': '₹', 'available': True}
+
+        tracker.scrape_with_browser = fake_browser
+
+        assert tracker.check_product_price({'name': 'Meta', 'url': base + '/meta'}) == 1299.0
+        assert browser_calls == []
+
+        # Only a weak text match over HTTP -> escalate and remember the domain
+        assert tracker.check_product_price({'name': 'SPA', 'url': base + '/spa'}) == 449.0
+        assert browser_calls == [base + '/spa']
+        assert tracker.domain_tiers[f"127.0.0.1:{server.server_port}"] == 'browser'
+
+        # Next product on that domain goes straight to the browser
+        tracker.check_product_price({'name': 'Meta again', 'url': base + '/meta'})
+        assert len(browser_calls) == 2
+
+        # Once the browser tier is due a recheck, HTTP is tried again and wins the domain back
+        domain = f"127.0.0.1:{server.server_port}"
+        tracker.tier_checked[domain] -= 25 * 3600
+        assert tracker.check_product_price({'name': 'Meta recheck', 'url': base + '/meta'}) == 1299.0
+        assert len(browser_calls) == 2 and domain not in tracker.domain_tiers
+
+        # A transient HTTP failure that outlives the retries does not move the domain to the browser
+        tracker.scraper_settings['retry_attempts'] = 2
+        tracker.scraper_settings['retry_base_delay'] = 0.01
+        full_http = tracker.scrape_price_universal
+        tracker.scrape_price_universal = lambda url: {'error': '503', 'available': False, 'transient': True}
+        paced.clear()
+        assert tracker.check_product_price({'name': 'Blip', 'url': base + '/meta'}) == 449.0
+        assert domain not in tracker.domain_tiers
+        # Each attempt takes a token: the HTTP try, its retry and the browser fallback
+        assert paced == [domain] * 3
+        tracker.scrape_price_universal = full_http
+
+        # Pincode products skip plain HTTP: it carries no delivery location
+        tracker.pincode = '560001'
+        tracker.check_product_price({'name': 'BigBasket', 'url': base + '/meta?bigbasket.com'})
+        assert browser_calls[-1] == base + '/meta?bigbasket.com'
+    finally:
+        server.shutdown()
+
+    print("✅ Tiered fetch test passed!")
+
+
+if __name__ == "__main__":
+    test_tiered_fetch()